@@ -1,31 +1,42 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List, Optional
+import json
+import time
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Union
 
 from app.database import get_db
 from app.models.user import User
 from app.models.application import JobApplication, JobPosting
+from app.models.resume import Resume, ResumeVersion
 from app.schemas.application import (
     JobPostingCreate,
+    JobPostingBulkResponse,
+    JobPostingMatch,
     JobPostingResponse,
     JobApplicationCreate,
     JobApplicationResponse,
     JobApplicationStatus,
     JobSearchQuery
 )
-from app.api.auth import get_current_user
-from app.services.job_service import search_jobs, apply_to_job
+from app.schemas.pagination import CursorPage
+from app.api.auth import get_current_user, get_read_db
+from app.config import settings
+from app.services.job_service import search_jobs, stream_search_jobs, apply_to_job, import_job_postings
+from app.services.job_sources import JobSearchParams
+from app.services.match_index import match_index, sync_match_index
+from app.services.pagination import paginate
+from app.services.posting_dedupe import link_duplicates
 
 router = APIRouter()
 
 
-@router.post("/search", response_model=List[JobPostingResponse])
-async def search_job_postings(
-    search_query: JobSearchQuery,
-    current_user: User = Depends(get_current_user)
-):
-    """Search for job postings across platforms"""
-    job_results = search_jobs(
+def _search_params(search_query: JobSearchQuery) -> JobSearchParams:
+    return JobSearchParams(
         query=search_query.query,
         location=search_query.location,
         job_type=search_query.job_type,
@@ -33,22 +44,69 @@ async def search_job_postings(
         remote=search_query.remote,
         limit=search_query.limit
     )
+
+
+@router.post("/search", response_model=List[JobPostingResponse])
+async def search_job_postings(
+    search_query: JobSearchQuery,
+    response: Response,
+    current_user: User = Depends(get_current_user)
+):
+    """Search for job postings across platforms"""
+    job_results, source_results = await search_jobs(_search_params(search_query))
     
+    # Sources that timed out or failed only contributed what they returned in time
+    response.headers["X-Job-Sources"] = ", ".join(
+        f"{result.source}={'cached' if result.cached else result.status}" for result in source_results
+    )
     return job_results
 
 
+@router.post("/search:stream")
+async def stream_job_postings_search(
+    search_query: JobSearchQuery,
+    current_user: User = Depends(get_current_user)
+):
+    """Search for job postings across platforms, streamed back as NDJSON as each source finishes"""
+    params = _search_params(search_query)
+    
+    async def lines():
+        started = time.perf_counter()
+        sources = {}
+        async for result, postings in stream_search_jobs(params):
+            sources[result.source] = {
+                "status": result.status,
+                "cached": result.cached,
+                "count": len(postings),
+                "ms": round(result.seconds * 1000, 1)
+            }
+            yield json.dumps({
+                "source": result.source,
+                "status": result.status,
+                "cached": result.cached,
+                "postings": jsonable_encoder(postings)
+            }) + "\n"
+        yield json.dumps({"summary": {
+            "total": sum(source["count"] for source in sources.values()),
+            "ms": round((time.perf_counter() - started) * 1000, 1),
+            "sources": sources
+        }}) + "\n"
+    
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 @router.post("/postings", response_model=JobPostingResponse)
 async def create_job_posting(
     posting_data: JobPostingCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Save a job posting"""
     # Check if posting already exists
-    existing_posting = db.query(JobPosting).filter(
+    existing_posting = await db.scalar(select(JobPosting).where(
         JobPosting.external_id == posting_data.external_id,
         JobPosting.source == posting_data.source
-    ).first()
+    ))
     
     if existing_posting:
         return existing_posting
@@ -68,33 +126,134 @@ async def create_job_posting(
         posted_at=posting_data.posted_at
     )
     db.add(db_posting)
-    db.commit()
-    db.refresh(db_posting)
+    await db.flush()
+    await db.run_sync(link_duplicates, [db_posting.id])
+    await db.commit()
+    await db.refresh(db_posting)
     
     return db_posting
 
 
-@router.get("/postings", response_model=List[JobPostingResponse])
+@router.post("/postings:bulk", response_model=JobPostingBulkResponse)
+async def bulk_upsert_job_postings(
+    postings: List[JobPostingCreate],
+    current_user: User = Depends(get_current_user)
+):
+    """Save many job postings, updating those already saved from the same source"""
+    if len(postings) > settings.JOB_POSTING_BULK_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.JOB_POSTING_BULK_MAX_ROWS} postings per request"
+        )
+    
+    # MinHash signing and LSH banding of thousands of rows would stall the event loop under run_sync
+    return await run_in_threadpool(import_job_postings, [posting.dict() for posting in postings], current_user.id)
+
+
+@router.get("/postings", response_model=Union[CursorPage[JobPostingResponse], List[JobPostingResponse]])
 async def get_job_postings(
-    skip: int = 0,
+    request: Request,
+    cursor: Optional[str] = None,
+    skip: Optional[int] = None,
     limit: int = 100,
+    include_duplicates: bool = False,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Get saved job postings"""
-    postings = db.query(JobPosting).offset(skip).limit(limit).all()
-    return postings
+    """Get saved job postings (near-duplicates collapsed into their canonical posting)"""
+    query = select(JobPosting)
+    
+    if not include_duplicates:
+        query = query.where(JobPosting.canonical_id.is_(None))
+    
+    if skip is not None:
+        # Deprecated offset paging, kept for clients that still send skip
+        return (await db.scalars(query.offset(skip).limit(limit))).all()
+    
+    return await paginate(db, query, JobPosting.created_at, JobPosting.id, request, cursor=cursor, limit=limit)
+
+
+@router.get("/postings/match", response_model=List[JobPostingMatch])
+async def match_job_postings(
+    resume_id: int,
+    limit: int = 20,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Rank saved job postings against a resume's active version"""
+    resume = await db.scalar(select(Resume).where(
+        Resume.id == resume_id,
+        Resume.user_id == current_user.id
+    ))
+    
+    if not resume:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume not found"
+        )
+    
+    active_version = await db.scalar(select(ResumeVersion).where(
+        ResumeVersion.resume_id == resume_id,
+        ResumeVersion.is_active == True
+    ))
+    
+    if not active_version:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No active resume version found"
+        )
+    
+    # Catch up with postings saved since the last request, then score in memory; both are CPU-bound,
+    # and run_sync would keep them on the event loop with an AsyncSession
+    await run_in_threadpool(sync_match_index)
+    matches = await run_in_threadpool(
+        match_index.top_k,
+        f"{resume.title} {resume.target_job or ''} {active_version.content}",
+        max(0, min(limit, settings.MATCH_MAX_RESULTS))
+    )
+    
+    postings = {
+        posting.id: posting
+        for posting in await db.scalars(
+            select(JobPosting).where(JobPosting.id.in_([posting_id for posting_id, _ in matches]))
+        )
+    }
+    return [
+        {**{field: getattr(postings[posting_id], field) for field in JobPostingResponse.__fields__}, "score": score}
+        for posting_id, score in matches if posting_id in postings
+    ]
+
+
+@router.get("/postings/{posting_id}/duplicates", response_model=List[JobPostingResponse])
+async def get_job_posting_duplicates(
+    posting_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get the postings detected as near-duplicates of a posting"""
+    posting = await db.get(JobPosting, posting_id)
+    if not posting:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job posting not found"
+        )
+    
+    canonical_id = posting.canonical_id or posting.id
+    return (await db.scalars(select(JobPosting).where(
+        (JobPosting.canonical_id == canonical_id) | (JobPosting.id == canonical_id),
+        JobPosting.id != posting_id
+    ).order_by(JobPosting.id))).all()
 
 
 @router.post("/apply", response_model=JobApplicationResponse)
 async def apply_to_job_posting(
     application_data: JobApplicationCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Apply to a job posting"""
     # Check if posting exists
-    posting = db.query(JobPosting).filter(JobPosting.id == application_data.job_posting_id).first()
+    posting = await db.get(JobPosting, application_data.job_posting_id)
     if not posting:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -102,10 +261,10 @@ async def apply_to_job_posting(
         )
     
     # Check if already applied
-    existing_application = db.query(JobApplication).filter(
+    existing_application = await db.scalar(select(JobApplication).where(
         JobApplication.job_posting_id == application_data.job_posting_id,
         JobApplication.user_id == current_user.id
-    ).first()
+    ))
     
     if existing_application:
         raise HTTPException(
@@ -131,28 +290,33 @@ async def apply_to_job_posting(
         notes=application_result.get("notes", "")
     )
     db.add(db_application)
-    db.commit()
-    db.refresh(db_application)
+    await db.commit()
+    await db.refresh(db_application)
     
     return db_application
 
 
-@router.get("/applications", response_model=List[JobApplicationResponse])
+@router.get("/applications", response_model=Union[CursorPage[JobApplicationResponse], List[JobApplicationResponse]])
 async def get_job_applications(
+    request: Request,
     status: Optional[JobApplicationStatus] = None,
-    skip: int = 0,
+    cursor: Optional[str] = None,
+    skip: Optional[int] = None,
     limit: int = 100,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get user's job applications"""
-    query = db.query(JobApplication).filter(JobApplication.user_id == current_user.id)
+    query = select(JobApplication).where(JobApplication.user_id == current_user.id)
     
     if status:
-        query = query.filter(JobApplication.status == status)
+        query = query.where(JobApplication.status == status)
+    
+    if skip is not None:
+        # Deprecated offset paging, kept for clients that still send skip
+        return (await db.scalars(query.offset(skip).limit(limit))).all()
     
-    applications = query.offset(skip).limit(limit).all()
-    return applications
+    return await paginate(db, query, JobApplication.applied_at, JobApplication.id, request, cursor=cursor, limit=limit)
 
 
 @router.put("/applications/{application_id}/status", response_model=JobApplicationResponse)
@@ -160,13 +324,13 @@ async def update_application_status(
     application_id: int,
     status: JobApplicationStatus,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Update job application status"""
-    application = db.query(JobApplication).filter(
+    application = await db.scalar(select(JobApplication).where(
         JobApplication.id == application_id,
         JobApplication.user_id == current_user.id
-    ).first()
+    ))
     
     if not application:
         raise HTTPException(
@@ -175,7 +339,7 @@ async def update_application_status(
         )
     
     application.status = status
-    db.commit()
-    db.refresh(application)
+    await db.commit()
+    await db.refresh(application)
     
     return application
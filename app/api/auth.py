@@ -1,18 +1,21 @@
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, AsyncIterator, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 
 from app.config import settings
-from app.database import get_db
+from app.database import get_db, open_session
 from app.models.user import User
 from app.schemas.token import Token, TokenData
 from app.schemas.user import UserCreate, UserResponse
-from app.services.auth_service import verify_password, get_password_hash
+from app.services.auth_service import PasswordHasherBusy, get_password_hash_async, verify_password_async
+from app.services.principal_cache import principal_cache
+from app.services.read_routing import read_router
 
 router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_PREFIX}/auth/token")
@@ -29,7 +32,29 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt
 
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def hash_password(password: str) -> str:
+    try:
+        return await get_password_hash_async(password)
+    except PasswordHasherBusy as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
+
+
+async def check_password(plain_password: str, hashed_password: str) -> bool:
+    try:
+        return await verify_password_async(plain_password, hashed_password)
+    except PasswordHasherBusy as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
+
+
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -43,24 +68,39 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
         token_data = TokenData(username=username)
     except JWTError:
         raise credentials_exception
-    user = db.query(User).filter(User.email == token_data.username).first()
-    if user is None:
-        raise credentials_exception
+    # Cache hits are attached to the session without a query
+    user = principal_cache.get(token_data.username)
+    if user is not None:
+        user = await db.merge(user, load=False)
+    else:
+        user = await db.scalar(select(User).where(User.email == token_data.username))
+        if user is None:
+            raise credentials_exception
+        principal_cache.set(token_data.username, user)
+    # Commits through this session make the user's next reads stick to the primary
+    db.sync_session.info["principal_id"] = user.id
     return user
 
 
+async def get_read_db(current_user: User = Depends(get_current_user)) -> AsyncIterator[Any]:
+    """Read-only session for GET routes, on the replica unless it lags or the user just wrote"""
+    replica = await read_router.use_replica(current_user.id)
+    async with open_session(read_only=True, replica=replica) as db:
+        yield db
+
+
 @router.post("/register", response_model=UserResponse)
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     # Check if user already exists
-    db_user = db.query(User).filter(User.email == user_data.email).first()
+    db_user = await db.scalar(select(User).where(User.email == user_data.email))
     if db_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
-    # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    # Create new user, hashing off the event loop
+    hashed_password = await hash_password(user_data.password)
     db_user = User(
         email=user_data.email,
         hashed_password=hashed_password,
@@ -68,17 +108,17 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
         last_name=user_data.last_name
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     
     return db_user
 
 
 @router.post("/token", response_model=Token)
-async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
     # Authenticate user
-    user = db.query(User).filter(User.email == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    user = await db.scalar(select(User).where(User.email == form_data.username))
+    if not user or not await check_password(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
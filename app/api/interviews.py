@@ -1,19 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, status, WebSocket, WebSocketDisconnect
-from sqlalchemy.orm import Session
-from typing import List, Optional
+import asyncio
 
-from app.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, WebSocket, WebSocketDisconnect
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Union
+
+from app.database import get_db, open_session
 from app.models.user import User
-from app.models.interview import Interview, InterviewSession
+from app.models.interview import Interview, InterviewSession, InterviewQuestion
 from app.schemas.interview import (
     InterviewCreate, 
     InterviewResponse, 
+    InterviewQuestionResponse,
     InterviewSessionCreate,
-    InterviewSessionResponse,
-    InterviewFeedback
+    InterviewSessionResponse
 )
-from app.api.auth import get_current_user
-from app.services.interview_service import process_interview_feedback, generate_interview_questions
+from app.schemas.job import JobResponse
+from app.schemas.pagination import CursorPage
+from app.api.auth import get_current_user, get_read_db
+from app.services.job_queue import job_queue
+from app.services.pagination import paginate
+from app.services.rate_limiter import admit_user, estimate_tokens
 
 router = APIRouter()
 
@@ -21,10 +28,14 @@ router = APIRouter()
 @router.post("/", response_model=InterviewResponse)
 async def create_interview(
     interview_data: InterviewCreate,
+    response: Response,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a new interview template"""
+    if interview_data.generate_questions:
+        await admit_user(current_user.id, estimate_tokens(interview_data.job_title, interview_data.industry, max_tokens=2000))
+    
     # Create new interview
     db_interview = Interview(
         title=interview_data.title,
@@ -36,48 +47,62 @@ async def create_interview(
         user_id=current_user.id
     )
     db.add(db_interview)
-    db.commit()
-    db.refresh(db_interview)
+    await db.commit()
+    await db.refresh(db_interview)
     
-    # Generate questions if requested
+    # Queue question generation if requested; questions are saved as they stream in
     if interview_data.generate_questions:
-        questions = generate_interview_questions(
-            job_title=interview_data.job_title,
-            industry=interview_data.industry,
-            difficulty=interview_data.difficulty,
-            num_questions=interview_data.num_questions or 10
+        job = await job_queue.submit(
+            db,
+            "interview.questions",
+            {
+                "interview_id": db_interview.id,
+                "job_title": interview_data.job_title,
+                "industry": interview_data.industry,
+                "difficulty": interview_data.difficulty,
+                "num_questions": interview_data.num_questions or 10
+            },
+            user_id=current_user.id
         )
-        # TODO: Save generated questions to database
+        # Stored so GET /interviews/{id} keeps pointing at the job to poll
+        db_interview.generation_job_id = job.id
+        await db.commit()
+        await db.refresh(db_interview)
+        response.status_code = status.HTTP_202_ACCEPTED
     
     return db_interview
 
 
-@router.get("/", response_model=List[InterviewResponse])
+@router.get("/", response_model=Union[CursorPage[InterviewResponse], List[InterviewResponse]])
 async def get_interviews(
-    skip: int = 0,
+    request: Request,
+    cursor: Optional[str] = None,
+    skip: Optional[int] = None,
     limit: int = 100,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get all interviews for current user"""
-    interviews = db.query(Interview).filter(
-        Interview.user_id == current_user.id
-    ).offset(skip).limit(limit).all()
+    query = select(Interview).where(Interview.user_id == current_user.id)
     
-    return interviews
+    if skip is not None:
+        # Deprecated offset paging, kept for clients that still send skip
+        return (await db.scalars(query.offset(skip).limit(limit))).all()
+    
+    return await paginate(db, query, Interview.created_at, Interview.id, request, cursor=cursor, limit=limit)
 
 
 @router.get("/{interview_id}", response_model=InterviewResponse)
 async def get_interview(
     interview_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get interview by ID"""
-    interview = db.query(Interview).filter(
+    interview = await db.scalar(select(Interview).where(
         Interview.id == interview_id,
         Interview.user_id == current_user.id
-    ).first()
+    ))
     
     if not interview:
         raise HTTPException(
@@ -88,19 +113,45 @@ async def get_interview(
     return interview
 
 
+@router.get("/{interview_id}/questions", response_model=List[InterviewQuestionResponse])
+async def get_interview_questions(
+    interview_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get the questions of an interview (generated questions appear as they arrive)"""
+    # Check if interview exists and belongs to user
+    interview = await db.scalar(select(Interview).where(
+        Interview.id == interview_id,
+        Interview.user_id == current_user.id
+    ))
+    
+    if not interview:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Interview not found"
+        )
+    
+    questions = (await db.scalars(select(InterviewQuestion).where(
+        InterviewQuestion.interview_id == interview_id
+    ).order_by(InterviewQuestion.order))).all()
+    
+    return questions
+
+
 @router.post("/{interview_id}/sessions", response_model=InterviewSessionResponse)
 async def create_interview_session(
     interview_id: int,
     session_data: InterviewSessionCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a new interview session"""
     # Check if interview exists and belongs to user
-    interview = db.query(Interview).filter(
+    interview = await db.scalar(select(Interview).where(
         Interview.id == interview_id,
         Interview.user_id == current_user.id
-    ).first()
+    ))
     
     if not interview:
         raise HTTPException(
@@ -117,8 +168,8 @@ async def create_interview_session(
         notes=session_data.notes
     )
     db.add(db_session)
-    db.commit()
-    db.refresh(db_session)
+    await db.commit()
+    await db.refresh(db_session)
     
     return db_session
 
@@ -127,14 +178,14 @@ async def create_interview_session(
 async def get_interview_sessions(
     interview_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get all sessions for an interview"""
     # Check if interview exists and belongs to user
-    interview = db.query(Interview).filter(
+    interview = await db.scalar(select(Interview).where(
         Interview.id == interview_id,
         Interview.user_id == current_user.id
-    ).first()
+    ))
     
     if not interview:
         raise HTTPException(
@@ -142,27 +193,31 @@ async def get_interview_sessions(
             detail="Interview not found"
         )
     
-    sessions = db.query(InterviewSession).filter(
+    sessions = (await db.scalars(select(InterviewSession).where(
         InterviewSession.interview_id == interview_id
-    ).all()
+    ))).all()
     
     return sessions
 
 
-@router.post("/{interview_id}/sessions/{session_id}/feedback", response_model=InterviewFeedback)
+@router.post(
+    "/{interview_id}/sessions/{session_id}/feedback",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED
+)
 async def submit_interview_feedback(
     interview_id: int,
     session_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    """Process and generate feedback for an interview session"""
+    """Queue feedback generation for an interview session"""
     # Check if session exists and belongs to user
-    session = db.query(InterviewSession).filter(
+    session = await db.scalar(select(InterviewSession).where(
         InterviewSession.id == session_id,
         InterviewSession.interview_id == interview_id,
         InterviewSession.user_id == current_user.id
-    ).first()
+    ))
     
     if not session:
         raise HTTPException(
@@ -170,41 +225,45 @@ async def submit_interview_feedback(
             detail="Interview session not found"
         )
     
-    # Process feedback
-    feedback = process_interview_feedback(session_id)
+    await admit_user(current_user.id, estimate_tokens(max_tokens=1000))
     
-    # Update session status
-    session.status = "completed"
-    db.commit()
+    # Process feedback in the background; the job result holds the feedback
+    job = await job_queue.submit(
+        db,
+        "interview.feedback",
+        {"session_id": session_id},
+        user_id=current_user.id
+    )
     
-    return feedback
+    return job
 
 
 @router.websocket("/ws/{interview_id}/{session_id}")
 async def interview_websocket(
     websocket: WebSocket,
     interview_id: int,
-    session_id: int,
-    db: Session = Depends(get_db)
+    session_id: int
 ):
     """WebSocket endpoint for real-time interview assistance"""
     await websocket.accept()
     
     try:
-        # Validate session
-        session = db.query(InterviewSession).filter(
-            InterviewSession.id == session_id,
-            InterviewSession.interview_id == interview_id
-        ).first()
-        
-        if not session:
-            await websocket.send_json({"error": "Interview session not found"})
-            await websocket.close()
-            return
-        
-        # Update session status
-        session.status = "in_progress"
-        db.commit()
+        # Validate session; sessions here are short-lived so an open socket does not hold a connection
+        async with open_session() as db:
+            session = await db.scalar(select(InterviewSession).where(
+                InterviewSession.id == session_id,
+                InterviewSession.interview_id == interview_id
+            ))
+            
+            if not session:
+                await websocket.send_json({"error": "Interview session not found"})
+                await websocket.close()
+                return
+            
+            # Update session status; its owner's next reads see it
+            db.sync_session.info["principal_id"] = session.user_id
+            session.status = "in_progress"
+            await db.commit()
         
         # Main WebSocket loop
         while True:
@@ -223,11 +282,17 @@ async def interview_websocket(
         # Handle disconnection
         pass
     finally:
-        # Update session if still in progress
-        session = db.query(InterviewSession).filter(
+        # Update session if still in progress, even if the socket task is being cancelled
+        await asyncio.shield(_mark_session_interrupted(session_id))
+
+
+async def _mark_session_interrupted(session_id: int) -> None:
+    async with open_session() as db:
+        session = await db.scalar(select(InterviewSession).where(
             InterviewSession.id == session_id
-        ).first()
+        ))
         
         if session and session.status == "in_progress":
+            db.sync_session.info["principal_id"] = session.user_id
             session.status = "interrupted"
-            db.commit()
+            await db.commit()
@@ -0,0 +1,68 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db, open_session
+from app.models.user import User
+from app.models.job import BackgroundJob
+from app.schemas.job import JobResponse
+from app.api.auth import get_current_user, get_read_db
+from app.services.job_queue import job_queue, FINISHED_STATUSES
+from app.services.sse import format_sse, sse_response
+
+router = APIRouter()
+
+# How often an SSE subscriber re-reads the job row, covering jobs run by other processes
+JOB_EVENTS_POLL_SECONDS = 2.0
+
+
+def _job_payload(job: BackgroundJob) -> dict:
+    return {field: getattr(job, field) for field in JobResponse.__fields__}
+
+
+async def _get_user_job(db: AsyncSession, job_id: str, user_id: int) -> BackgroundJob:
+    job = await db.scalar(select(BackgroundJob).where(
+        BackgroundJob.id == job_id,
+        BackgroundJob.user_id == user_id
+    ))
+    
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    
+    return job
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get the status and result of a background job"""
+    return await _get_user_job(db, job_id, current_user.id)
+
+
+@router.get("/{job_id}/events")
+async def job_events(
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Stream job status as Server-Sent Events until the job finishes"""
+    job = await _get_user_job(db, job_id, current_user.id)
+    initial = _job_payload(job)
+    
+    async def frames():
+        current = initial
+        yield format_sse(current, event="status")
+        while current["status"] not in FINISHED_STATUSES:
+            await job_queue.wait(job_id, timeout=JOB_EVENTS_POLL_SECONDS)
+            async with open_session() as poll_db:
+                current = _job_payload(await poll_db.get(BackgroundJob, job_id))
+            if current["status"] in FINISHED_STATUSES:
+                yield format_sse(current, event="status")
+    
+    return sse_response(frames())
@@ -0,0 +1,50 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from app.models.user import User
+from app.api.auth import get_current_user
+from app.services.ai_service import completion_flights
+from app.services.answer_cache import answer_cache
+from app.services.auth_service import password_hasher
+from app.services.db_metrics import db_metrics
+from app.services.job_queue import job_queue
+from app.services.job_sources import get_job_sources
+from app.services.match_index import match_index
+from app.services.principal_cache import principal_cache
+from app.services.read_routing import read_router
+from app.services.search_cache import search_cache
+from app.services.response_cache import catalog_cache
+from app.services.rate_limiter import provider_limiter, user_limiter
+from app.services.semantic_cache import semantic_cache
+from app.services.provider_router import get_router
+
+router = APIRouter()
+
+
+@router.get("/")
+async def get_metrics(current_user: User = Depends(get_current_user)):
+    """Get internal cache and performance counters (admin only)"""
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    return {
+        "answer_cache": answer_cache.stats(),
+        "response_cache": catalog_cache.stats(),
+        "semantic_cache": semantic_cache.stats(),
+        "ai_singleflight": completion_flights.stats(),
+        "ai_providers": get_router().metrics(),
+        "ai_rate_limits": {
+            "user": user_limiter.stats(),
+            "provider": provider_limiter.stats()
+        },
+        "jobs": job_queue.stats(),
+        "job_sources": {source.name: source.stats() for source in get_job_sources()},
+        "job_search_cache": search_cache.stats(),
+        "match_index": match_index.stats(),
+        "password_hashing": password_hasher.stats(),
+        "principal_cache": principal_cache.stats(),
+        "database": db_metrics.stats(),
+        "read_routing": read_router.stats()
+    }
@@ -1,6 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List, Optional
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Union
 
 from app.database import get_db
 from app.models.user import User
@@ -11,19 +15,43 @@ from app.schemas.question import (
     QuestionCategoryCreate,
     QuestionCategoryResponse,
     QuestionAnswerCreate,
+    QuestionAnswerBatchCreate,
     QuestionAnswerResponse
 )
-from app.api.auth import get_current_user
-from app.services.ai_service import generate_answer
+from app.schemas.pagination import CursorPage
+from app.api.auth import get_current_user, get_read_db
+from app.config import settings
+from app.services.answer_cache import (
+    answer_cache,
+    make_cache_key,
+    generate_answer_batch,
+    get_or_generate_answer,
+    lookup_answer,
+    lookup_similar,
+    question_owner,
+    stream_answer_events
+)
+from app.services.pagination import paginate
+from app.services.response_cache import catalog_cache, invalidate_catalog, visibility_scope
+from app.services.rate_limiter import admit_user, estimate_tokens
+from app.services.sse import format_sse, sse_response
 
 router = APIRouter()
 
 
+def _category_payload(category: QuestionCategory) -> dict:
+    return {field: getattr(category, field) for field in QuestionCategoryResponse.__fields__}
+
+
+def _question_payload(question: Question) -> dict:
+    return {field: getattr(question, field) for field in QuestionResponse.__fields__}
+
+
 @router.post("/categories", response_model=QuestionCategoryResponse)
 async def create_category(
     category_data: QuestionCategoryCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a new question category"""
     # Check if admin for global categories
@@ -41,38 +69,46 @@ async def create_category(
         user_id=current_user.id if category_data.is_personal else None
     )
     db.add(db_category)
-    db.commit()
-    db.refresh(db_category)
+    await db.commit()
+    await db.refresh(db_category)
+    invalidate_catalog(db_category.user_id)
     
     return db_category
 
 
 @router.get("/categories", response_model=List[QuestionCategoryResponse])
 async def get_categories(
+    request: Request,
     include_global: bool = True,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get all question categories (global and personal)"""
-    query = db.query(QuestionCategory)
+    cache_key = catalog_cache.key(request, await visibility_scope(db, current_user.id, include_global))
+    cached = catalog_cache.get(cache_key)
+    if cached is not None:
+        return catalog_cache.respond(cached, request)
+    
+    query = select(QuestionCategory)
     
     if include_global:
-        query = query.filter(
+        query = query.where(
             (QuestionCategory.is_personal == False) | 
             (QuestionCategory.user_id == current_user.id)
         )
     else:
-        query = query.filter(QuestionCategory.user_id == current_user.id)
+        query = query.where(QuestionCategory.user_id == current_user.id)
     
-    categories = query.all()
-    return categories
+    categories = (await db.scalars(query)).all()
+    cached = catalog_cache.set(cache_key, [_category_payload(category) for category in categories])
+    return catalog_cache.respond(cached, request)
 
 
 @router.post("/", response_model=QuestionResponse)
 async def create_question(
     question_data: QuestionCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a new question"""
     # Check if admin for global questions
@@ -83,7 +119,7 @@ async def create_question(
         )
     
     # Check if category exists
-    category = db.query(QuestionCategory).filter(QuestionCategory.id == question_data.category_id).first()
+    category = await db.get(QuestionCategory, question_data.category_id)
     if not category:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -99,54 +135,141 @@ async def create_question(
         user_id=current_user.id if question_data.is_personal else None
     )
     db.add(db_question)
-    db.commit()
-    db.refresh(db_question)
+    await db.commit()
+    await db.refresh(db_question)
+    invalidate_catalog(db_question.user_id)
     
     return db_question
 
 
-@router.get("/", response_model=List[QuestionResponse])
+@router.get("/", response_model=Union[CursorPage[QuestionResponse], List[QuestionResponse]])
 async def get_questions(
+    request: Request,
     category_id: Optional[int] = None,
     difficulty: Optional[str] = None,
     include_global: bool = True,
-    skip: int = 0,
+    cursor: Optional[str] = None,
+    skip: Optional[int] = None,
     limit: int = 100,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get questions with optional filtering"""
-    query = db.query(Question)
+    cache_key = catalog_cache.key(request, await visibility_scope(db, current_user.id, include_global))
+    cached = catalog_cache.get(cache_key)
+    if cached is not None:
+        return catalog_cache.respond(cached, request)
+    
+    query = select(Question)
     
     # Filter by category
     if category_id:
-        query = query.filter(Question.category_id == category_id)
+        query = query.where(Question.category_id == category_id)
     
     # Filter by difficulty
     if difficulty:
-        query = query.filter(Question.difficulty == difficulty)
+        query = query.where(Question.difficulty == difficulty)
     
     # Include global and personal questions
     if include_global:
-        query = query.filter(
+        query = query.where(
             (Question.is_personal == False) | 
             (Question.user_id == current_user.id)
         )
     else:
-        query = query.filter(Question.user_id == current_user.id)
+        query = query.where(Question.user_id == current_user.id)
+    
+    if skip is not None:
+        # Deprecated offset paging, kept for clients that still send skip
+        questions = (await db.scalars(query.offset(skip).limit(limit))).all()
+        payload = [_question_payload(question) for question in questions]
+    else:
+        page = await paginate(db, query, Question.created_at, Question.id, request, cursor=cursor, limit=limit)
+        payload = dict(page, items=[_question_payload(question) for question in page["items"]])
+    
+    cached = catalog_cache.set(cache_key, payload)
+    return catalog_cache.respond(cached, request)
+
+
+@router.post("/answers:batch")
+async def generate_question_answers_batch(
+    batch_data: QuestionAnswerBatchCreate,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Generate AI answers for many questions concurrently, streamed back as NDJSON"""
+    question_ids = list(dict.fromkeys(batch_data.question_ids))
+    if len(question_ids) > settings.ANSWER_BATCH_MAX_QUESTIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.ANSWER_BATCH_MAX_QUESTIONS} questions per batch"
+        )
+    
+    # Load all requested questions the user can see in one query
+    questions = (await db.execute(select(Question.id, Question.text, Question.is_personal, Question.user_id).where(
+        Question.id.in_(question_ids),
+        (Question.is_personal == False) | (Question.user_id == current_user.id)
+    ))).all()
+    found = {question.id: question.text for question in questions}
+    owners = {question.id: question.user_id for question in questions if question.is_personal}
+    
+    answer_data = QuestionAnswerCreate(
+        context=batch_data.context,
+        experience_level=batch_data.experience_level,
+        job_title=batch_data.job_title
+    )
+    keys = {
+        question_id: make_cache_key(question_id, answer_data.context, answer_data.experience_level, answer_data.job_title)
+        for question_id in found
+    }
+    if batch_data.refresh:
+        answer_cache.bypasses += len(keys)
+        cached = {}
+    else:
+        cached_by_key = await db.run_sync(answer_cache.lookup_many, list(keys.values()))
+        cached = {question_id: cached_by_key[key] for question_id, key in keys.items() if key in cached_by_key}
+        # Fall back to answers for near-duplicate questions
+        for question_id, key in keys.items():
+            if question_id not in cached:
+                similar = lookup_similar(found[question_id], answer_data, owners.get(question_id))
+                if similar is not None:
+                    answer_cache.remember(key, similar)
+                    cached[question_id] = similar
+    
+    user_id = current_user.id
     
-    questions = query.offset(skip).limit(limit).all()
-    return questions
+    async def lines():
+        for question_id in question_ids:
+            if question_id not in found:
+                yield json.dumps({"question_id": question_id, "error": "Question not found"}) + "\n"
+        async for result in generate_answer_batch(
+            [(question_id, found[question_id]) for question_id in question_ids if question_id in found],
+            answer_data,
+            cached,
+            user_id=user_id,
+            concurrency=settings.ANSWER_BATCH_CONCURRENCY,
+            owners=owners
+        ):
+            yield json.dumps(result) + "\n"
+    
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
 
 
 @router.get("/{question_id}", response_model=QuestionResponse)
 async def get_question(
+    request: Request,
     question_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get question by ID"""
-    question = db.query(Question).filter(Question.id == question_id).first()
+    # Global questions read the same for everyone; personal ones are not cached
+    cache_key = catalog_cache.key(request, "global")
+    cached = catalog_cache.get(cache_key)
+    if cached is not None:
+        return catalog_cache.respond(cached, request)
+    
+    question = await db.get(Question, question_id)
     
     if not question:
         raise HTTPException(
@@ -161,18 +284,23 @@ async def get_question(
             detail="Access denied"
         )
     
-    return question
+    if question.is_personal:
+        return question
+    
+    cached = catalog_cache.set(cache_key, _question_payload(question))
+    return catalog_cache.respond(cached, request)
 
 
 @router.post("/{question_id}/answer", response_model=QuestionAnswerResponse)
 async def generate_question_answer(
     question_id: int,
     answer_data: QuestionAnswerCreate,
+    refresh: bool = False,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    """Generate AI answer for a question"""
-    question = db.query(Question).filter(Question.id == question_id).first()
+    """Generate AI answer for a question (served from the answer cache unless refresh is set)"""
+    question = await db.get(Question, question_id)
     
     if not question:
         raise HTTPException(
@@ -180,12 +308,20 @@ async def generate_question_answer(
             detail="Question not found"
         )
     
-    # Generate answer using AI
-    answer_text = generate_answer(
-        question=question.text,
-        context=answer_data.context,
-        experience_level=answer_data.experience_level,
-        job_title=answer_data.job_title
+    # Check if user has access to this question
+    if question.is_personal and question.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied"
+        )
+    
+    # Generate answer using AI, reusing a cached answer when possible (only a miss is charged to the user)
+    answer_text, cached = await get_or_generate_answer(
+        db,
+        question,
+        answer_data,
+        user_id=current_user.id,
+        refresh=refresh
     )
     
     return {
@@ -193,5 +329,60 @@ async def generate_question_answer(
         "answer": answer_text,
         "context": answer_data.context,
         "experience_level": answer_data.experience_level,
-        "job_title": answer_data.job_title
+        "job_title": answer_data.job_title,
+        "cached": cached
     }
+
+
+@router.get("/{question_id}/answer/stream")
+async def stream_question_answer(
+    question_id: int,
+    context: Optional[str] = None,
+    experience_level: Optional[str] = None,
+    job_title: Optional[str] = None,
+    refresh: bool = False,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Stream an AI answer for a question as Server-Sent Events"""
+    question = await db.get(Question, question_id)
+    
+    if not question:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Question not found"
+        )
+    
+    # Check if user has access to this question
+    if question.is_personal and question.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied"
+        )
+    
+    answer_data = QuestionAnswerCreate(
+        context=context,
+        experience_level=experience_level,
+        job_title=job_title
+    )
+    owner_id = question_owner(question)
+    key, cached_answer = await db.run_sync(
+        lookup_answer, question_id, answer_data, refresh, question_text=question.text, owner_id=owner_id
+    )
+    if cached_answer is None:
+        await admit_user(current_user.id, estimate_tokens(question.text, context, max_tokens=1000))
+    question_text, user_id = question.text, current_user.id
+    
+    async def frames():
+        async for event, payload in stream_answer_events(
+            key,
+            question_id,
+            question_text,
+            answer_data,
+            cached_answer=cached_answer,
+            user_id=user_id,
+            owner_id=owner_id
+        ):
+            yield format_sse(payload, event=event)
+    
+    return sse_response(frames())
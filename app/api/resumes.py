@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, status, File, UploadFile
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Union
 
-from app.database import get_db
+from app.database import get_db, open_session
 from app.models.user import User
 from app.models.resume import Resume, ResumeVersion
 from app.schemas.resume import (
@@ -12,8 +13,15 @@ from app.schemas.resume import (
     ResumeVersionResponse,
     ResumeAnalysis
 )
-from app.api.auth import get_current_user
-from app.services.resume_service import analyze_resume, generate_resume, optimize_resume
+from app.schemas.job import JobResponse
+from app.schemas.pagination import CursorPage
+from app.api.auth import get_current_user, get_read_db
+from app.services.ai_service import AIServiceNotConfigured, NOT_CONFIGURED_MESSAGE
+from app.services.job_queue import job_queue
+from app.services.pagination import paginate
+from app.services.rate_limiter import admit_user, estimate_tokens
+from app.services.resume_service import analyze_resume, generate_resume, stream_optimized_resume
+from app.services.sse import format_sse, sse_response
 
 router = APIRouter()
 
@@ -22,7 +30,7 @@ router = APIRouter()
 async def create_resume(
     resume_data: ResumeCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a new resume"""
     # Create new resume
@@ -35,38 +43,42 @@ async def create_resume(
         user_id=current_user.id
     )
     db.add(db_resume)
-    db.commit()
-    db.refresh(db_resume)
+    await db.commit()
+    await db.refresh(db_resume)
     
     return db_resume
 
 
-@router.get("/", response_model=List[ResumeResponse])
+@router.get("/", response_model=Union[CursorPage[ResumeResponse], List[ResumeResponse]])
 async def get_resumes(
-    skip: int = 0,
+    request: Request,
+    cursor: Optional[str] = None,
+    skip: Optional[int] = None,
     limit: int = 100,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get all resumes for current user"""
-    resumes = db.query(Resume).filter(
-        Resume.user_id == current_user.id
-    ).offset(skip).limit(limit).all()
+    query = select(Resume).where(Resume.user_id == current_user.id)
+    
+    if skip is not None:
+        # Deprecated offset paging, kept for clients that still send skip
+        return (await db.scalars(query.offset(skip).limit(limit))).all()
     
-    return resumes
+    return await paginate(db, query, Resume.created_at, Resume.id, request, cursor=cursor, limit=limit)
 
 
 @router.get("/{resume_id}", response_model=ResumeResponse)
 async def get_resume(
     resume_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get resume by ID"""
-    resume = db.query(Resume).filter(
+    resume = await db.scalar(select(Resume).where(
         Resume.id == resume_id,
         Resume.user_id == current_user.id
-    ).first()
+    ))
     
     if not resume:
         raise HTTPException(
@@ -82,14 +94,14 @@ async def create_resume_version(
     resume_id: int,
     version_data: ResumeVersionCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a new version of a resume"""
     # Check if resume exists and belongs to user
-    resume = db.query(Resume).filter(
+    resume = await db.scalar(select(Resume).where(
         Resume.id == resume_id,
         Resume.user_id == current_user.id
-    ).first()
+    ))
     
     if not resume:
         raise HTTPException(
@@ -109,13 +121,13 @@ async def create_resume_version(
     
     # If this version is active, deactivate other versions
     if version_data.is_active:
-        db.query(ResumeVersion).filter(
+        await db.execute(update(ResumeVersion).where(
             ResumeVersion.resume_id == resume_id,
             ResumeVersion.id != db_version.id
-        ).update({"is_active": False})
+        ).values(is_active=False))
     
-    db.commit()
-    db.refresh(db_version)
+    await db.commit()
+    await db.refresh(db_version)
     
     return db_version
 
@@ -124,14 +136,14 @@ async def create_resume_version(
 async def get_resume_versions(
     resume_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get all versions of a resume"""
     # Check if resume exists and belongs to user
-    resume = db.query(Resume).filter(
+    resume = await db.scalar(select(Resume).where(
         Resume.id == resume_id,
         Resume.user_id == current_user.id
-    ).first()
+    ))
     
     if not resume:
         raise HTTPException(
@@ -139,9 +151,9 @@ async def get_resume_versions(
             detail="Resume not found"
         )
     
-    versions = db.query(ResumeVersion).filter(
+    versions = (await db.scalars(select(ResumeVersion).where(
         ResumeVersion.resume_id == resume_id
-    ).all()
+    ))).all()
     
     return versions
 
@@ -168,19 +180,19 @@ async def upload_resume(
     return analysis
 
 
-@router.post("/{resume_id}/generate", response_model=ResumeVersionResponse)
+@router.post("/{resume_id}/generate", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
 async def generate_resume_version(
     resume_id: int,
     job_description: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    """Generate a new resume version optimized for a job description"""
+    """Queue generation of a new resume version optimized for a job description"""
     # Check if resume exists and belongs to user
-    resume = db.query(Resume).filter(
+    resume = await db.scalar(select(Resume).where(
         Resume.id == resume_id,
         Resume.user_id == current_user.id
-    ).first()
+    ))
     
     if not resume:
         raise HTTPException(
@@ -189,10 +201,10 @@ async def generate_resume_version(
         )
     
     # Get active version
-    active_version = db.query(ResumeVersion).filter(
+    active_version = await db.scalar(select(ResumeVersion).where(
         ResumeVersion.resume_id == resume_id,
         ResumeVersion.is_active == True
-    ).first()
+    ))
     
     if not active_version:
         raise HTTPException(
@@ -200,22 +212,85 @@ async def generate_resume_version(
             detail="No active resume version found"
         )
     
-    # Generate optimized resume
-    optimized_content = optimize_resume(active_version.content, job_description)
+    await admit_user(current_user.id, estimate_tokens(active_version.content, job_description, max_tokens=2000))
     
-    # Create new version
-    db_version = ResumeVersion(
-        resume_id=resume_id,
-        content=optimized_content,
-        version_name=f"Optimized for job - {resume.target_job}",
-        format=active_version.format,
-        is_active=False
+    # Optimize in the background; poll GET /jobs/{id} for the new version id
+    job = await job_queue.submit(
+        db,
+        "resume.optimize",
+        {"resume_id": resume_id, "job_description": job_description},
+        user_id=current_user.id
     )
-    db.add(db_version)
-    db.commit()
-    db.refresh(db_version)
     
-    return db_version
+    return job
+
+
+@router.get("/{resume_id}/generate/stream")
+async def stream_resume_version(
+    resume_id: int,
+    job_description: str,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Stream an optimized resume as Server-Sent Events and save it as a new version"""
+    # Check if resume exists and belongs to user
+    resume = await db.scalar(select(Resume).where(
+        Resume.id == resume_id,
+        Resume.user_id == current_user.id
+    ))
+    
+    if not resume:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume not found"
+        )
+    
+    # Get active version
+    active_version = await db.scalar(select(ResumeVersion).where(
+        ResumeVersion.resume_id == resume_id,
+        ResumeVersion.is_active == True
+    ))
+    
+    if not active_version:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No active resume version found"
+        )
+    
+    await admit_user(current_user.id, estimate_tokens(active_version.content, job_description, max_tokens=2000))
+    content, version_format, target_job = active_version.content, active_version.format, resume.target_job
+    user_id = current_user.id
+    
+    async def frames():
+        chunks = []
+        try:
+            async for delta in stream_optimized_resume(content, job_description):
+                chunks.append(delta)
+                yield format_sse({"text": delta}, event="delta")
+        except AIServiceNotConfigured:
+            yield format_sse({"detail": NOT_CONFIGURED_MESSAGE}, event="error")
+            return
+        except Exception as e:
+            print(f"Error streaming optimized resume: {str(e)}")
+            yield format_sse({"detail": f"Error optimizing resume: {str(e)}"}, event="error")
+            return
+        
+        # The stream outlives the request-scoped session, so save with a new one
+        async with open_session(principal_id=user_id) as stream_db:
+            db_version = ResumeVersion(
+                resume_id=resume_id,
+                content="".join(chunks).strip(),
+                version_name=f"Optimized for job - {target_job}",
+                format=version_format,
+                is_active=False
+            )
+            stream_db.add(db_version)
+            await stream_db.commit()
+            version_id = db_version.id
+        
+        yield format_sse({"resume_id": resume_id, "version_id": version_id}, event="done")
+    
+    return sse_response(frames())
 
 
 @router.post("/generate-from-scratch", response_model=ResumeResponse)
@@ -225,7 +300,7 @@ async def generate_resume_from_scratch(
     experience: str,
     education: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Generate a complete resume from scratch"""
     # Generate resume content
@@ -245,8 +320,8 @@ async def generate_resume_from_scratch(
         user_id=current_user.id
     )
     db.add(db_resume)
-    db.commit()
-    db.refresh(db_resume)
+    await db.commit()
+    await db.refresh(db_resume)
     
     # Create initial version
     db_version = ResumeVersion(
@@ -257,6 +332,6 @@ async def generate_resume_from_scratch(
         is_active=True
     )
     db.add(db_version)
-    db.commit()
+    await db.commit()
     
     return db_resume
@@ -1,11 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Union
 
 from app.database import get_db
 from app.models.user import User
+from app.schemas.pagination import CursorPage
 from app.schemas.user import UserResponse, UserUpdate
-from app.api.auth import get_current_user
+from app.api.auth import get_current_user, get_read_db
+from app.services.pagination import paginate
 
 router = APIRouter()
 
@@ -20,15 +23,15 @@ async def read_users_me(current_user: User = Depends(get_current_user)):
 async def update_user(
     user_update: UserUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Update current user profile"""
     # Update user fields
     for key, value in user_update.dict(exclude_unset=True).items():
         setattr(current_user, key, value)
     
-    db.commit()
-    db.refresh(current_user)
+    await db.commit()
+    await db.refresh(current_user)
     return current_user
 
 
@@ -36,7 +39,7 @@ async def update_user(
 async def get_user(
     user_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get user by ID (admin only)"""
     if not current_user.is_admin:
@@ -45,7 +48,7 @@ async def get_user(
             detail="Not enough permissions"
         )
     
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -55,12 +58,14 @@ async def get_user(
     return user
 
 
-@router.get("/", response_model=List[UserResponse])
+@router.get("/", response_model=Union[CursorPage[UserResponse], List[UserResponse]])
 async def get_users(
-    skip: int = 0,
+    request: Request,
+    cursor: Optional[str] = None,
+    skip: Optional[int] = None,
     limit: int = 100,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get all users (admin only)"""
     if not current_user.is_admin:
@@ -69,5 +74,10 @@ async def get_users(
             detail="Not enough permissions"
         )
     
-    users = db.query(User).offset(skip).limit(limit).all()
-    return users
+    query = select(User)
+    
+    if skip is not None:
+        # Deprecated offset paging, kept for clients that still send skip
+        return (await db.scalars(query.offset(skip).limit(limit))).all()
+    
+    return await paginate(db, query, User.created_at, User.id, request, cursor=cursor, limit=limit)
@@ -1,40 +1,220 @@
-from sqlalchemy import create_engine
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Optional, TypeVar
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import FrozenResult
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
 import os
 
 from app.config import settings
+from app.services.db_metrics import (
+    InstrumentedAsyncAdaptedQueuePool,
+    InstrumentedQueuePool,
+    instrument_engine
+)
+
+T = TypeVar("T")
 
 # SQLAlchemy setup
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 
-# For SQLite, we need to add check_same_thread=False
-if SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(
-        SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-    )
-else:
-    engine = create_engine(SQLALCHEMY_DATABASE_URL)
 
+def pool_options(url: str) -> dict:
+    """Queue pool sizing shared by the sync and async engines"""
+    if url.startswith("sqlite") and (url.endswith("://") or ":memory:" in url):
+        # In-memory SQLite keeps its single-connection pool
+        return {}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING
+    }
+
+
+def make_engine(url: str, name: str):
+    """Create an instrumented sync engine"""
+    # For SQLite, we need to add check_same_thread=False
+    if url.startswith("sqlite"):
+        engine_options = {"connect_args": {"check_same_thread": False}}
+    else:
+        engine_options = {}
+
+    sync_pool_options = pool_options(url)
+    if sync_pool_options:
+        engine_options.update(sync_pool_options, poolclass=InstrumentedQueuePool)
+    new_engine = create_engine(url, **engine_options)
+    instrument_engine(name, new_engine)
+    return new_engine
+
+
+def to_async_url(url: str) -> str:
+    """Swap a sync driver for its asyncio counterpart (asyncpg for Postgres, aiosqlite for SQLite)"""
+    scheme, _, rest = url.partition("://")
+    dialect = scheme.split("+")[0]
+    if dialect in ("postgres", "postgresql"):
+        return f"postgresql+asyncpg://{rest}"
+    if dialect == "sqlite":
+        return f"sqlite+aiosqlite://{rest}"
+    return url
+
+
+def make_async_engine(url: str, name: str):
+    """Create an instrumented async engine for the asyncio counterpart of a sync URL"""
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    async_pool_options = pool_options(url)
+    if async_pool_options:
+        async_pool_options["poolclass"] = InstrumentedAsyncAdaptedQueuePool
+    new_engine = create_async_engine(to_async_url(url), **async_pool_options)
+    instrument_engine(name, new_engine.sync_engine)
+    return new_engine
+
+
+engine = make_engine(SQLALCHEMY_DATABASE_URL, "sync")
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
-# Supabase client
+# Async engine, used by request handlers when DATABASE_ASYNC is enabled
+async_engine = None
+AsyncSessionLocal = None
+if settings.DATABASE_ASYNC:
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    async_engine = make_async_engine(SQLALCHEMY_DATABASE_URL, "async")
+    # Expired attributes cannot be lazily reloaded under asyncio, so keep them after commit
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# Optional read replica for GET routes (see app.services.read_routing)
+read_engine = None
+ReadSessionLocal = None
+AsyncReadSessionLocal = None
+if settings.DATABASE_READ_URL:
+    read_engine = make_engine(settings.DATABASE_READ_URL, "read")
+    ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+    if settings.DATABASE_ASYNC:
+        AsyncReadSessionLocal = async_sessionmaker(
+            make_async_engine(settings.DATABASE_READ_URL, "async_read"),
+            autoflush=False,
+            expire_on_commit=False
+        )
+
+# Supabase client, created (and the SDK imported) on first use
 supabase = None
-if hasattr(settings, 'SUPABASE_URL') and hasattr(settings, 'SUPABASE_KEY') and settings.SUPABASE_URL and settings.SUPABASE_KEY:
-    from supabase import create_client, Client
-    supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
 
 
-# Dependency to get DB session
-def get_db():
-    db = SessionLocal()
+class ThreadedSession:
+    """The subset of the AsyncSession API used by the routers, over a sync Session
+
+    Every call that can touch the database runs in the threadpool, so routers are
+    written once against the async API and never block the event loop in either mode.
+    """
+
+    def __init__(self, session: Session):
+        self.sync_session = session
+
+    async def run_sync(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Call fn(sync_session, *args, **kwargs) off the event loop"""
+        return await run_in_threadpool(fn, self.sync_session, *args, **kwargs)
+
+    async def execute(self, statement: Any, *args: Any, **kwargs: Any) -> Any:
+        def execute(session: Session) -> Any:
+            result = session.execute(statement, *args, **kwargs)
+            # Buffer rows in the worker thread, like AsyncSession does
+            try:
+                return result.freeze()
+            except NotImplementedError:
+                # Statements without rows (UPDATE/DELETE) cannot be frozen
+                return result
+
+        result = await self.run_sync(execute)
+        return result() if isinstance(result, FrozenResult) else result
+
+    async def scalar(self, statement: Any, *args: Any, **kwargs: Any) -> Any:
+        return await self.run_sync(lambda s: s.scalar(statement, *args, **kwargs))
+
+    async def scalars(self, statement: Any, *args: Any, **kwargs: Any) -> Any:
+        return (await self.execute(statement, *args, **kwargs)).scalars()
+
+    async def get(self, entity: Any, ident: Any, **kwargs: Any) -> Any:
+        return await self.run_sync(lambda s: s.get(entity, ident, **kwargs))
+
+    async def merge(self, instance: T, load: bool = True) -> T:
+        if not load:
+            # No SQL is emitted without load, so skip the thread hop
+            return self.sync_session.merge(instance, load=False)
+        return await self.run_sync(lambda s: s.merge(instance, load=load))
+
+    def add(self, instance: Any) -> None:
+        self.sync_session.add(instance)
+
+    def add_all(self, instances: Any) -> None:
+        self.sync_session.add_all(instances)
+
+    async def delete(self, instance: Any) -> None:
+        await self.run_sync(lambda s: s.delete(instance))
+
+    async def flush(self) -> None:
+        await self.run_sync(lambda s: s.flush())
+
+    async def commit(self) -> None:
+        await self.run_sync(lambda s: s.commit())
+
+    async def rollback(self) -> None:
+        await self.run_sync(lambda s: s.rollback())
+
+    async def refresh(self, instance: Any, attribute_names: Optional[Any] = None) -> None:
+        await self.run_sync(lambda s: s.refresh(instance, attribute_names))
+
+    async def close(self) -> None:
+        await self.run_sync(lambda s: s.close())
+
+
+@asynccontextmanager
+async def open_session(read_only: bool = False, replica: bool = False, principal_id: Optional[int] = None) -> AsyncIterator[Any]:
+    """Open an AsyncSession, or a ThreadedSession over a sync Session when DATABASE_ASYNC is off
+
+    Streaming responses and background jobs use this directly, since they outlive the
+    request-scoped session. A read_only session refuses to flush changes; replica routes it
+    to DATABASE_READ_URL when one is configured. principal_id is the user on whose behalf
+    the session writes, whose next reads then stick to the primary (see read_routing).
+    """
+    replica = replica and read_engine is not None
+    if AsyncSessionLocal is not None:
+        async with (AsyncReadSessionLocal if replica else AsyncSessionLocal)() as db:
+            db.sync_session.info["read_only"] = read_only
+            db.sync_session.info["principal_id"] = principal_id
+            yield db
+        return
+
+    db = ThreadedSession((ReadSessionLocal if replica else SessionLocal)(expire_on_commit=False))
+    db.sync_session.info["read_only"] = read_only
+    db.sync_session.info["principal_id"] = principal_id
     try:
         yield db
     finally:
-        db.close()
+        await db.close()
+
+
+@event.listens_for(Session, "before_flush")
+def _refuse_read_only_writes(session: Session, flush_context, instances) -> None:
+    if session.info.get("read_only") and (session.new or session.dirty or session.deleted):
+        raise RuntimeError("Attempted to write through a read-only session")
+
+
+# Dependency to get DB session
+async def get_db() -> AsyncIterator[Any]:
+    async with open_session() as db:
+        yield db
 
 
 # Dependency to get Supabase client
 def get_supabase():
+    global supabase
+    if supabase is None and settings.SUPABASE_URL and settings.SUPABASE_KEY:
+        from supabase import create_client
+        supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
     return supabase
@@ -1,14 +1,66 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-import uvicorn
+from starlette.concurrency import run_in_threadpool
 
 from app.config import settings
-from app.api import auth, users, interviews, resumes, questions, applications
-from app.database import Base, engine
+from app.api import auth, users, interviews, resumes, questions, applications, metrics, jobs
+from app.database import Base, SessionLocal, engine
+from app.services.answer_cache import rebuild_semantic_cache
+from app.services.auth_service import password_hasher
+from app.services.db_metrics import QueryStatsMiddleware
+from app.services.llm_client import close_http_client
+from app.services.job_queue import job_queue
+from app.services.match_index import sync_match_index
+from app.services.pagination import InvalidCursor
+from app.services.rate_limiter import RateLimited
+from app.services import job_handlers  # registers background job handlers
+
+
+def warm_semantic_cache() -> None:
+    db = SessionLocal()
+    try:
+        rebuild_semantic_cache(db)
+    except Exception as e:
+        print(f"Error rebuilding semantic answer cache: {str(e)}")
+    finally:
+        db.close()
+
+
+def warm_match_index() -> None:
+    try:
+        sync_match_index()
+    except Exception as e:
+        print(f"Error loading job posting match index: {str(e)}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Startup: create tables if asked to (the schema is managed by Alembic migrations; create_all is
+    # a local development shortcut), start background job workers (resuming unfinished jobs) and
+    # rebuild the semantic answer and posting match indexes in the background (answer lookups just miss
+    # until loaded; a match request before then catches up itself)
+    if settings.DATABASE_CREATE_TABLES:
+        await run_in_threadpool(Base.metadata.create_all, bind=engine)
+    await job_queue.start()
+    warm_tasks = [
+        asyncio.create_task(run_in_threadpool(warm_semantic_cache)),
+        asyncio.create_task(run_in_threadpool(warm_match_index))
+    ]
+    
+    yield
+    
+    # Shutdown: stop job workers, release pooled AI provider connections and the password hashing pool
+    for warm_task in warm_tasks:
+        warm_task.cancel()
+    await asyncio.gather(*warm_tasks, return_exceptions=True)
+    await job_queue.stop()
+    await close_http_client()
+    password_hasher.shutdown()
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
 
 app = FastAPI(
     title=settings.APP_NAME,
@@ -16,6 +68,7 @@ app = FastAPI(
     version="0.1.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # Set up CORS middleware
@@ -27,6 +80,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Attribute database queries to routes (per-request counts, N+1 detection)
+app.add_middleware(QueryStatsMiddleware)
+
 # Root endpoint
 @app.get("/")
 async def root():
@@ -44,8 +100,25 @@ app.include_router(interviews.router, prefix=f"{settings.API_PREFIX}/interviews"
 app.include_router(resumes.router, prefix=f"{settings.API_PREFIX}/resumes", tags=["Resumes"])
 app.include_router(questions.router, prefix=f"{settings.API_PREFIX}/questions", tags=["Questions"])
 app.include_router(applications.router, prefix=f"{settings.API_PREFIX}/applications", tags=["Applications"])
+app.include_router(jobs.router, prefix=f"{settings.API_PREFIX}/jobs", tags=["Jobs"])
+app.include_router(metrics.router, prefix=f"{settings.API_PREFIX}/metrics", tags=["Metrics"])
 
 # Exception handlers
+@app.exception_handler(RateLimited)
+async def rate_limited_handler(request, exc):
+    return JSONResponse(
+        status_code=429,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+@app.exception_handler(InvalidCursor)
+async def invalid_cursor_handler(request, exc):
+    return JSONResponse(
+        status_code=400,
+        content={"detail": str(exc)},
+    )
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     return JSONResponse(
@@ -54,4 +127,6 @@ async def global_exception_handler(request, exc):
     )
 
 if __name__ == "__main__":
+    import uvicorn
+
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, Integer, String, DateTime, Text, ForeignKey, JSON
+from sqlalchemy import BigInteger, Boolean, Column, Integer, LargeBinary, SmallInteger, String, DateTime, Text, ForeignKey, JSON, Index, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
@@ -7,6 +7,16 @@ from app.database import Base
 
 class JobPosting(Base):
     __tablename__ = "job_postings"
+    __table_args__ = (
+        # Dedupe lookups on save; only postings with an external id are unique per source
+        Index(
+            "ix_job_postings_source_external_id", "source", "external_id", unique=True,
+            postgresql_where=text("external_id IS NOT NULL"),
+            sqlite_where=text("external_id IS NOT NULL")
+        ),
+        # Keyset pagination order
+        Index("ix_job_postings_created_at_id", "created_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
@@ -22,6 +32,10 @@ class JobPosting(Base):
     posted_at = Column(DateTime(timezone=True))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
+    # Near-duplicate detection: the MinHash signature, and the posting this one duplicates (None if canonical)
+    minhash = Column(LargeBinary)
+    canonical_id = Column(Integer, ForeignKey("job_postings.id"), index=True)
+    
     # Relationships
     applications = relationship("JobApplication", back_populates="job_posting")
     
@@ -29,8 +43,25 @@ class JobPosting(Base):
         return f"<JobPosting {self.title} at {self.company}>"
 
 
+# One LSH band bucket of a posting's MinHash signature; postings sharing a bucket are duplicate candidates
+class JobPostingBand(Base):
+    __tablename__ = "job_posting_bands"
+    
+    band = Column(SmallInteger, primary_key=True)
+    bucket = Column(BigInteger, primary_key=True)
+    posting_id = Column(Integer, ForeignKey("job_postings.id", ondelete="CASCADE"), primary_key=True)
+    
+    def __repr__(self):
+        return f"<JobPostingBand {self.band}:{self.bucket} -> {self.posting_id}>"
+
+
 class JobApplication(Base):
     __tablename__ = "job_applications"
+    __table_args__ = (
+        Index("ix_job_applications_user_id_job_posting_id", "user_id", "job_posting_id", unique=True),
+        Index("ix_job_applications_user_id_status", "user_id", "status"),
+        Index("ix_job_applications_user_id_applied_at_id", "user_id", "applied_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     job_posting_id = Column(Integer, ForeignKey("job_postings.id"))
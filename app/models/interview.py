@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, Integer, String, DateTime, Text, ForeignKey, JSON
+from sqlalchemy import Boolean, Column, Integer, String, DateTime, Text, ForeignKey, JSON, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
@@ -7,6 +7,9 @@ from app.database import Base
 
 class Interview(Base):
     __tablename__ = "interviews"
+    __table_args__ = (
+        Index("ix_interviews_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
@@ -16,7 +19,8 @@ class Interview(Base):
     industry = Column(String)
     difficulty = Column(String)  # easy, medium, hard
     is_public = Column(Boolean, default=False)
-    user_id = Column(Integer, ForeignKey("users.id"))
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
+    generation_job_id = Column(String(32), ForeignKey("background_jobs.id"))  # question generation, if requested
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
@@ -32,7 +36,7 @@ class InterviewSession(Base):
     __tablename__ = "interview_sessions"
     
     id = Column(Integer, primary_key=True, index=True)
-    interview_id = Column(Integer, ForeignKey("interviews.id"))
+    interview_id = Column(Integer, ForeignKey("interviews.id"), index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     status = Column(String)  # scheduled, in_progress, completed, interrupted
     scheduled_at = Column(DateTime(timezone=True))
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, JSON
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class BackgroundJob(Base):
+    __tablename__ = "background_jobs"
+    
+    id = Column(String(32), primary_key=True)  # uuid4 hex
+    job_type = Column(String, nullable=False)  # resume.optimize, interview.feedback, interview.questions
+    status = Column(String, nullable=False, default="queued")  # queued, running, succeeded, failed
+    user_id = Column(Integer, ForeignKey("users.id"))
+    payload = Column(JSON)
+    result = Column(JSON)
+    error = Column(Text)
+    attempts = Column(Integer, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True))
+    lease_expires_at = Column(DateTime(timezone=True))  # while running; renewed by the worker's heartbeat
+    finished_at = Column(DateTime(timezone=True))
+    
+    def __repr__(self):
+        return f"<BackgroundJob {self.id} {self.job_type} ({self.status})>"
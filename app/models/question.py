@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, Integer, String, DateTime, Text, ForeignKey, JSON
+from sqlalchemy import Boolean, Column, Integer, String, DateTime, Text, ForeignKey, JSON, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
@@ -24,6 +24,10 @@ class QuestionCategory(Base):
 
 class Question(Base):
     __tablename__ = "questions"
+    __table_args__ = (
+        Index("ix_questions_category_id_is_personal_user_id", "category_id", "is_personal", "user_id"),
+        Index("ix_questions_created_at_id", "created_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     text = Column(Text, nullable=False)
@@ -52,6 +56,7 @@ class QuestionAnswer(Base):
     context = Column(Text)
     experience_level = Column(String)
     job_title = Column(String)
+    cache_key = Column(String(64), index=True)  # set on AI-generated answers reused by the answer cache
     rating = Column(Integer)  # 1-5
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
@@ -33,11 +33,21 @@ class JobPostingCreate(JobPostingBase):
 class JobPostingResponse(JobPostingBase):
     id: int
     created_at: datetime
+    canonical_id: Optional[int] = None
     
     class Config:
         orm_mode = True
 
 
+class JobPostingMatch(JobPostingResponse):
+    score: float
+
+
+class JobPostingBulkResponse(BaseModel):
+    inserted: List[int]
+    updated: List[int]
+
+
 class JobApplicationBase(BaseModel):
     job_posting_id: int
     resume_id: int
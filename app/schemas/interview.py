@@ -23,6 +23,7 @@ class InterviewResponse(InterviewBase):
     is_public: bool
     created_at: datetime
     updated_at: Optional[datetime] = None
+    generation_job_id: Optional[str] = None
     
     class Config:
         orm_mode = True
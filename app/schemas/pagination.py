@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+from typing import Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+# One keyset page; next/prev are ready-to-follow URLs, None at either end
+class CursorPage(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+    next: Optional[str] = None
+    prev: Optional[str] = None
@@ -52,9 +52,15 @@ class QuestionAnswerCreate(QuestionAnswerBase):
     pass
 
 
+class QuestionAnswerBatchCreate(QuestionAnswerBase):
+    question_ids: List[int]
+    refresh: bool = False
+
+
 class QuestionAnswerResponse(QuestionAnswerBase):
     question_id: int
     answer: str
+    cached: bool = False
     
     class Config:
         orm_mode = True
@@ -1,142 +1,165 @@
-import os
-import openai
-import anthropic
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional
 
-from app.config import settings
+from app.services.llm_client import CompletionRequest, get_providers
+from app.services.provider_router import get_router
+from app.services.question_parser import IncrementalJSONArrayParser, normalize_question, parse_questions
+from app.services.singleflight import SingleFlight
 
-# Configure API clients
-openai.api_key = settings.OPENAI_API_KEY
-anthropic_client = anthropic.Anthropic(api_key=settings.ANTHROPIC_API_KEY) if settings.ANTHROPIC_API_KEY else None
+NOT_CONFIGURED_MESSAGE = "AI service is not configured. Please set up OpenAI or Anthropic API keys."
+ANSWER_SYSTEM_PROMPT = "You are an expert interview coach helping a candidate prepare for a job interview."
+QUESTIONS_SYSTEM_PROMPT = "You are an expert interview question generator."
 
 
-def generate_answer(question: str, context: Optional[str] = None, experience_level: Optional[str] = None, job_title: Optional[str] = None) -> str:
-    """Generate an AI answer for an interview question"""
-    # Build prompt
+# Identical prompts issued concurrently share a single upstream call
+completion_flights = SingleFlight()
+
+
+class AIServiceNotConfigured(Exception):
+    """Raised when no AI provider has an API key configured"""
+
+
+async def complete(system: str, prompt: str, max_tokens: int = 1000, temperature: float = 0.7) -> str:
+    """Run a routed completion, coalescing identical in-flight requests"""
+    if not get_providers():
+        raise AIServiceNotConfigured(NOT_CONFIGURED_MESSAGE)
+
+    request = CompletionRequest(system=system, prompt=prompt, max_tokens=max_tokens, temperature=temperature)
+    router = get_router()
+    return await completion_flights.do(request, lambda: router.complete(request))
+
+
+async def stream_complete(system: str, prompt: str, max_tokens: int = 1000, temperature: float = 0.7) -> AsyncIterator[str]:
+    """Stream completion text deltas from the best available provider"""
+    if not get_providers():
+        raise AIServiceNotConfigured(NOT_CONFIGURED_MESSAGE)
+
+    request = CompletionRequest(system=system, prompt=prompt, max_tokens=max_tokens, temperature=temperature)
+    async for delta in get_router().stream(request):
+        yield delta
+
+
+def build_answer_prompt(question: str, context: Optional[str] = None, experience_level: Optional[str] = None, job_title: Optional[str] = None) -> str:
+    """Build the prompt used to answer an interview question"""
     prompt = f"Question: {question}\n\n"
-    
+
     if context:
         prompt += f"Context: {context}\n\n"
-    
+
     if experience_level:
         prompt += f"Experience Level: {experience_level}\n\n"
-    
+
     if job_title:
         prompt += f"Job Title: {job_title}\n\n"
-    
+
     prompt += "Please provide a comprehensive answer to this interview question that demonstrates expertise and confidence."
-    
+    return prompt
+
+
+async def request_answer(question: str, context: Optional[str] = None, experience_level: Optional[str] = None, job_title: Optional[str] = None) -> str:
+    """Generate an AI answer for an interview question, raising on provider errors"""
+    prompt = build_answer_prompt(question, context, experience_level, job_title)
+    return await complete(
+        system=ANSWER_SYSTEM_PROMPT,
+        prompt=prompt,
+        max_tokens=1000,
+        temperature=0.7
+    )
+
+
+async def stream_answer(question: str, context: Optional[str] = None, experience_level: Optional[str] = None, job_title: Optional[str] = None) -> AsyncIterator[str]:
+    """Stream an AI answer for an interview question as text deltas"""
+    prompt = build_answer_prompt(question, context, experience_level, job_title)
+    async for delta in stream_complete(
+        system=ANSWER_SYSTEM_PROMPT,
+        prompt=prompt,
+        max_tokens=1000,
+        temperature=0.7
+    ):
+        yield delta
+
+
+async def generate_answer(question: str, context: Optional[str] = None, experience_level: Optional[str] = None, job_title: Optional[str] = None) -> str:
+    """Generate an AI answer for an interview question"""
     try:
-        # Try OpenAI first
-        if settings.OPENAI_API_KEY:
-            response = openai.ChatCompletion.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are an expert interview coach helping a candidate prepare for a job interview."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=1000,
-                temperature=0.7
-            )
-            return response.choices[0].message.content.strip()
-        
-        # Fall back to Anthropic
-        elif anthropic_client:
-            response = anthropic_client.completions.create(
-                model="claude-2",
-                prompt=f"{anthropic.HUMAN_PROMPT} {prompt} {anthropic.AI_PROMPT}",
-                max_tokens_to_sample=1000,
-                temperature=0.7
-            )
-            return response.completion.strip()
-        
-        else:
-            return "AI service is not configured. Please set up OpenAI or Anthropic API keys."
-    
+        return await request_answer(question, context, experience_level, job_title)
+
+    except AIServiceNotConfigured:
+        return NOT_CONFIGURED_MESSAGE
+
     except Exception as e:
         print(f"Error generating AI answer: {str(e)}")
         return f"Error generating answer: {str(e)}"
 
 
-def analyze_text(text: str, analysis_type: str) -> Dict[str, Any]:
+async def analyze_text(text: str, analysis_type: str) -> Dict[str, Any]:
     """Analyze text using AI (sentiment, keywords, etc.)"""
     prompt = f"Please analyze the following text for {analysis_type}:\n\n{text}"
-    
+
     try:
-        if settings.OPENAI_API_KEY:
-            response = openai.ChatCompletion.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are an expert text analyzer."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=1000,
-                temperature=0.3
-            )
-            return {"analysis": response.choices[0].message.content.strip()}
-        
-        elif anthropic_client:
-            response = anthropic_client.completions.create(
-                model="claude-2",
-                prompt=f"{anthropic.HUMAN_PROMPT} {prompt} {anthropic.AI_PROMPT}",
-                max_tokens_to_sample=1000,
-                temperature=0.3
-            )
-            return {"analysis": response.completion.strip()}
-        
-        else:
-            return {"error": "AI service is not configured. Please set up OpenAI or Anthropic API keys."}
-    
+        analysis = await complete(
+            system="You are an expert text analyzer.",
+            prompt=prompt,
+            max_tokens=1000,
+            temperature=0.3
+        )
+        return {"analysis": analysis}
+
+    except AIServiceNotConfigured:
+        return {"error": NOT_CONFIGURED_MESSAGE}
+
     except Exception as e:
         print(f"Error analyzing text: {str(e)}")
         return {"error": f"Error analyzing text: {str(e)}"}
 
 
-def generate_interview_questions(job_title: str, industry: str, difficulty: str, num_questions: int = 10) -> List[Dict[str, Any]]:
-    """Generate interview questions based on job title and industry"""
-    prompt = f"""Generate {num_questions} {difficulty} interview questions for a {job_title} position in the {industry} industry.
-    
+def build_questions_prompt(job_title: str, industry: str, difficulty: str, num_questions: int) -> str:
+    """Build the prompt used to generate interview questions as a JSON array"""
+    return f"""Generate {num_questions} {difficulty} interview questions for a {job_title} position in the {industry} industry.
+
     For each question, provide:
-    1. The question text
-    2. The category (technical, behavioral, situational, etc.)
-    3. What the interviewer is looking for in an answer
-    
-    Format the response as a list of JSON objects."""
-    
+    1. "text": the question text
+    2. "category": the category (technical, behavioral, situational, etc.)
+    3. "difficulty": easy, medium or hard
+    4. "interviewer_notes": what the interviewer is looking for in an answer
+
+    Respond with only a JSON array of objects with exactly those keys."""
+
+
+async def generate_interview_questions(job_title: str, industry: str, difficulty: str, num_questions: int = 10) -> List[Dict[str, Any]]:
+    """Generate interview questions based on job title and industry"""
+    prompt = build_questions_prompt(job_title, industry, difficulty, num_questions)
+
     try:
-        if settings.OPENAI_API_KEY:
-            response = openai.ChatCompletion.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are an expert interview question generator."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=2000,
-                temperature=0.7
-            )
-            # Parse the response to extract questions
-            # This is a simplified implementation - in production, you'd want more robust parsing
-            questions_text = response.choices[0].message.content.strip()
-            # In a real implementation, parse the JSON string into a list of dictionaries
-            # For now, return a placeholder
-            return [{"text": "Sample question", "category": "behavioral", "interviewer_notes": "Looking for X, Y, Z"}]
-        
-        elif anthropic_client:
-            response = anthropic_client.completions.create(
-                model="claude-2",
-                prompt=f"{anthropic.HUMAN_PROMPT} {prompt} {anthropic.AI_PROMPT}",
-                max_tokens_to_sample=2000,
-                temperature=0.7
-            )
-            # Parse the response to extract questions
-            questions_text = response.completion.strip()
-            # In a real implementation, parse the JSON string into a list of dictionaries
-            # For now, return a placeholder
-            return [{"text": "Sample question", "category": "behavioral", "interviewer_notes": "Looking for X, Y, Z"}]
-        
-        else:
-            return [{"text": "AI service is not configured. Please set up OpenAI or Anthropic API keys.", "category": "error", "interviewer_notes": ""}]
-    
+        questions_text = await complete(
+            system=QUESTIONS_SYSTEM_PROMPT,
+            prompt=prompt,
+            max_tokens=2000,
+            temperature=0.7
+        )
+        return parse_questions(questions_text, default_difficulty=difficulty)[:num_questions]
+
+    except AIServiceNotConfigured:
+        return [{"text": NOT_CONFIGURED_MESSAGE, "category": "error", "interviewer_notes": ""}]
+
     except Exception as e:
         print(f"Error generating interview questions: {str(e)}")
         return [{"text": f"Error generating questions: {str(e)}", "category": "error", "interviewer_notes": ""}]
+
+
+async def stream_interview_questions(job_title: str, industry: str, difficulty: str, num_questions: int = 10) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Stream generated interview questions, yielding each batch completed by a chunk of output"""
+    parser = IncrementalJSONArrayParser()
+    emitted = 0
+    async for delta in stream_complete(
+        system=QUESTIONS_SYSTEM_PROMPT,
+        prompt=build_questions_prompt(job_title, industry, difficulty, num_questions),
+        max_tokens=2000,
+        temperature=0.7
+    ):
+        batch = [q for q in (normalize_question(obj, difficulty) for obj in parser.feed(delta)) if q]
+        batch = batch[:num_questions - emitted]
+        if batch:
+            emitted += len(batch)
+            yield batch
+        if emitted >= num_questions:
+            break
@@ -0,0 +1,350 @@
+import asyncio
+import hashlib
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import open_session
+from app.models.question import Question, QuestionAnswer
+from app.schemas.question import QuestionAnswerCreate
+from app.services.ai_service import AIServiceNotConfigured, NOT_CONFIGURED_MESSAGE, request_answer, stream_answer
+from app.services.cache import TTLCache
+from app.services.rate_limiter import RateLimited, admit_user, estimate_tokens
+from app.services.semantic_cache import semantic_cache
+
+
+def _normalize(value: Optional[str]) -> str:
+    """Collapse whitespace and case so trivially different inputs share a key"""
+    return " ".join(value.split()).lower() if value else ""
+
+
+def make_cache_key(question_id: int, context: Optional[str], experience_level: Optional[str], job_title: Optional[str]) -> str:
+    """Build the cache key for an answer from the normalized request fields"""
+    context_hash = hashlib.sha256(_normalize(context).encode()).hexdigest()
+    raw = "|".join([str(question_id), context_hash, _normalize(experience_level), _normalize(job_title)])
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def make_scope(context: Optional[str], experience_level: Optional[str], job_title: Optional[str], owner_id: Optional[int] = None) -> str:
+    """Build the semantic cache scope: answers are only reused for the same normalized context
+
+    Answers to a personal question are scoped to its owner, so they never reach another user.
+    """
+    context_hash = hashlib.sha256(_normalize(context).encode()).hexdigest()
+    parts = [context_hash, _normalize(experience_level), _normalize(job_title)]
+    if owner_id is not None:
+        parts.append(f"user:{owner_id}")
+    return "|".join(parts)
+
+
+def question_owner(question: Question) -> Optional[int]:
+    """The user a question's answers are scoped to: the owner of a personal question, else None"""
+    return question.user_id if question.is_personal else None
+
+
+class AnswerCache:
+    """In-process LRU/TTL tier in front of AI answers persisted in question_answers"""
+
+    def __init__(self, maxsize: int, ttl: int, db_ttl: int):
+        self._memory = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.db_ttl = db_ttl
+        self.memory_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+        self.bypasses = 0
+
+    def remember(self, key: str, answer_text: str) -> None:
+        """Put an answer in the memory tier only"""
+        self._memory.set(key, answer_text)
+
+    def lookup(self, db: Session, key: str) -> Optional[str]:
+        """Look up an answer in memory first, then in the database"""
+        answer_text = self._memory.get(key)
+        if answer_text is not None:
+            self.memory_hits += 1
+            return answer_text
+
+        query = db.query(QuestionAnswer.answer_text).filter(
+            QuestionAnswer.cache_key == key,
+            QuestionAnswer.is_ai_generated == True
+        )
+        if self.db_ttl:
+            cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.db_ttl)
+            query = query.filter(QuestionAnswer.created_at >= cutoff)
+        row = query.order_by(QuestionAnswer.created_at.desc()).first()
+
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.db_hits += 1
+        self._memory.set(key, row.answer_text)
+        return row.answer_text
+
+    def store(self, db: Session, key: str, question_id: int, answer_data: QuestionAnswerCreate, answer_text: str, user_id: Optional[int] = None) -> None:
+        """Persist a freshly generated answer and promote it to the memory tier"""
+        db.add(QuestionAnswer(
+            question_id=question_id,
+            user_id=user_id,
+            answer_text=answer_text,
+            is_ai_generated=True,
+            context=answer_data.context,
+            experience_level=answer_data.experience_level,
+            job_title=answer_data.job_title,
+            cache_key=key
+        ))
+        db.commit()
+        self._memory.set(key, answer_text)
+
+    def lookup_many(self, db: Session, keys: List[str]) -> Dict[str, str]:
+        """Look up several answers, querying the database once for all memory misses"""
+        found: Dict[str, str] = {}
+        remaining = []
+        for key in keys:
+            answer_text = self._memory.get(key)
+            if answer_text is not None:
+                self.memory_hits += 1
+                found[key] = answer_text
+            else:
+                remaining.append(key)
+
+        if remaining:
+            query = db.query(QuestionAnswer.cache_key, QuestionAnswer.answer_text).filter(
+                QuestionAnswer.cache_key.in_(remaining),
+                QuestionAnswer.is_ai_generated == True
+            )
+            if self.db_ttl:
+                cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.db_ttl)
+                query = query.filter(QuestionAnswer.created_at >= cutoff)
+            # Oldest first so the newest answer for a key wins
+            for row in query.order_by(QuestionAnswer.created_at.asc()):
+                found[row.cache_key] = row.answer_text
+
+        for key in remaining:
+            if key in found:
+                self.db_hits += 1
+                self._memory.set(key, found[key])
+            else:
+                self.misses += 1
+        return found
+
+    def store_many(self, db: Session, rows: List[Dict[str, Any]]) -> None:
+        """Persist several generated answers with a single bulk INSERT"""
+        if not rows:
+            return
+        db.execute(insert(QuestionAnswer), [dict(row, is_ai_generated=True) for row in rows])
+        db.commit()
+        for row in rows:
+            self._memory.set(row["cache_key"], row["answer_text"])
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.memory_hits + self.db_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "db_hits": self.db_hits,
+            "misses": self.misses,
+            "bypasses": self.bypasses,
+            "memory_entries": len(self._memory),
+            "hit_ratio": (self.memory_hits + self.db_hits) / lookups if lookups else 0.0
+        }
+
+
+answer_cache = AnswerCache(
+    maxsize=settings.ANSWER_CACHE_MAX_ENTRIES,
+    ttl=settings.ANSWER_CACHE_TTL_SECONDS,
+    db_ttl=settings.ANSWER_CACHE_DB_TTL_SECONDS
+)
+
+
+def lookup_similar(question_text: str, answer_data: QuestionAnswerCreate, owner_id: Optional[int] = None) -> Optional[str]:
+    """Find an answer to a near-duplicate question asked with the same context (and owner, if personal)"""
+    if not settings.SEMANTIC_CACHE_ENABLED:
+        return None
+    scope = make_scope(answer_data.context, answer_data.experience_level, answer_data.job_title, owner_id)
+    return semantic_cache.lookup(question_text, scope)
+
+
+def index_answer(question_id: int, question_text: str, answer_data: QuestionAnswerCreate, answer_text: str, owner_id: Optional[int] = None) -> None:
+    """Make a generated answer available to near-duplicate questions"""
+    if settings.SEMANTIC_CACHE_ENABLED:
+        scope = make_scope(answer_data.context, answer_data.experience_level, answer_data.job_title, owner_id)
+        semantic_cache.add(question_id, question_text, scope, answer_text)
+
+
+def rebuild_semantic_cache(db: Session) -> int:
+    """Reload the semantic index from stored answers, returning the number of entries"""
+    if not settings.SEMANTIC_CACHE_ENABLED:
+        return 0
+    return semantic_cache.rebuild(
+        db, lambda answer, owner_id: make_scope(answer.context, answer.experience_level, answer.job_title, owner_id)
+    )
+
+
+def lookup_answer(db: Session, question_id: int, answer_data: QuestionAnswerCreate, refresh: bool = False, question_text: Optional[str] = None, owner_id: Optional[int] = None) -> Tuple[str, Optional[str]]:
+    """Return (cache_key, cached_answer) for a request; cached_answer is None on a miss or refresh
+
+    With question_text, an exact miss falls back to the semantic cache (owner_id as for make_scope).
+    """
+    key = make_cache_key(question_id, answer_data.context, answer_data.experience_level, answer_data.job_title)
+
+    if refresh:
+        answer_cache.bypasses += 1
+        return key, None
+
+    cached_answer = answer_cache.lookup(db, key)
+    if cached_answer is None and question_text:
+        cached_answer = lookup_similar(question_text, answer_data, owner_id)
+        if cached_answer is not None:
+            answer_cache.remember(key, cached_answer)
+    return key, cached_answer
+
+
+async def get_or_generate_answer(db: AsyncSession, question: Question, answer_data: QuestionAnswerCreate, user_id: Optional[int] = None, refresh: bool = False) -> Tuple[str, bool]:
+    """Return (answer_text, cached) for a question, generating and caching on a miss
+
+    Only a miss is charged to the user's AI budget (RateLimited when it is spent).
+    """
+    owner_id = question_owner(question)
+    key, cached_answer = await db.run_sync(
+        lookup_answer, question.id, answer_data, refresh, question_text=question.text, owner_id=owner_id
+    )
+    if cached_answer is not None:
+        return cached_answer, True
+
+    if user_id is not None:
+        await admit_user(user_id, estimate_tokens(question.text, answer_data.context, max_tokens=1000))
+    try:
+        answer_text = await request_answer(
+            question=question.text,
+            context=answer_data.context,
+            experience_level=answer_data.experience_level,
+            job_title=answer_data.job_title
+        )
+    except AIServiceNotConfigured:
+        return NOT_CONFIGURED_MESSAGE, False
+    except RateLimited:
+        # Surfaced to the client as a 429 with Retry-After
+        raise
+    except Exception as e:
+        # Errors are returned to the caller but never cached
+        print(f"Error generating AI answer: {str(e)}")
+        return f"Error generating answer: {str(e)}", False
+
+    await db.run_sync(answer_cache.store, key, question.id, answer_data, answer_text, user_id)
+    index_answer(question.id, question.text, answer_data, answer_text, owner_id)
+    return answer_text, False
+
+
+async def stream_answer_events(key: str, question_id: int, question_text: str, answer_data: QuestionAnswerCreate, cached_answer: Optional[str] = None, user_id: Optional[int] = None, owner_id: Optional[int] = None) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """Yield (event, payload) pairs for a streamed answer, persisting the final text on completion
+
+    The stream outlives the request-scoped session, so the answer is saved with its own session.
+    """
+    if cached_answer is not None:
+        yield "delta", {"text": cached_answer}
+        yield "done", {"question_id": question_id, "cached": True}
+        return
+
+    chunks = []
+    try:
+        async for delta in stream_answer(
+            question=question_text,
+            context=answer_data.context,
+            experience_level=answer_data.experience_level,
+            job_title=answer_data.job_title
+        ):
+            chunks.append(delta)
+            yield "delta", {"text": delta}
+    except AIServiceNotConfigured:
+        yield "error", {"detail": NOT_CONFIGURED_MESSAGE}
+        return
+    except Exception as e:
+        print(f"Error streaming AI answer: {str(e)}")
+        yield "error", {"detail": f"Error generating answer: {str(e)}"}
+        return
+
+    answer_text = "".join(chunks).strip()
+    async with open_session(principal_id=user_id) as db:
+        await db.run_sync(answer_cache.store, key, question_id, answer_data, answer_text, user_id)
+    index_answer(question_id, question_text, answer_data, answer_text, owner_id)
+
+    yield "done", {"question_id": question_id, "cached": False}
+
+
+async def generate_answer_batch(questions: List[Tuple[int, str]], answer_data: QuestionAnswerCreate, cached: Dict[int, str], user_id: Optional[int] = None, concurrency: int = 8, owners: Optional[Dict[int, int]] = None) -> AsyncIterator[Dict[str, Any]]:
+    """Yield one result per (question_id, text) as soon as it is ready, generating misses concurrently
+
+    owners maps the personal questions among them to their owners. Cached answers are
+    yielded first. Each miss is charged to the user's AI budget as it is generated, so a
+    batch waits for refills instead of overdrawing it. New answers are saved in one bulk
+    insert at the end, or when the client disconnects, using a session owned by the stream
+    and off the event loop.
+    """
+    for question_id, _ in questions:
+        if question_id in cached:
+            yield {"question_id": question_id, "answer": cached[question_id], "cached": True}
+
+    texts = dict(questions)
+    owners = owners or {}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def generate(question_id: int, text: str) -> Dict[str, Any]:
+        async with semaphore:
+            try:
+                if user_id is not None:
+                    await admit_user(user_id, estimate_tokens(text, answer_data.context, max_tokens=1000))
+                answer_text = await request_answer(
+                    question=text,
+                    context=answer_data.context,
+                    experience_level=answer_data.experience_level,
+                    job_title=answer_data.job_title
+                )
+            except AIServiceNotConfigured:
+                return {"question_id": question_id, "error": NOT_CONFIGURED_MESSAGE}
+            except RateLimited as e:
+                return {"question_id": question_id, "error": str(e), "retry_after": e.retry_after}
+            except Exception as e:
+                print(f"Error generating AI answer: {str(e)}")
+                return {"question_id": question_id, "error": f"Error generating answer: {str(e)}"}
+        return {"question_id": question_id, "answer": answer_text, "cached": False}
+
+    tasks = [
+        asyncio.ensure_future(generate(question_id, text))
+        for question_id, text in questions if question_id not in cached
+    ]
+    rows = []
+    try:
+        for next_result in asyncio.as_completed(tasks):
+            result = await next_result
+            if "answer" in result:
+                index_answer(
+                    result["question_id"], texts[result["question_id"]], answer_data, result["answer"],
+                    owners.get(result["question_id"])
+                )
+                rows.append({
+                    "question_id": result["question_id"],
+                    "user_id": user_id,
+                    "answer_text": result["answer"],
+                    "context": answer_data.context,
+                    "experience_level": answer_data.experience_level,
+                    "job_title": answer_data.job_title,
+                    "cache_key": make_cache_key(
+                        result["question_id"], answer_data.context, answer_data.experience_level, answer_data.job_title
+                    )
+                })
+            yield result
+    finally:
+        for task in tasks:
+            task.cancel()
+        if rows:
+            # Saved even if the stream is being cancelled because the client went away
+            await asyncio.shield(_store_generated_answers(rows, user_id))
+
+
+async def _store_generated_answers(rows: List[Dict[str, Any]], user_id: Optional[int]) -> None:
+    async with open_session(principal_id=user_id) as db:
+        await db.run_sync(answer_cache.store_many, rows)
@@ -1,9 +1,106 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
 from passlib.context import CryptContext
 
+from app.config import settings
+
+T = TypeVar("T")
+
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
+class PasswordHasherBusy(Exception):
+    """Raised when too many password hashes are already waiting for a worker"""
+
+
+class PasswordHasher:
+    """Runs bcrypt in a bounded thread pool so hashing never blocks the event loop
+
+    bcrypt releases the GIL while it works, so threads hash in parallel. Calls beyond
+    max_queue waiting hashes are refused instead of piling up behind a login storm.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.pending = 0
+        self.running = 0
+        self._running_lock = threading.Lock()
+        self.completed = 0
+        self.rejected = 0
+        self.wait_seconds = 0.0
+        self.run_seconds = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+        return self._executor
+
+    async def _run(self, fn: Callable[..., T], *args: Any) -> T:
+        if self.pending - self.running >= self.max_queue:
+            self.rejected += 1
+            raise PasswordHasherBusy("Too many concurrent sign-ins, please retry shortly")
+
+        submitted = time.perf_counter()
+
+        def work() -> Tuple[T, float, float]:
+            started = time.perf_counter()
+            with self._running_lock:
+                self.running += 1
+            try:
+                return fn(*args), started - submitted, time.perf_counter() - started
+            finally:
+                with self._running_lock:
+                    self.running -= 1
+
+        self.pending += 1
+        try:
+            result, waited, ran = await asyncio.get_running_loop().run_in_executor(self._get_executor(), work)
+        finally:
+            self.pending -= 1
+
+        # Counters other than the running gauge are only touched on the event loop
+        self.completed += 1
+        self.wait_seconds += waited
+        self.run_seconds += ran
+        return result
+
+    async def hash(self, password: str) -> str:
+        return await self._run(pwd_context.hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(pwd_context.verify, plain_password, hashed_password)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "queued": max(0, self.pending - self.running),
+            "running": self.running,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_wait_seconds": self.wait_seconds / self.completed if self.completed else 0.0,
+            "avg_hash_seconds": self.run_seconds / self.completed if self.completed else 0.0
+        }
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE
+)
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a hash"""
     return pwd_context.verify(plain_password, hashed_password)
@@ -12,3 +109,13 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     """Generate password hash"""
     return pwd_context.hash(password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against a hash without blocking the event loop"""
+    return await password_hasher.verify(plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Generate password hash without blocking the event loop"""
+    return await password_hasher.hash(password)
@@ -0,0 +1,232 @@
+import re
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.config import settings
+
+# Collapse literals so "IN (?, ?, ?)" lists of any length count as the same statement
+_IN_LIST_RE = re.compile(r"\((?:\s*[?%]\S*\s*,)+\s*[?%]\S*\s*\)")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_statement(statement: str) -> str:
+    return _IN_LIST_RE.sub("(?)", _WHITESPACE_RE.sub(" ", statement).strip())
+
+
+def route_template(scope: dict) -> str:
+    """The matched route's path template, including any router prefix"""
+    route_path = getattr(scope.get("route"), "path", None)
+    if route_path is None:
+        return "unmatched"
+
+    # Routes may be bound without their include_router prefix; take it from the request path
+    segments = scope["path"].split("/")
+    depth = route_path.count("/")
+    if depth >= len(segments):
+        return route_path
+    return "/".join(segments[:len(segments) - depth]) + route_path
+
+
+class RollingWindow:
+    """Recent samples for percentile estimates, plus lifetime count/total/max"""
+
+    def __init__(self, size: int = 1000):
+        self.samples: Deque[float] = deque(maxlen=size)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, value: float) -> None:
+        self.samples.append(value)
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def percentile(self, p: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+    def summary(self, scale: float = 1000.0) -> Dict[str, Any]:
+        """Count and avg/p50/p95/max, scaled (milliseconds by default)"""
+        return {
+            "count": self.count,
+            "avg": round(self.total / self.count * scale, 3) if self.count else 0.0,
+            "p50": round(self.percentile(0.5) * scale, 3),
+            "p95": round(self.percentile(0.95) * scale, 3),
+            "max": round(self.max * scale, 3)
+        }
+
+
+class RequestQueryStats:
+    """Queries issued while serving one request"""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: Counter = Counter()
+
+
+class DatabaseMetrics:
+    """Process-wide pool and query counters fed by SQLAlchemy events"""
+
+    def __init__(self, n_plus_one_threshold: int, max_routes: int = 200):
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.max_routes = max_routes
+        self.checkout_wait = RollingWindow()
+        self.checkout_timeouts = 0
+        self.queries = RollingWindow()
+        self.slow_queries: Deque[Dict[str, Any]] = deque(maxlen=20)
+        self.routes: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.n_plus_one_flagged = 0
+        self.n_plus_one_recent: Deque[Dict[str, Any]] = deque(maxlen=20)
+        self.engines: Dict[str, Engine] = {}
+        # Sync sessions run queries in the threadpool, so updates can race
+        self._lock = threading.Lock()
+
+    def record_checkout(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.checkout_wait.record(seconds)
+            if timed_out:
+                self.checkout_timeouts += 1
+
+    def record_query(self, statement: str, seconds: float) -> None:
+        with self._lock:
+            self.queries.record(seconds)
+            if seconds >= settings.DB_SLOW_QUERY_SECONDS:
+                self.slow_queries.append({"statement": normalize_statement(statement)[:500], "ms": round(seconds * 1000, 3)})
+
+        stats = current_request_stats.get()
+        if stats is not None:
+            stats.count += 1
+            stats.seconds += seconds
+            stats.statements[normalize_statement(statement)] += 1
+
+    def record_request(self, route: str, stats: RequestQueryStats) -> None:
+        if not stats.count:
+            return
+
+        with self._lock:
+            entry = self.routes.get(route)
+            if entry is None:
+                if len(self.routes) >= self.max_routes:
+                    self.routes.popitem(last=False)
+                entry = self.routes[route] = {"requests": 0, "queries": 0, "max_queries": 0, "db_seconds": 0.0}
+            entry["requests"] += 1
+            entry["queries"] += stats.count
+            entry["max_queries"] = max(entry["max_queries"], stats.count)
+            entry["db_seconds"] += stats.seconds
+
+            # N+1: the same statement shape issued more than K times in one request
+            statement, repeats = stats.statements.most_common(1)[0]
+            if repeats <= self.n_plus_one_threshold:
+                return
+            self.n_plus_one_flagged += 1
+            self.n_plus_one_recent.append({"route": route, "repeats": repeats, "statement": statement[:500]})
+
+        print(f"Possible N+1 query on {route}: {repeats} x {statement[:200]}")
+
+    def pool_status(self) -> Dict[str, Any]:
+        status = {}
+        for name, engine in self.engines.items():
+            pool = engine.pool
+            if isinstance(pool, QueuePool):
+                status[name] = {
+                    "size": pool.size(),
+                    "checked_out": pool.checkedout(),
+                    "checked_in": pool.checkedin(),
+                    "overflow": pool.overflow(),
+                    "timeout_seconds": pool.timeout()
+                }
+            else:
+                status[name] = {"status": pool.status()}
+        return status
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            routes = sorted(self.routes.items(), key=lambda item: item[1]["queries"], reverse=True)
+            return {
+                "pools": self.pool_status(),
+                "checkout_wait_ms": dict(self.checkout_wait.summary(), timeouts=self.checkout_timeouts),
+                "query_ms": self.queries.summary(),
+                "slow_queries": list(self.slow_queries),
+                "routes": {
+                    route: dict(entry, avg_queries=round(entry["queries"] / entry["requests"], 2))
+                    for route, entry in routes[:20]
+                },
+                "n_plus_one": {
+                    "threshold": self.n_plus_one_threshold,
+                    "flagged": self.n_plus_one_flagged,
+                    "recent": list(self.n_plus_one_recent)
+                }
+            }
+
+
+db_metrics = DatabaseMetrics(n_plus_one_threshold=settings.DB_N_PLUS_ONE_THRESHOLD)
+
+current_request_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("current_request_stats", default=None)
+
+
+class _CheckoutTimingMixin:
+    """Times how long callers wait for a pooled connection (including opening a new one)"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            db_metrics.record_checkout(time.perf_counter() - started, timed_out=True)
+            raise
+        db_metrics.record_checkout(time.perf_counter() - started)
+        return connection
+
+
+class InstrumentedQueuePool(_CheckoutTimingMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument_engine(name: str, engine: Engine) -> None:
+    """Record query counts and durations for a (sync) engine"""
+    db_metrics.engines[name] = engine
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started"].pop()
+        db_metrics.record_query(statement, time.perf_counter() - started)
+
+
+class QueryStatsMiddleware:
+    """ASGI middleware that attributes queries to the route serving each HTTP request"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats()
+        token = current_request_stats.set(stats)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_request_stats.reset(token)
+            db_metrics.record_request(f"{scope['method']} {route_template(scope)}", stats)
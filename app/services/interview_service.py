@@ -1,7 +1,17 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+import asyncio
 import random
 
-from app.services.ai_service import analyze_text, generate_interview_questions as ai_generate_questions
+from sqlalchemy import delete, insert
+from sqlalchemy.orm import Session
+
+from app.database import open_session
+from app.models.interview import InterviewQuestion
+from app.services.ai_service import (
+    analyze_text,
+    generate_interview_questions as ai_generate_questions,
+    stream_interview_questions
+)
 
 
 def process_interview_feedback(session_id: int) -> Dict[str, Any]:
@@ -45,15 +55,58 @@ def process_interview_feedback(session_id: int) -> Dict[str, Any]:
     }
 
 
-def generate_interview_questions(job_title: str, industry: str, difficulty: str, num_questions: int = 10) -> List[Dict[str, Any]]:
+async def generate_interview_questions(job_title: str, industry: str, difficulty: str, num_questions: int = 10) -> List[Dict[str, Any]]:
     """Generate interview questions based on job title and industry"""
-    return ai_generate_questions(job_title, industry, difficulty, num_questions)
+    return await ai_generate_questions(job_title, industry, difficulty, num_questions)
+
+
+def save_interview_questions(db: Session, interview_id: int, questions: List[Dict[str, Any]], start_order: int = 1) -> int:
+    """Insert generated questions for an interview with one bulk statement, returning the count"""
+    if not questions:
+        return 0
+
+    db.execute(insert(InterviewQuestion), [
+        {
+            "interview_id": interview_id,
+            "text": question["text"],
+            "category": question.get("category"),
+            "difficulty": question.get("difficulty"),
+            "order": start_order + i
+        }
+        for i, question in enumerate(questions)
+    ])
+    db.commit()
+    return len(questions)
+
+
+def discard_interview_questions(db: Session, interview_id: int) -> None:
+    """Delete the generated questions of an interview"""
+    db.execute(delete(InterviewQuestion).where(InterviewQuestion.interview_id == interview_id))
+    db.commit()
+
+
+async def generate_and_save_questions(interview_id: int, job_title: Optional[str], industry: Optional[str], difficulty: Optional[str], num_questions: int = 10, user_id: Optional[int] = None) -> int:
+    """Generate questions for an interview, saving each parsed batch as soon as it arrives on behalf of user_id
+
+    Failures propagate, so the job queue retries or fails the job; the questions saved
+    by the failed attempt are discarded first, since a retry generates the whole set again.
+    """
+    saved = 0
+    async with open_session(principal_id=user_id) as db:
+        try:
+            async for batch in stream_interview_questions(job_title, industry, difficulty, num_questions):
+                saved += await db.run_sync(save_interview_questions, interview_id, batch, saved + 1)
+        except BaseException:
+            if saved:
+                await asyncio.shield(db.run_sync(discard_interview_questions, interview_id))
+            raise
+    return saved
 
 
-def analyze_interview_response(question: str, response: str) -> Dict[str, Any]:
+async def analyze_interview_response(question: str, response: str) -> Dict[str, Any]:
     """Analyze an interview response and provide feedback"""
     # Use AI service to analyze the response
-    analysis = analyze_text(
+    analysis = await analyze_text(
         f"Question: {question}\n\nResponse: {response}",
         "interview response quality"
     )
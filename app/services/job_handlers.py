@@ -0,0 +1,68 @@
+from typing import Any, Dict, Optional
+
+from sqlalchemy import select
+
+from app.database import open_session
+from app.models.interview import InterviewSession
+from app.models.resume import Resume, ResumeVersion
+from app.services.interview_service import generate_and_save_questions, process_interview_feedback
+from app.services.job_queue import job_queue
+from app.services.resume_service import optimize_resume
+
+
+@job_queue.handler("resume.optimize")
+async def optimize_resume_job(payload: Dict[str, Any], user_id: Optional[int]) -> Dict[str, Any]:
+    """Optimize the active version of a resume and save the result as a new version"""
+    async with open_session() as db:
+        resume = await db.get(Resume, payload["resume_id"])
+        active_version = await db.scalar(select(ResumeVersion).where(
+            ResumeVersion.resume_id == payload["resume_id"],
+            ResumeVersion.is_active == True
+        ))
+        if not resume or not active_version:
+            raise ValueError("No active resume version found")
+        content, version_format, target_job = active_version.content, active_version.format, resume.target_job
+
+    # No session is held while the provider works
+    optimized_content = await optimize_resume(content, payload["job_description"])
+
+    async with open_session(principal_id=user_id) as db:
+        db_version = ResumeVersion(
+            resume_id=payload["resume_id"],
+            content=optimized_content,
+            version_name=f"Optimized for job - {target_job}",
+            format=version_format,
+            is_active=False
+        )
+        db.add(db_version)
+        await db.commit()
+        return {"resume_id": payload["resume_id"], "version_id": db_version.id}
+
+
+@job_queue.handler("interview.feedback")
+async def interview_feedback_job(payload: Dict[str, Any], user_id: Optional[int]) -> Dict[str, Any]:
+    """Generate feedback for a session, store it on the session and mark it completed"""
+    feedback = process_interview_feedback(payload["session_id"])
+
+    async with open_session(principal_id=user_id) as db:
+        session = await db.get(InterviewSession, payload["session_id"])
+        if session:
+            session.feedback = feedback
+            session.status = "completed"
+            await db.commit()
+
+    return feedback
+
+
+@job_queue.handler("interview.questions")
+async def interview_questions_job(payload: Dict[str, Any], user_id: Optional[int]) -> Dict[str, Any]:
+    """Generate and save questions for an interview"""
+    saved = await generate_and_save_questions(
+        interview_id=payload["interview_id"],
+        job_title=payload.get("job_title"),
+        industry=payload.get("industry"),
+        difficulty=payload.get("difficulty"),
+        num_questions=payload.get("num_questions") or 10,
+        user_id=user_id
+    )
+    return {"interview_id": payload["interview_id"], "saved": saved}
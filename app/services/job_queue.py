@@ -0,0 +1,261 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import open_session
+from app.models.job import BackgroundJob
+
+# Called with the job's payload and the id of the user it runs for
+JobHandler = Callable[[Dict[str, Any], Optional[int]], Awaitable[Optional[Dict[str, Any]]]]
+
+FINISHED_STATUSES = ("succeeded", "failed")
+
+
+class JobQueue:
+    """In-process asyncio worker pool backed by the durable background_jobs table
+
+    Jobs are written to the database before they are queued, so anything still queued
+    when the process stops is picked up again by the next start(). A worker claims a
+    job with a conditional UPDATE, so each run belongs to one worker across processes,
+    and renews the job's lease while it runs; start() only requeues running jobs whose
+    lease has expired, i.e. whose worker died.
+    """
+
+    def __init__(self, workers: int, max_attempts: int, lease_seconds: float):
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self._handlers: Dict[str, JobHandler] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._events: Dict[str, asyncio.Event] = {}
+        self.running = 0
+        self.succeeded = 0
+        self.failed = 0
+
+    def handler(self, job_type: str) -> Callable[[JobHandler], JobHandler]:
+        """Register the coroutine that runs jobs of a given type"""
+        def register(fn: JobHandler) -> JobHandler:
+            self._handlers[job_type] = fn
+            return fn
+        return register
+
+    async def start(self) -> None:
+        """Start the workers and requeue jobs left unfinished by a previous process"""
+        self._queue = asyncio.Queue()
+        async with open_session() as db:
+            pending = await db.run_sync(self._recover)
+        for job_id in pending:
+            self._queue.put_nowait(job_id)
+
+        self._tasks = [asyncio.ensure_future(self._worker()) for _ in range(self.workers)]
+
+    def _recover(self, db: Session) -> List[str]:
+        """Requeue running jobs with an expired lease and return the ids of queued jobs"""
+        now = datetime.now(timezone.utc)
+        # Only job types this process has handlers for; rows from before leases have none
+        abandoned = and_(
+            BackgroundJob.job_type.in_(list(self._handlers)),
+            BackgroundJob.status == "running",
+            or_(BackgroundJob.lease_expires_at.is_(None), BackgroundJob.lease_expires_at < now)
+        )
+        failed = db.execute(update(BackgroundJob).where(
+            abandoned, BackgroundJob.attempts >= self.max_attempts
+        ).values(
+            status="failed", error="Interrupted too many times", finished_at=now, lease_expires_at=None
+        ).execution_options(synchronize_session=False))
+        db.execute(update(BackgroundJob).where(abandoned).values(
+            status="queued", lease_expires_at=None
+        ).execution_options(synchronize_session=False))
+        db.commit()
+        self.failed += failed.rowcount
+
+        return list(db.scalars(
+            select(BackgroundJob.id).where(
+                BackgroundJob.job_type.in_(list(self._handlers)),
+                BackgroundJob.status == "queued"
+            ).order_by(BackgroundJob.created_at)
+        ))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+    def enqueue(self, db: Session, job_type: str, payload: Dict[str, Any], user_id: Optional[int] = None) -> BackgroundJob:
+        """Persist a job and hand it to the workers"""
+        job = self._persist(db, job_type, payload, user_id)
+        self._dispatch(job.id)
+        return job
+
+    async def submit(self, db: AsyncSession, job_type: str, payload: Dict[str, Any], user_id: Optional[int] = None) -> BackgroundJob:
+        """Persist a job through a request session and hand it to the workers"""
+        job = await db.run_sync(self._persist, job_type, payload, user_id)
+        # The queue is only touched from the event loop, never from run_sync worker threads
+        self._dispatch(job.id)
+        return job
+
+    def _persist(self, db: Session, job_type: str, payload: Dict[str, Any], user_id: Optional[int]) -> BackgroundJob:
+        if job_type not in self._handlers:
+            raise ValueError(f"No handler registered for job type {job_type}")
+
+        job = BackgroundJob(
+            id=uuid.uuid4().hex,
+            job_type=job_type,
+            status="queued",
+            user_id=user_id,
+            payload=payload,
+            attempts=0
+        )
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        return job
+
+    def _dispatch(self, job_id: str) -> None:
+        # Without running workers the job stays queued in the table until the next start()
+        if self._queue is not None:
+            self._queue.put_nowait(job_id)
+
+    async def wait(self, job_id: str, timeout: float) -> bool:
+        """Wait until this process finishes a job; False on timeout"""
+        event = self._events.setdefault(job_id, asyncio.Event())
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            # Waiters re-check the table after a timeout, so the event can be dropped
+            self._events.pop(job_id, None)
+            return False
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            except Exception as e:
+                print(f"Error running background job {job_id}: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: str) -> None:
+        async with open_session() as db:
+            job = await db.run_sync(self._claim, job_id)
+        if job is None:
+            # Already finished, or claimed first by another worker or process
+            return
+
+        self.running += 1
+        heartbeat = asyncio.ensure_future(self._heartbeat(job_id))
+        result, error = None, None
+        try:
+            result = await self._handlers[job.job_type](dict(job.payload or {}), job.user_id)
+        except Exception as e:
+            print(f"Background job {job_id} ({job.job_type}) failed: {str(e)}")
+            error = str(e)
+        finally:
+            # On cancellation (stop()) the lease runs out and a later start() requeues the job
+            heartbeat.cancel()
+            self.running -= 1
+
+        retry = error is not None and job.attempts < self.max_attempts
+        # The owner's next reads of the job (and of what it wrote) stick to the primary
+        async with open_session(principal_id=job.user_id) as db:
+            await db.run_sync(self._settle, job_id, result or {}, error, retry)
+        if retry:
+            self._queue.put_nowait(job_id)
+            return
+        if error:
+            self.failed += 1
+        else:
+            self.succeeded += 1
+        self._notify(job_id)
+
+    def _claim(self, db: Session, job_id: str) -> Optional[BackgroundJob]:
+        """Atomically move a queued job to running under a fresh lease; None if it was not queued"""
+        job = db.get(BackgroundJob, job_id)
+        if job is None:
+            return None
+        db.info["principal_id"] = job.user_id
+        now = datetime.now(timezone.utc)
+        claimed = db.execute(update(BackgroundJob).where(
+            BackgroundJob.id == job_id,
+            BackgroundJob.status == "queued",
+            BackgroundJob.job_type.in_(list(self._handlers))
+        ).values(
+            status="running",
+            attempts=func.coalesce(BackgroundJob.attempts, 0) + 1,
+            started_at=now,
+            lease_expires_at=now + timedelta(seconds=self.lease_seconds)
+        ).execution_options(synchronize_session=False))
+        if claimed.rowcount != 1:
+            db.rollback()
+            return None
+        db.commit()
+        db.refresh(job)
+        return job
+
+    async def _heartbeat(self, job_id: str) -> None:
+        """Renew a running job's lease until cancelled"""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                async with open_session() as db:
+                    await db.run_sync(self._renew, job_id)
+            except Exception as e:
+                print(f"Error renewing lease of background job {job_id}: {str(e)}")
+
+    def _renew(self, db: Session, job_id: str) -> None:
+        db.execute(update(BackgroundJob).where(
+            BackgroundJob.id == job_id,
+            BackgroundJob.status == "running"
+        ).values(
+            lease_expires_at=datetime.now(timezone.utc) + timedelta(seconds=self.lease_seconds)
+        ).execution_options(synchronize_session=False))
+        db.commit()
+
+    def _settle(self, db: Session, job_id: str, result: Dict[str, Any], error: Optional[str], retry: bool) -> None:
+        """Record a run's outcome: requeued for another attempt, or finished"""
+        job = db.get(BackgroundJob, job_id)
+        if retry:
+            job.status = "queued"
+        else:
+            self._finish(job, result=None if error else result, error=error)
+        job.lease_expires_at = None
+        db.commit()
+
+    def _finish(self, job: BackgroundJob, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> None:
+        job.status = "failed" if error else "succeeded"
+        job.result = result
+        job.error = error
+        job.finished_at = datetime.now(timezone.utc)
+
+    def _notify(self, job_id: str) -> None:
+        """Wake anything waiting on a job once its final state is committed"""
+        event = self._events.pop(job_id, None)
+        if event is not None:
+            event.set()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": len(self._tasks),
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "running": self.running,
+            "succeeded": self.succeeded,
+            "failed": self.failed
+        }
+
+
+job_queue = JobQueue(
+    workers=settings.JOB_WORKERS,
+    max_attempts=settings.JOB_MAX_ATTEMPTS,
+    lease_seconds=settings.JOB_LEASE_SECONDS
+)
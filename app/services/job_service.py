@@ -1,46 +1,93 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple
+import asyncio
 import random
-from datetime import datetime, timedelta
+from datetime import datetime, timezone
+
+from sqlalchemy import Boolean, literal_column
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models.application import JobPosting
+from app.services.job_sources import JobSearchParams, SourceResult, get_job_sources
+from app.services.match_index import match_index
+from app.services.posting_dedupe import LSHIndex, link_duplicates, new_index, posting_text
+from app.services.search_cache import search_cache
+
+# Days over which a posting's rank halves
+RECENCY_HALF_LIFE_DAYS = 14.0
+
+# Columns an import may refresh on an existing posting; id and created_at are kept
+UPSERT_COLUMNS = ("title", "company", "location", "description", "salary_range", "job_type", "remote", "url", "posted_at")
+
+
+async def search_jobs(params: JobSearchParams) -> Tuple[List[Dict[str, Any]], List[SourceResult]]:
+    """Search every job source concurrently, then merge, deduplicate and rank the results
+
+    Each source has its own deadline and contributes whatever it returned by
+    then, so the search takes as long as the slowest source's timeout at most.
+    """
+    results = list(await asyncio.gather(*(search_cache.search(source, params) for source in get_job_sources())))
+    return merge_postings(results, params), results
+
+
+def posting_score(posting: Dict[str, Any], params: JobSearchParams, now: datetime) -> float:
+    """Relevance (query terms in the title count double) halved every RECENCY_HALF_LIFE_DAYS"""
+    title = posting["title"].lower()
+    description = (posting.get("description") or "").lower()
+    terms = params.terms or [""]
+    relevance = sum(2.0 if term in title else 1.0 if term in description else 0.0 for term in terms) / (2.0 * len(terms))
+    if params.experience_level and params.experience_level.lower() in title:
+        relevance += 0.5
+    age_days = max((now - posting["posted_at"]).total_seconds() / 86400, 0.0) if posting.get("posted_at") else RECENCY_HALF_LIFE_DAYS
+    return relevance * 0.5 ** (age_days / RECENCY_HALF_LIFE_DAYS)
 
-def search_jobs(query: str, location: str = None, job_type: str = None, experience_level: str = None, remote: bool = None, limit: int = 20) -> List[Dict[str, Any]]:
-    """Search for job postings across platforms"""
-    # In a real implementation, this would:
-    # 1. Query multiple job board APIs (LinkedIn, Indeed, etc.)
-    # 2. Aggregate and deduplicate results
-    # 3. Apply filters
-    
-    # For now, return mock job postings
-    companies = ["Tech Innovations", "Global Solutions", "Digital Dynamics", "Future Systems", "Code Masters"]
-    locations = ["San Francisco, CA", "New York, NY", "Austin, TX", "Seattle, WA", "Remote"]
-    job_types = ["Full-time", "Part-time", "Contract", "Freelance"]
-    
-    results = []
-    for i in range(min(limit, 20)):
-        company = random.choice(companies)
-        post_location = location or random.choice(locations)
-        post_job_type = job_type or random.choice(job_types)
-        post_remote = remote if remote is not None else random.choice([True, False])
-        
-        days_ago = random.randint(1, 30)
-        posted_date = datetime.now() - timedelta(days=days_ago)
-        
-        results.append({
-            "id": i + 1,
-            "title": f"{query} {random.choice(['Specialist', 'Engineer', 'Developer', 'Manager', 'Analyst'])}",
-            "company": company,
-            "location": post_location,
-            "description": f"We are looking for a talented {query} professional to join our team...",
-            "salary_range": f"${random.randint(80, 150)}K - ${random.randint(150, 200)}K",
-            "job_type": post_job_type,
-            "remote": post_remote,
-            "url": f"https://example.com/jobs/{i+1}",
-            "source": random.choice(["linkedin", "indeed", "glassdoor", "monster"]),
-            "external_id": f"ext-{i+1}",
-            "posted_at": posted_date.isoformat(),
-            "created_at": datetime.now().isoformat()
-        })
-    
-    return results
+
+def merge_postings(
+    results: List[SourceResult],
+    params: JobSearchParams,
+    seen: Optional[LSHIndex] = None
+) -> List[Dict[str, Any]]:
+    """Merge per-source results, keeping the best-ranked copy of a job listed on several boards
+
+    Cross-posted copies are near-duplicates by MinHash over title, company
+    and description. Postings similar to one in seen are skipped and the
+    returned ones are added to it, so successive calls never repeat a job; ids
+    continue across calls.
+    """
+    now = datetime.now(timezone.utc)
+    seen = new_index() if seen is None else seen
+    scored = sorted(
+        ((posting_score(posting, params, now), posting) for result in results for posting in result.postings),
+        key=lambda item: item[0],
+        reverse=True
+    )
+
+    merged = []
+    for _, posting in scored:
+        if len(merged) == params.limit:
+            break
+        signature = seen.hasher.signature(posting_text(posting["title"], posting["company"], posting.get("description")))
+        # Postings without a single word in them are not worth showing
+        if signature is None or seen.query(signature) is not None:
+            continue
+        seen.insert(len(seen) + 1, signature)
+        merged.append(dict(posting, id=len(seen), created_at=now))
+    return merged
+
+
+async def stream_search_jobs(params: JobSearchParams) -> AsyncIterator[Tuple[SourceResult, List[Dict[str, Any]]]]:
+    """Search every job source concurrently, yielding each source's new postings as soon as it finishes"""
+    seen = new_index()
+    searches = [asyncio.ensure_future(search_cache.search(source, params)) for source in get_job_sources()]
+    try:
+        for search in asyncio.as_completed(searches):
+            result = await search
+            yield result, merge_postings([result], params, seen)
+    finally:
+        # The client may disconnect before the slower sources finish
+        for search in searches:
+            search.cancel()
 
 
 def apply_to_job(job_url: str, resume_id: int, cover_letter: str = None, user_id: int = None) -> Dict[str, Any]:
@@ -68,3 +115,64 @@ def apply_to_job(job_url: str, resume_id: int, cover_letter: str = None, user_id
             "error": "Could not access application form",
             "notes": "The employer's website may have changed or requires manual application."
         }
+
+
+def upsert_job_postings(db: Session, postings: List[Dict[str, Any]]) -> Dict[str, List[int]]:
+    """Insert or update postings by (source, external_id) with INSERT ... ON CONFLICT DO UPDATE
+
+    Returns the ids of inserted and of updated rows. SQLAlchemy sends the rows
+    as multi-row INSERT statements of up to 1000 rows each, inside one transaction.
+    """
+    # ON CONFLICT cannot touch the same row twice in one statement; the last copy wins
+    rows = list({(posting["source"], posting["external_id"]): posting for posting in postings}.values())
+    result = {"inserted": [], "updated": []}
+    if not rows:
+        return result
+
+    conflict = dict(index_elements=[JobPosting.source, JobPosting.external_id], index_where=JobPosting.external_id.isnot(None))
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        statement = postgresql.insert(JobPosting)
+        # xmax is 0 only on a freshly inserted row version
+        inserted = literal_column("xmax = 0", Boolean).label("inserted")
+        statement = statement.on_conflict_do_update(
+            set_={column: statement.excluded[column] for column in UPSERT_COLUMNS}, **conflict
+        ).returning(JobPosting.id, inserted)
+        for row in db.execute(statement, rows):
+            result["inserted" if row.inserted else "updated"].append(row.id)
+    elif dialect == "sqlite":
+        # SQLite has no xmax, so new keys are inserted first and the rest updated after; the
+        # transaction holds the write lock from the first statement, so no writer gets in between
+        statement = sqlite.insert(JobPosting)
+        new = db.execute(
+            statement.on_conflict_do_nothing(**conflict).returning(JobPosting.id, JobPosting.source, JobPosting.external_id),
+            rows
+        )
+        inserted = {(row.source, row.external_id): row.id for row in new}
+        result["inserted"] = list(inserted.values())
+        rows = [row for row in rows if (row["source"], row["external_id"]) not in inserted]
+        if rows:
+            statement = statement.on_conflict_do_update(
+                set_={column: statement.excluded[column] for column in UPSERT_COLUMNS}, **conflict
+            ).returning(JobPosting.id)
+            result["updated"] = list(db.scalars(statement, rows))
+    else:
+        raise NotImplementedError(f"Bulk posting upsert is not supported on {dialect}")
+
+    # Updated postings keep their signature and duplicate link
+    link_duplicates(db, result["inserted"])
+    db.commit()
+    # New ids are picked up by the match index on its own; updated text is not
+    match_index.mark_stale(result["updated"])
+    return result
+
+
+def import_job_postings(postings: List[Dict[str, Any]], user_id: Optional[int] = None) -> Dict[str, List[int]]:
+    """Upsert postings with a session of its own; blocking (signing and banding included), so run it in the threadpool"""
+    db = SessionLocal()
+    # Like a request session, so the importing user's next reads stick to the primary
+    db.info["principal_id"] = user_id
+    try:
+        return upsert_job_postings(db, postings)
+    finally:
+        db.close()
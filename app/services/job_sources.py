@@ -0,0 +1,225 @@
+import asyncio
+import json
+import os
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from app.config import settings
+from app.services.db_metrics import RollingWindow
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+_sources: Optional[List["JobSource"]] = None
+
+
+@dataclass(frozen=True)
+class JobSearchParams:
+    """A job search, independent of source"""
+    query: str
+    location: Optional[str] = None
+    job_type: Optional[str] = None
+    experience_level: Optional[str] = None
+    remote: Optional[bool] = None
+    limit: int = 20
+
+    @property
+    def terms(self) -> List[str]:
+        return self.query.lower().split()
+
+
+@dataclass
+class SourceResult:
+    """What one source returned before its deadline; postings may be partial on timeout or error"""
+    source: str
+    status: str = "ok"  # ok, timeout, error
+    postings: List[Dict[str, Any]] = field(default_factory=list)
+    seconds: float = 0.0
+    error: Optional[str] = None
+    cached: bool = False
+
+
+class JobSourceError(Exception):
+    """Injected failure raised by a fixture source"""
+
+
+class JobSource:
+    """Base class for job board adapters
+
+    Adapters yield pages of postings normalized to the JobPosting fields, so a
+    search that runs out of time keeps the pages that already arrived.
+    """
+    name = "base"
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self.latency = RollingWindow()
+        self.timeouts = 0
+        self.errors = 0
+
+    def pages(self, params: JobSearchParams) -> AsyncIterator[List[Dict[str, Any]]]:
+        raise NotImplementedError
+
+    async def search(self, params: JobSearchParams) -> SourceResult:
+        """Collect pages until the source is exhausted, fails or reaches its timeout"""
+        result = SourceResult(source=self.name)
+        started = time.perf_counter()
+
+        async def collect() -> None:
+            async for page in self.pages(params):
+                result.postings.extend(page)
+
+        try:
+            await asyncio.wait_for(collect(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            result.status = "timeout"
+            self.timeouts += 1
+        except Exception as e:
+            print(f"Error searching {self.name}: {str(e)}")
+            result.status = "error"
+            result.error = str(e)
+            self.errors += 1
+        result.seconds = time.perf_counter() - started
+        self.latency.record(result.seconds)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(self.latency.summary(), timeout_ms=self.timeout * 1000, timeouts=self.timeouts, errors=self.errors)
+
+
+class FixtureJobSource(JobSource):
+    """Local stand-in for a job board feed, served from fixtures/<name>.json
+
+    Raw records keep the board's own field names; subclasses map them onto
+    JobPosting fields. latency is the simulated delay per page of results.
+    """
+    page_size = 10
+
+    def __init__(self, timeout: float, latency: float = 0.0, error_rate: float = 0.0):
+        super().__init__(timeout)
+        self.simulated_latency = latency
+        self.error_rate = error_rate
+        self._records: Optional[List[Dict[str, Any]]] = None
+
+    def records(self) -> List[Dict[str, Any]]:
+        if self._records is None:
+            with open(os.path.join(FIXTURES_DIR, f"{self.name}.json")) as f:
+                self._records = [self.normalize(raw) for raw in json.load(f)]
+        return self._records
+
+    def normalize(self, raw: Dict[str, Any]) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    async def pages(self, params: JobSearchParams) -> AsyncIterator[List[Dict[str, Any]]]:
+        matches = [posting for posting in self.records() if matches_filters(posting, params)]
+        for start in range(0, max(len(matches), 1), self.page_size):
+            await asyncio.sleep(self.simulated_latency)
+            if random.random() < self.error_rate:
+                raise JobSourceError(f"Injected failure from {self.name}")
+            yield matches[start:start + self.page_size]
+
+
+class LinkedInFixtureSource(FixtureJobSource):
+    name = "linkedin"
+
+    def normalize(self, raw: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "title": raw["title"],
+            "company": raw["companyName"],
+            "location": raw.get("formattedLocation"),
+            "description": raw.get("descriptionSnippet"),
+            "salary_range": None,
+            "job_type": raw.get("employmentType", "").replace("_", "-").capitalize() or None,
+            "remote": bool(raw.get("workRemoteAllowed")),
+            "url": f"https://www.linkedin.com/jobs/view/{raw['jobPostingId']}",
+            "source": self.name,
+            "external_id": str(raw["jobPostingId"]),
+            "posted_at": datetime.fromtimestamp(raw["listedAt"] / 1000, tz=timezone.utc)
+        }
+
+
+class IndeedFixtureSource(FixtureJobSource):
+    name = "indeed"
+
+    def normalize(self, raw: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "title": raw["jobtitle"],
+            "company": raw["company"],
+            "location": raw.get("formattedLocation"),
+            "description": raw.get("snippet"),
+            "salary_range": raw.get("salary"),
+            "job_type": (raw.get("jobTypes") or [None])[0],
+            "remote": bool(raw.get("remote")),
+            "url": f"https://www.indeed.com/viewjob?jk={raw['jobkey']}",
+            "source": self.name,
+            "external_id": raw["jobkey"],
+            "posted_at": parsedate_to_datetime(raw["date"])
+        }
+
+
+class GlassdoorFixtureSource(FixtureJobSource):
+    name = "glassdoor"
+
+    def normalize(self, raw: Dict[str, Any]) -> Dict[str, Any]:
+        # The feed only reports age, so postings stay as fresh as the fixture says
+        posted_at = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        return {
+            "title": raw["jobTitle"],
+            "company": raw["employerName"],
+            "location": raw.get("location"),
+            "description": raw.get("description"),
+            "salary_range": raw.get("salaryEstimate", "").replace(" (Glassdoor est.)", "") or None,
+            "job_type": raw.get("jobType"),
+            "remote": bool(raw.get("isRemote")),
+            "url": f"https://www.glassdoor.com/job-listing/?jl={raw['jobListingId']}",
+            "source": self.name,
+            "external_id": str(raw["jobListingId"]),
+            "posted_at": posted_at - timedelta(days=raw.get("ageInDays", 0))
+        }
+
+
+FIXTURE_SOURCES = {
+    source.name: source for source in (LinkedInFixtureSource, IndeedFixtureSource, GlassdoorFixtureSource)
+}
+
+
+def matches_filters(posting: Dict[str, Any], params: JobSearchParams) -> bool:
+    """Whether a normalized posting satisfies the search filters (any query term must match)
+
+    experience_level is not a filter; ranking prefers titles that mention it.
+    """
+    text = f"{posting['title']} {posting.get('description') or ''}".lower()
+    if params.terms and not any(term in text for term in params.terms):
+        return False
+    if params.location and params.location.lower() not in (posting.get("location") or "").lower():
+        return False
+    if params.job_type and params.job_type.lower() != (posting.get("job_type") or "").lower():
+        return False
+    if params.remote is not None and posting["remote"] != params.remote:
+        return False
+    return True
+
+
+def parse_job_sources(spec: str, default_timeout: float) -> List[JobSource]:
+    """Build fixture sources from a spec like "linkedin:2,indeed:0.5:0.3" (name:timeout:latency:error_rate)"""
+    sources: List[JobSource] = []
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, *options = item.split(":")
+        timeout, latency, error_rate = (options + ["", "", ""])[:3]
+        if name not in FIXTURE_SOURCES:
+            raise ValueError(f"Unknown job source: {name}")
+        sources.append(FIXTURE_SOURCES[name](
+            timeout=float(timeout or default_timeout), latency=float(latency or 0), error_rate=float(error_rate or 0)
+        ))
+    return sources
+
+
+def get_job_sources() -> List[JobSource]:
+    """Get the configured job sources, building them on first use"""
+    global _sources
+    if _sources is None:
+        _sources = parse_job_sources(settings.JOB_SOURCES, settings.JOB_SOURCE_TIMEOUT_SECONDS)
+    return _sources
@@ -0,0 +1,223 @@
+import asyncio
+import json
+import random
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, AsyncIterator, List, Optional
+
+from app.config import settings
+
+if TYPE_CHECKING:
+    import httpx
+
+# Shared, pooled HTTP client used by every provider (httpx is imported when it is created)
+_http_client: Optional["httpx.AsyncClient"] = None
+_providers: Optional[List["LLMProvider"]] = None
+
+
+@dataclass(frozen=True)
+class CompletionRequest:
+    """A single chat-style completion request, independent of provider"""
+    system: str
+    prompt: str
+    max_tokens: int = 1000
+    temperature: float = 0.7
+
+
+class LLMProvider:
+    """Base class for async LLM providers with a per-provider concurrency limit"""
+    name = "base"
+
+    def __init__(self, model: str, max_concurrency: int):
+        self.model = model
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._in_flight = 0
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def complete(self, request: CompletionRequest) -> str:
+        """Run a completion, waiting for a free slot if the provider is saturated"""
+        async with self._semaphore:
+            self._in_flight += 1
+            try:
+                return await self._complete(request)
+            finally:
+                self._in_flight -= 1
+
+    async def stream(self, request: CompletionRequest) -> AsyncIterator[str]:
+        """Stream completion text deltas, holding a concurrency slot until the stream ends"""
+        async with self._semaphore:
+            self._in_flight += 1
+            try:
+                async for delta in self._stream(request):
+                    yield delta
+            finally:
+                self._in_flight -= 1
+
+    async def _complete(self, request: CompletionRequest) -> str:
+        raise NotImplementedError
+
+    async def _stream(self, request: CompletionRequest) -> AsyncIterator[str]:
+        # Providers without native streaming emit the whole completion as one delta
+        yield await self._complete(request)
+
+
+class OpenAIProvider(LLMProvider):
+    name = "openai"
+    url = "https://api.openai.com/v1/chat/completions"
+
+    def __init__(self, api_key: str, model: str, max_concurrency: int):
+        super().__init__(model, max_concurrency)
+        self._headers = {"Authorization": f"Bearer {api_key}"}
+
+    def _payload(self, request: CompletionRequest) -> dict:
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": request.system},
+                {"role": "user", "content": request.prompt}
+            ],
+            "max_tokens": request.max_tokens,
+            "temperature": request.temperature
+        }
+
+    async def _complete(self, request: CompletionRequest) -> str:
+        response = await get_http_client().post(self.url, headers=self._headers, json=self._payload(request))
+        response.raise_for_status()
+        return response.json()["choices"][0]["message"]["content"].strip()
+
+    async def _stream(self, request: CompletionRequest) -> AsyncIterator[str]:
+        payload = dict(self._payload(request), stream=True)
+        async with get_http_client().stream("POST", self.url, headers=self._headers, json=payload) as response:
+            response.raise_for_status()
+            async for data in _iter_sse_data(response):
+                if data == "[DONE]":
+                    break
+                choices = json.loads(data).get("choices") or []
+                delta = choices[0].get("delta", {}).get("content") if choices else None
+                if delta:
+                    yield delta
+
+
+class AnthropicProvider(LLMProvider):
+    name = "anthropic"
+    url = "https://api.anthropic.com/v1/messages"
+
+    def __init__(self, api_key: str, model: str, max_concurrency: int):
+        super().__init__(model, max_concurrency)
+        self._headers = {"x-api-key": api_key, "anthropic-version": "2023-06-01"}
+
+    def _payload(self, request: CompletionRequest) -> dict:
+        return {
+            "model": self.model,
+            "system": request.system,
+            "messages": [{"role": "user", "content": request.prompt}],
+            "max_tokens": request.max_tokens,
+            "temperature": request.temperature
+        }
+
+    async def _complete(self, request: CompletionRequest) -> str:
+        response = await get_http_client().post(self.url, headers=self._headers, json=self._payload(request))
+        response.raise_for_status()
+        content = response.json()["content"]
+        return "".join(block["text"] for block in content if block["type"] == "text").strip()
+
+    async def _stream(self, request: CompletionRequest) -> AsyncIterator[str]:
+        payload = dict(self._payload(request), stream=True)
+        async with get_http_client().stream("POST", self.url, headers=self._headers, json=payload) as response:
+            response.raise_for_status()
+            async for data in _iter_sse_data(response):
+                event = json.loads(data)
+                if event.get("type") == "message_stop":
+                    break
+                delta = event.get("delta") or {}
+                if event.get("type") == "content_block_delta" and delta.get("type") == "text_delta":
+                    yield delta["text"]
+
+
+class FakeProviderError(Exception):
+    """Injected failure raised by FakeProvider"""
+
+
+class FakeProvider(LLMProvider):
+    """Local stand-in provider with injectable latency and error rate, for load and failover testing"""
+
+    def __init__(self, name: str, latency: float = 0.0, error_rate: float = 0.0, jitter: float = 0.0, max_concurrency: int = 16):
+        super().__init__(model="fake", max_concurrency=max_concurrency)
+        self.name = name
+        self.latency = latency
+        self.error_rate = error_rate
+        self.jitter = jitter
+
+    async def _complete(self, request: CompletionRequest) -> str:
+        await asyncio.sleep(self.latency + random.uniform(0, self.jitter))
+        if random.random() < self.error_rate:
+            raise FakeProviderError(f"Injected failure from {self.name}")
+        return f"[{self.name}] {request.prompt[:200]}"
+
+    async def _stream(self, request: CompletionRequest) -> AsyncIterator[str]:
+        text = await self._complete(request)
+        for word in text.split(" "):
+            yield word + " "
+
+
+def parse_fake_providers(spec: str) -> List[LLMProvider]:
+    """Build fake providers from a spec like "fast:0.05:0,flaky:1.5:0.3" (name:latency:error_rate)"""
+    providers: List[LLMProvider] = []
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, latency, error_rate = (item.split(":") + ["0", "0"])[:3]
+        providers.append(FakeProvider(name, latency=float(latency), error_rate=float(error_rate)))
+    return providers
+
+
+async def _iter_sse_data(response: "httpx.Response") -> AsyncIterator[str]:
+    """Yield the data payloads of a provider's server-sent event stream"""
+    async for line in response.aiter_lines():
+        if line.startswith("data:"):
+            yield line[5:].strip()
+
+
+def get_http_client() -> "httpx.AsyncClient":
+    """Get the process-wide pooled HTTP client, creating it on first use"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        import httpx
+
+        _http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(settings.AI_REQUEST_TIMEOUT_SECONDS, connect=10.0),
+            limits=httpx.Limits(
+                max_connections=settings.AI_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.AI_HTTP_MAX_KEEPALIVE
+            )
+        )
+    return _http_client
+
+
+def get_providers() -> List[LLMProvider]:
+    """Get the configured providers in priority order (OpenAI first, then Anthropic)"""
+    global _providers
+    if _providers is None and settings.AI_FAKE_PROVIDERS:
+        _providers = parse_fake_providers(settings.AI_FAKE_PROVIDERS)
+    if _providers is None:
+        providers: List[LLMProvider] = []
+        if settings.OPENAI_API_KEY:
+            providers.append(OpenAIProvider(
+                settings.OPENAI_API_KEY, settings.OPENAI_MODEL, settings.OPENAI_MAX_CONCURRENCY
+            ))
+        if settings.ANTHROPIC_API_KEY:
+            providers.append(AnthropicProvider(
+                settings.ANTHROPIC_API_KEY, settings.ANTHROPIC_MODEL, settings.ANTHROPIC_MAX_CONCURRENCY
+            ))
+        _providers = providers
+    return _providers
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client and drop provider instances bound to it"""
+    global _http_client, _providers
+    if _http_client is not None:
+        await _http_client.aclose()
+    _http_client = None
+    _providers = None
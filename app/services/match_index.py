@@ -0,0 +1,292 @@
+import math
+import re
+import threading
+import time
+from array import array
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.application import JobPosting
+from app.services.posting_dedupe import posting_text
+
+np: Any = None  # loaded by _load_numpy()
+
+# Keeps tokens like c++, c#, node.js and ci/cd whole
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:[./][a-z0-9+#]+)*")
+STOPWORDS = frozenset(
+    "a about all an and any are as at be but by can for from has have in into is it its more most of on or other "
+    "our over such than that the their they this to us we what which who will with you your".split()
+)
+
+
+def _load_numpy() -> None:
+    global np
+    if np is None:
+        import numpy
+        np = numpy
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in _TOKEN.findall(text.lower()) if token not in STOPWORDS]
+
+
+class _TermPostings:
+    """One term's postings list: document slots and term frequencies in compact typed arrays
+
+    Appends are amortized O(1); scoring reads the arrays through zero-copy
+    NumPy views.
+    """
+    __slots__ = ("slots", "freqs")
+
+    def __init__(self):
+        self.slots = array("I")
+        self.freqs = array("H")
+
+
+class MatchIndex:
+    """Incrementally maintained in-memory BM25 inverted index over job posting text
+
+    Each posting occupies a document slot; re-indexing a posting retires its
+    old slot, and retired slots are compacted away once they make up a
+    quarter of the index. Only canonical postings are indexed, so
+    near-duplicates never crowd the top results. sync() catches up with
+    postings written by any process (new ids) and those marked stale here.
+    Ids are allocated before their transaction commits, so an id skipped
+    below the newest one seen is remembered as a gap and looked up again on
+    each sync for gap_seconds, in case it commits late (e.g. a long bulk
+    import overtaken by a single save); ids that never show up (rolled back,
+    or burned by an upsert that updated) are then forgotten.
+    Postings and scores live in typed arrays, so 500k postings take tens of
+    megabytes and a query is a handful of vectorized passes over them.
+    """
+
+    def __init__(self, k1: float, b: float, max_query_terms: int, gap_seconds: float = 600.0):
+        self.k1 = k1
+        self.b = b
+        self.max_query_terms = max_query_terms
+        self.gap_seconds = gap_seconds
+        self._terms: Dict[str, _TermPostings] = {}
+        self._slot_posting = array("q")
+        self._slot_length = array("f")
+        self._slot_live = bytearray()
+        self._posting_slot: Dict[int, int] = {}
+        self._total_length = 0.0
+        self._norm: Optional["np.ndarray"] = None
+        self._last_id = 0
+        self._gaps: Dict[int, float] = {}  # id -> when it was first skipped
+        self._loaded = False
+        self._stale: Set[int] = set()
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self.queries = 0
+        self.compactions = 0
+
+    def __len__(self) -> int:
+        return len(self._posting_slot)
+
+    def add(self, posting_id: int, text: str) -> None:
+        counts = Counter(tokenize(text))
+        with self._lock:
+            self._retire(posting_id)
+            if not counts:
+                return
+            slot = len(self._slot_posting)
+            for term, count in counts.items():
+                postings = self._terms.get(term)
+                if postings is None:
+                    postings = self._terms[term] = _TermPostings()
+                postings.slots.append(slot)
+                postings.freqs.append(min(count, 0xFFFF))
+            length = sum(counts.values())
+            self._slot_posting.append(posting_id)
+            self._slot_length.append(length)
+            self._slot_live.append(1)
+            self._posting_slot[posting_id] = slot
+            self._total_length += length
+            self._norm = None
+
+    def remove(self, posting_id: int) -> None:
+        with self._lock:
+            self._retire(posting_id)
+
+    def _retire(self, posting_id: int) -> None:
+        slot = self._posting_slot.pop(posting_id, None)
+        if slot is not None:
+            self._slot_live[slot] = 0
+            self._total_length -= self._slot_length[slot]
+            self._norm = None
+
+    def mark_stale(self, posting_ids: Iterable[int]) -> None:
+        """Re-read these postings on the next sync (e.g. after an import updated them)"""
+        with self._lock:
+            self._stale.update(posting_ids)
+
+    def sync(self, db: Session, batch_size: int = 5000) -> int:
+        """Index postings newer than the last one seen, plus stale ones and gaps; returns the number read
+
+        Returns 0 straight away while another sync is running (e.g. the initial
+        load at startup), so a request never waits on it and is served from
+        what is indexed so far.
+        """
+        if not self._sync_lock.acquire(blocking=False):
+            return 0
+        try:
+            with self._lock:
+                stale, self._stale = sorted(self._stale), set()
+            now = time.monotonic()
+            self._gaps = {posting_id: since for posting_id, since in self._gaps.items() if now - since < self.gap_seconds}
+            # Gaps found by earlier syncs are re-read along with the stale postings
+            recheck = sorted(set(stale) | set(self._gaps))
+            # Holes in the initial load are deleted postings, not late commits
+            track_gaps = self._loaded
+            read = 0
+            while True:
+                rows = db.execute(self._rows(JobPosting.id > self._last_id).limit(batch_size)).all()
+                self._index_rows(rows)
+                for row in rows:
+                    if track_gaps:
+                        self._gaps.update((posting_id, now) for posting_id in range(self._last_id + 1, row.id))
+                    self._last_id = row.id
+                read += len(rows)
+                if len(rows) < batch_size:
+                    break
+            for start in range(0, len(recheck), batch_size):
+                rows = db.execute(self._rows(JobPosting.id.in_(recheck[start:start + batch_size]))).all()
+                self._index_rows(rows)
+                for row in rows:
+                    self._gaps.pop(row.id, None)
+                read += len(rows)
+            with self._lock:
+                if len(self._slot_live) > 1000 and len(self._posting_slot) < 0.75 * len(self._slot_live):
+                    self._compact()
+            self._loaded = True
+            return read
+        finally:
+            self._sync_lock.release()
+
+    @staticmethod
+    def _rows(condition):
+        return select(
+            JobPosting.id, JobPosting.title, JobPosting.company, JobPosting.description, JobPosting.canonical_id
+        ).where(condition).order_by(JobPosting.id)
+
+    def _index_rows(self, rows) -> None:
+        for row in rows:
+            # Near-duplicates are left out, so a job posted on several boards is ranked once
+            if row.canonical_id is None:
+                self.add(row.id, posting_text(row.title, row.company, row.description))
+            else:
+                self.remove(row.id)
+
+    def _compact(self) -> None:
+        _load_numpy()
+        live = np.frombuffer(self._slot_live, dtype=np.uint8).astype(bool)
+        remap = np.cumsum(live, dtype=np.int64) - 1
+        for term in list(self._terms):
+            postings = self._terms[term]
+            slots = np.frombuffer(postings.slots, dtype=np.uint32)
+            keep = live[slots]
+            if not keep.any():
+                del self._terms[term]
+                continue
+            compacted = _TermPostings()
+            compacted.slots.frombytes(remap[slots[keep]].astype(np.uint32).tobytes())
+            compacted.freqs.frombytes(np.frombuffer(postings.freqs, dtype=np.uint16)[keep].tobytes())
+            self._terms[term] = compacted
+        posting_ids = np.frombuffer(self._slot_posting, dtype=np.int64)[live]
+        self._slot_posting = array("q", posting_ids.tobytes())
+        self._slot_length = array("f", np.frombuffer(self._slot_length, dtype=np.float32)[live].tobytes())
+        self._slot_live = bytearray(b"\x01" * len(posting_ids))
+        self._posting_slot = {int(posting_id): slot for slot, posting_id in enumerate(posting_ids)}
+        self._norm = None
+        self.compactions += 1
+
+    def top_k(self, text: str, k: int) -> List[Tuple[int, float]]:
+        """(posting id, BM25 score) of the k best-matching postings, best first
+
+        Only the max_query_terms most selective query terms (by idf times
+        query frequency) are scored, which bounds the work for long queries
+        such as a whole resume.
+        """
+        _load_numpy()
+        counts = Counter(tokenize(text))
+        with self._lock:
+            self.queries += 1
+            documents = len(self._posting_slot)
+            if documents == 0 or k <= 0:
+                return []
+            # Terms are picked with list lengths as document frequencies, which count retired slots too
+            weighted = []
+            for term, count in counts.items():
+                postings = self._terms.get(term)
+                if postings is not None:
+                    weighted.append((self._idf(documents, len(postings.slots)) * count, postings))
+            weighted.sort(key=lambda item: item[0], reverse=True)
+            live = None
+            if documents < len(self._slot_live):
+                live = np.frombuffer(self._slot_live, dtype=np.uint8)
+
+            if self._norm is None:
+                # k1 * (1 - b + b * length / average length), per slot; retired slots never score
+                average = self._total_length / documents
+                self._norm = (
+                    self.k1 * (1.0 - self.b + self.b * np.frombuffer(self._slot_length, dtype=np.float32) / average)
+                ).astype(np.float32)
+            norm = self._norm
+            scores = np.zeros(len(self._slot_live), dtype=np.float32)
+            slots = None
+            for _, postings in weighted[:self.max_query_terms]:
+                slots = np.frombuffer(postings.slots, dtype=np.uint32)
+                df = len(slots) if live is None else int(np.count_nonzero(live[slots]))
+                freqs = np.frombuffer(postings.freqs, dtype=np.uint16).astype(np.float32)
+                # A document appears once per term list, so fancy-index += is safe
+                scores[slots] += self._idf(documents, df) * freqs * (self.k1 + 1.0) / (freqs + norm[slots])
+            if live is not None:
+                scores[live == 0] = 0.0
+
+            k = min(k, len(scores))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind="stable")]
+            slot_posting = np.frombuffer(self._slot_posting, dtype=np.int64)
+            matches = [(int(slot_posting[slot]), float(scores[slot])) for slot in top if scores[slot] > 0.0]
+            # Views pin their buffers, and an array cannot grow while one is alive
+            del slots, live, slot_posting
+        return matches
+
+    @staticmethod
+    def _idf(documents: int, df: int) -> float:
+        return math.log(1.0 + (documents - df + 0.5) / (df + 0.5))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "postings": len(self._posting_slot),
+            "slots": len(self._slot_live),
+            "terms": len(self._terms),
+            "list_entries": sum(len(postings.slots) for postings in self._terms.values()),
+            "last_id": self._last_id,
+            "gaps": len(self._gaps),
+            "queries": self.queries,
+            "compactions": self.compactions
+        }
+
+
+match_index = MatchIndex(
+    k1=settings.MATCH_BM25_K1,
+    b=settings.MATCH_BM25_B,
+    max_query_terms=settings.MATCH_MAX_QUERY_TERMS,
+    gap_seconds=settings.MATCH_GAP_SECONDS
+)
+
+
+def sync_match_index() -> int:
+    """Catch the shared index up with a session of its own; blocking, so run it in the threadpool"""
+    db = SessionLocal()
+    try:
+        return match_index.sync(db)
+    finally:
+        db.close()
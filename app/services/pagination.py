@@ -0,0 +1,93 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.sql import Select
+from starlette.requests import Request
+
+# Upper bound on a keyset page, whatever limit the client asks for
+MAX_PAGE_SIZE = 500
+
+
+class InvalidCursor(ValueError):
+    """A pagination cursor that could not be decoded"""
+
+
+def encode_cursor(direction: str, created_at: Optional[datetime], row_id: int) -> str:
+    """Opaque token for the position just past (next) or before (prev) a row"""
+    payload = [direction, created_at.isoformat() if created_at else None, row_id]
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, Optional[datetime], int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        direction, created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        if direction not in ("next", "prev") or not isinstance(row_id, int):
+            raise ValueError(direction)
+        return direction, datetime.fromisoformat(created_at) if created_at else None, row_id
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+        raise InvalidCursor("Invalid pagination cursor") from e
+
+
+async def paginate(
+    db: Any,
+    query: Select,
+    created_at_column: Any,
+    id_column: Any,
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = 100
+) -> Dict[str, Any]:
+    """Run query as one keyset page, newest first, ordered by (created_at, id)
+
+    Pages continue from the (created_at, id) of their boundary row, so a deep page
+    costs the same index range scan as the first one instead of scanning and
+    discarding every row before it.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    direction = "next"
+    key = tuple_(created_at_column, id_column)
+
+    if cursor:
+        direction, created_at, row_id = decode_cursor(cursor)
+        # Compare against the stored timestamp of the boundary row, so values never go
+        # through a bind/format round trip; the encoded one covers a deleted boundary row
+        anchor = func.coalesce(
+            select(created_at_column).where(id_column == row_id).correlate(None).scalar_subquery(),
+            created_at
+        )
+        boundary = tuple_(anchor, row_id)
+        query = query.where(key < boundary if direction == "next" else key > boundary)
+
+    if direction == "next":
+        query = query.order_by(created_at_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(created_at_column.asc(), id_column.asc())
+
+    # One extra row tells whether there is another page in the direction of travel
+    rows = list((await db.scalars(query.limit(limit + 1))).all())
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if direction == "prev":
+        rows.reverse()
+
+    has_next = has_more if direction == "next" else True
+    has_prev = bool(cursor) if direction == "next" else has_more
+
+    def boundary_cursor(page_direction: str, row: Any) -> str:
+        return encode_cursor(page_direction, getattr(row, created_at_column.key), getattr(row, id_column.key))
+
+    next_cursor = boundary_cursor("next", rows[-1]) if rows and has_next else None
+    prev_cursor = boundary_cursor("prev", rows[0]) if rows and has_prev else None
+
+    return {
+        "items": rows,
+        "next_cursor": next_cursor,
+        "prev_cursor": prev_cursor,
+        "next": str(request.url.include_query_params(cursor=next_cursor)) if next_cursor else None,
+        "prev": str(request.url.include_query_params(cursor=prev_cursor)) if prev_cursor else None
+    }
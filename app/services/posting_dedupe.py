@@ -0,0 +1,257 @@
+import hashlib
+import re
+import zlib
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import delete, insert, select, tuple_, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.application import JobPosting, JobPostingBand
+
+# numpy is imported on first use, so app startup does not pay for it
+np: Any = None
+
+# Mersenne prime for the (a * x + b) mod p permutations
+_PRIME = (1 << 61) - 1
+# Row-value IN lists stay well under the bind-parameter limits of SQLite and Postgres
+_LOOKUP_CHUNK = 500
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def _load_numpy() -> None:
+    global np
+    if np is None:
+        import numpy
+        np = numpy
+
+
+def posting_text(title: str, company: str, description: Optional[str]) -> str:
+    return f"{title} {company} {description or ''}"
+
+
+def shingles(text: str, size: int) -> Set[str]:
+    """Overlapping runs of size words, after lowercasing and dropping punctuation"""
+    words = _WORD.findall(text.lower())
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+class MinHasher:
+    """MinHash signatures whose matching fraction estimates the Jaccard similarity of shingle sets
+
+    Signatures are banded for LSH: two postings share a band bucket with high
+    probability only when they are similar, so candidates come from bucket
+    lookups instead of comparing every pair. Changing num_perm, bands or
+    shingle_size invalidates stored signatures.
+    """
+
+    def __init__(self, num_perm: int, bands: int, shingle_size: int, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        _load_numpy()
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        generator = np.random.default_rng(seed)
+        # a * x wraps around in uint64 arithmetic, which mixes the bits further (as datasketch does)
+        self._a = generator.integers(1, _PRIME, size=num_perm, dtype=np.uint64)
+        self._b = generator.integers(0, _PRIME, size=num_perm, dtype=np.uint64)
+
+    def signature(self, text: str) -> Optional["np.ndarray"]:
+        """uint32 signature of the text's shingles, or None for text without words"""
+        features = shingles(text, self.shingle_size)
+        if not features:
+            return None
+        # crc32 is stable across processes, unlike hash()
+        hashes = np.fromiter((zlib.crc32(feature.encode()) for feature in features), dtype=np.uint64, count=len(features))
+        permuted = (np.outer(hashes, self._a) + self._b) % _PRIME
+        return (permuted.min(axis=0) & 0xFFFFFFFF).astype(np.uint32)
+
+    def band_buckets(self, signature: "np.ndarray") -> List[Tuple[int, int]]:
+        """(band, bucket) pairs; buckets are 63-bit so they fit a signed BIGINT"""
+        return [
+            (band, int.from_bytes(
+                hashlib.blake2b(signature[band * self.rows:(band + 1) * self.rows].tobytes(), digest_size=8).digest(),
+                "big"
+            ) >> 1)
+            for band in range(self.bands)
+        ]
+
+    def to_bytes(self, signature: "np.ndarray") -> bytes:
+        return signature.astype("<u4").tobytes()
+
+    def from_bytes(self, data: bytes) -> "np.ndarray":
+        return np.frombuffer(data, dtype="<u4").astype(np.uint32)
+
+
+class LSHIndex:
+    """In-memory LSH index over MinHash signatures with incremental inserts"""
+
+    def __init__(self, hasher: MinHasher, threshold: float):
+        self.hasher = hasher
+        self.threshold = threshold
+        self._buckets: Dict[Tuple[int, int], List[Hashable]] = {}
+        self._signatures: Dict[Hashable, "np.ndarray"] = {}
+
+    def insert(self, key: Hashable, signature: "np.ndarray") -> None:
+        self._signatures[key] = signature
+        for bucket in self.hasher.band_buckets(signature):
+            self._buckets.setdefault(bucket, []).append(key)
+
+    def query(self, signature: "np.ndarray") -> Optional[Hashable]:
+        """The most similar indexed key at or above the threshold, or None"""
+        candidates = {key for bucket in self.hasher.band_buckets(signature) for key in self._buckets.get(bucket, ())}
+        return best_match(self.hasher, signature, ((key, self._signatures[key]) for key in candidates), self.threshold)
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+
+def best_match(
+    hasher: MinHasher,
+    signature: "np.ndarray",
+    candidates: Iterable[Tuple[Hashable, "np.ndarray"]],
+    threshold: float
+) -> Optional[Hashable]:
+    """The most similar candidate at or above threshold, comparing all candidates in one vectorized pass"""
+    candidates = list(candidates)
+    if not candidates:
+        return None
+    similarities = (np.stack([candidate for _, candidate in candidates]) == signature).mean(axis=1)
+    best = int(similarities.argmax())
+    return candidates[best][0] if similarities[best] >= threshold else None
+
+
+_hasher: Optional[MinHasher] = None
+
+
+def get_hasher() -> MinHasher:
+    global _hasher
+    if _hasher is None:
+        _hasher = MinHasher(settings.DEDUPE_NUM_PERM, settings.DEDUPE_BANDS, settings.DEDUPE_SHINGLE_SIZE)
+    return _hasher
+
+
+def new_index() -> LSHIndex:
+    return LSHIndex(get_hasher(), settings.DEDUPE_THRESHOLD)
+
+
+def link_duplicates(db: Session, posting_ids: Sequence[int]) -> Dict[int, int]:
+    """Sign and index new postings, linking each near-duplicate to the canonical posting it duplicates
+
+    Only canonical postings are banded, so a duplicate links straight to its
+    canonical posting and a popular job adds one candidate, not one per copy.
+    Candidates come from the job_posting_bands table, so the cost depends on
+    the number of bucket matches, not the number of stored postings. Postings
+    in the same batch are matched against each other as well. Returns
+    {duplicate id: canonical id}. The caller commits.
+    """
+    if not posting_ids:
+        return {}
+    hasher = get_hasher()
+    postings = db.execute(
+        select(JobPosting.id, JobPosting.title, JobPosting.company, JobPosting.description)
+        .where(JobPosting.id.in_(posting_ids))
+        .order_by(JobPosting.id)
+    ).all()
+    signatures = {
+        posting.id: hasher.signature(posting_text(posting.title, posting.company, posting.description))
+        for posting in postings
+    }
+    signatures = {posting_id: signature for posting_id, signature in signatures.items() if signature is not None}
+    buckets = {posting_id: hasher.band_buckets(signature) for posting_id, signature in signatures.items()}
+
+    # Stored postings sharing any bucket with the batch, fetched in a few chunked lookups
+    bucket_members: Dict[Tuple[int, int], List[int]] = {}
+    wanted = list({bucket for posting_buckets in buckets.values() for bucket in posting_buckets})
+    for start in range(0, len(wanted), _LOOKUP_CHUNK):
+        rows = db.execute(select(JobPostingBand.band, JobPostingBand.bucket, JobPostingBand.posting_id).where(
+            tuple_(JobPostingBand.band, JobPostingBand.bucket).in_(wanted[start:start + _LOOKUP_CHUNK])
+        ))
+        for row in rows:
+            bucket_members.setdefault((row.band, row.bucket), []).append(row.posting_id)
+
+    stored_ids = {posting_id for members in bucket_members.values() for posting_id in members}
+    known: Dict[int, "np.ndarray"] = {}
+    stored = list(stored_ids)
+    for start in range(0, len(stored), _LOOKUP_CHUNK):
+        for row in db.execute(select(JobPosting.id, JobPosting.minhash).where(
+            JobPosting.id.in_(stored[start:start + _LOOKUP_CHUNK])
+        )):
+            known[row.id] = hasher.from_bytes(row.minhash)
+
+    links: Dict[int, int] = {}
+    updates = []
+    for posting_id, signature in signatures.items():
+        candidates = {
+            candidate for bucket in buckets[posting_id] for candidate in bucket_members.get(bucket, ())
+            if candidate in known
+        }
+        canonical_id = best_match(
+            hasher, signature, ((candidate, known[candidate]) for candidate in candidates), settings.DEDUPE_THRESHOLD
+        )
+        updates.append({"id": posting_id, "minhash": hasher.to_bytes(signature), "canonical_id": canonical_id})
+        if canonical_id is not None:
+            links[posting_id] = canonical_id
+            continue
+        # Later postings in the batch can match this one
+        known[posting_id] = signature
+        for bucket in buckets[posting_id]:
+            bucket_members.setdefault(bucket, []).append(posting_id)
+
+    band_rows = [
+        {"band": band, "bucket": bucket, "posting_id": posting_id}
+        for posting_id, posting_buckets in buckets.items() if posting_id not in links
+        for band, bucket in posting_buckets
+    ]
+    if updates:
+        # ORM bulk UPDATE by primary key
+        db.execute(update(JobPosting), updates)
+    if band_rows:
+        # Core executemany; the ORM bulk path adds nothing for a table without defaults
+        db.execute(insert(JobPostingBand.__table__), band_rows)
+    return links
+
+
+def index_unsigned_postings(db: Session, batch_size: int = 1000) -> int:
+    """Sign and link every posting without a signature (e.g. saved before dedupe existed), oldest first"""
+    last_id, indexed = 0, 0
+    while True:
+        ids = db.scalars(
+            select(JobPosting.id)
+            .where(JobPosting.id > last_id, JobPosting.minhash.is_(None))
+            .order_by(JobPosting.id)
+            .limit(batch_size)
+        ).all()
+        if not ids:
+            return indexed
+        link_duplicates(db, ids)
+        db.commit()
+        last_id, indexed = ids[-1], indexed + len(ids)
+
+
+def reindex_job_postings(db: Session, batch_size: int = 1000) -> int:
+    """Drop every signature, band and link and index all postings again (after changing DEDUPE_* settings)"""
+    db.execute(delete(JobPostingBand))
+    db.execute(update(JobPosting).values(minhash=None, canonical_id=None))
+    db.commit()
+    return index_unsigned_postings(db, batch_size)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from app.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Index job postings for near-duplicate detection")
+    parser.add_argument("--rebuild", action="store_true", help="drop existing signatures and links first")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    with SessionLocal() as session:
+        indexer = reindex_job_postings if args.rebuild else index_unsigned_postings
+        print(f"Indexed {indexer(session, args.batch_size)} job postings")
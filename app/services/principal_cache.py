@@ -0,0 +1,86 @@
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.config import settings
+from app.models.user import User
+from app.services.cache import TTLCache
+
+USER_COLUMNS = [column.key for column in inspect(User).column_attrs]
+
+
+class PrincipalCache:
+    """Short-lived cache of authenticated users keyed by token subject (email)
+
+    Entries are column snapshots rather than ORM instances, so a hit can be attached
+    to the request's session without a query (and without checking out a connection
+    until the route actually touches the database). Any flushed change to a user drops
+    its entry once the transaction commits; the TTL bounds staleness across processes.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, subject: str) -> Optional[User]:
+        """Get a detached copy of the cached user, ready for merge(load=False), or None"""
+        snapshot = self._cache.get(subject)
+        if snapshot is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        user = User(**snapshot)
+        make_transient_to_detached(user)
+        return user
+
+    def set(self, subject: str, user: User) -> None:
+        self._cache.set(subject, {key: getattr(user, key) for key in USER_COLUMNS})
+
+    def invalidate(self, subject: Optional[str]) -> None:
+        if subject and self._cache.pop(subject) is not None:
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "entries": len(self._cache),
+            "hit_ratio": self.hits / lookups if lookups else 0.0
+        }
+
+
+principal_cache = PrincipalCache(
+    maxsize=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session: Session, flush_context) -> None:
+    changed = session.info.setdefault("principal_invalidations", set())
+    for obj in list(session.dirty) + list(session.deleted):
+        if isinstance(obj, User):
+            # Include the previous email when it was changed
+            history = inspect(obj).attrs.email.history
+            changed.update(email for email in (history.deleted or ()) if email)
+            changed.add(obj.email)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session: Session) -> None:
+    for email in session.info.pop("principal_invalidations", ()):
+        principal_cache.invalidate(email)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_users(session: Session) -> None:
+    session.info.pop("principal_invalidations", None)
@@ -0,0 +1,275 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from app.config import settings
+from app.services.llm_client import CompletionRequest, LLMProvider, get_providers
+from app.services.rate_limiter import estimate_tokens, provider_limiter
+
+
+class ProviderUnavailable(Exception):
+    """Raised when no provider can take a request because every circuit is open"""
+
+
+class CircuitOpen(Exception):
+    """Raised when a provider's circuit opened between selection and the call"""
+
+
+class ProviderStats:
+    """Rolling latency and error-rate window for one provider/model"""
+
+    def __init__(self, window: int):
+        self.latencies = deque(maxlen=window)
+        self.outcomes = deque(maxlen=window)
+
+    def record(self, latency: Optional[float], ok: bool) -> None:
+        if latency is not None and ok:
+            self.latencies.append(latency)
+        self.outcomes.append(ok)
+
+    def percentile(self, p: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+
+class CircuitBreaker:
+    """Classic closed/open/half-open breaker driven by consecutive failures"""
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+
+    def available(self) -> bool:
+        """Whether a call could be admitted now, without consuming a half-open probe"""
+        if self.state == "closed":
+            return True
+        if self.state == "open":
+            return time.monotonic() - self.opened_at >= self.reset_timeout
+        return not self._probing
+
+    def try_acquire(self) -> bool:
+        """Admit a call, moving an expired open circuit to half-open for a single probe"""
+        if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = "half_open"
+        if self.state == "half_open":
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+        return self.state == "closed"
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.failures = 0
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            self.state = "open"
+            self.opened_at = time.monotonic()
+        self._probing = False
+
+    def release(self) -> None:
+        """Give back a half-open probe whose call was cancelled before finishing"""
+        self._probing = False
+
+
+class ProviderRouter:
+    """Route completions to the healthiest, fastest provider with failover and optional hedging"""
+
+    def __init__(self, providers: List[LLMProvider], hedge: bool = False):
+        self.providers = providers
+        self.hedge = hedge
+        self.stats = {id(p): ProviderStats(settings.AI_ROUTER_WINDOW) for p in providers}
+        self.breakers = {
+            id(p): CircuitBreaker(settings.AI_CIRCUIT_FAILURE_THRESHOLD, settings.AI_CIRCUIT_RESET_SECONDS)
+            for p in providers
+        }
+        self.hedges_sent = 0
+        self.hedges_won = 0
+
+    def candidates(self) -> List[LLMProvider]:
+        """Available providers, closed circuits first, then by p95 latency (untried first)"""
+        available = [p for p in self.providers if self.breakers[id(p)].available()]
+        return sorted(available, key=lambda p: (
+            self.breakers[id(p)].state != "closed",
+            self.stats[id(p)].percentile(0.95) or 0.0
+        ))
+
+    async def complete(self, request: CompletionRequest) -> str:
+        candidates = self.candidates()
+        if not candidates:
+            raise ProviderUnavailable("All AI providers are unavailable, please retry shortly")
+
+        last_error: Exception = ProviderUnavailable("All AI providers are unavailable, please retry shortly")
+        i = 0
+        while i < len(candidates):
+            primary = candidates[i]
+            backup = candidates[i + 1] if self.hedge and i + 1 < len(candidates) else None
+            try:
+                if backup is not None:
+                    return await self._hedged(primary, backup, request)
+                return await self._call(primary, request)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                last_error = e
+            i += 2 if backup is not None else 1
+
+        raise last_error
+
+    async def stream(self, request: CompletionRequest) -> AsyncIterator[str]:
+        """Stream from the best provider, failing over only until the first delta is sent"""
+        candidates = self.candidates()
+        if not candidates:
+            raise ProviderUnavailable("All AI providers are unavailable, please retry shortly")
+
+        last_error: Exception = ProviderUnavailable("All AI providers are unavailable, please retry shortly")
+        for provider in candidates:
+            breaker, stats = self.breakers[id(provider)], self.stats[id(provider)]
+            if not breaker.try_acquire():
+                continue
+            try:
+                await self._admit(provider, request)
+            except asyncio.CancelledError:
+                breaker.release()
+                raise
+            except Exception as e:
+                breaker.release()
+                last_error = e
+                continue
+
+            started = False
+            try:
+                async for delta in provider.stream(request):
+                    started = True
+                    yield delta
+            except (asyncio.CancelledError, GeneratorExit):
+                breaker.release()
+                raise
+            except Exception as e:
+                breaker.record_failure()
+                stats.record(None, False)
+                if started:
+                    raise
+                last_error = e
+                continue
+
+            breaker.record_success()
+            stats.record(None, True)
+            return
+
+        raise last_error
+
+    async def _admit(self, provider: LLMProvider, request: CompletionRequest) -> None:
+        """Wait for room under the provider's request and token limits, raising RateLimited if there is none
+
+        Callers check the circuit first, so calls an open circuit refuses never spend provider budget.
+        """
+        tokens = estimate_tokens(request.system, request.prompt, max_tokens=request.max_tokens)
+        await provider_limiter.acquire(provider.name, tokens, settings.AI_ADMISSION_MAX_WAIT_SECONDS)
+
+    async def _call(self, provider: LLMProvider, request: CompletionRequest) -> str:
+        breaker, stats = self.breakers[id(provider)], self.stats[id(provider)]
+        if not breaker.try_acquire():
+            raise CircuitOpen(f"Circuit open for {provider.name}")
+        try:
+            await self._admit(provider, request)
+        except BaseException:
+            # Not admitted (or cancelled while waiting): the call never reached the provider
+            breaker.release()
+            raise
+
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(provider.complete(request), settings.AI_ATTEMPT_TIMEOUT_SECONDS)
+        except asyncio.CancelledError:
+            # Hedge losers are cancelled; that says nothing about provider health
+            breaker.release()
+            raise
+        except Exception:
+            breaker.record_failure()
+            stats.record(None, False)
+            raise
+
+        breaker.record_success()
+        stats.record(time.perf_counter() - started, True)
+        return result
+
+    async def _hedged(self, primary: LLMProvider, backup: LLMProvider, request: CompletionRequest) -> str:
+        """Send to primary, and to backup too if primary runs past its p95 latency"""
+        primary_stats = self.stats[id(primary)]
+        hedge_delay = primary_stats.percentile(0.95)
+        if hedge_delay is None or len(primary_stats.latencies) < settings.AI_HEDGE_MIN_SAMPLES:
+            # Not enough history to know what "slow" means; fail over sequentially instead
+            try:
+                return await self._call(primary, request)
+            except Exception:
+                return await self._call(backup, request)
+
+        tasks = [asyncio.ensure_future(self._call(primary, request))]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+            if done:
+                if tasks[0].exception() is None:
+                    return tasks[0].result()
+                return await self._call(backup, request)
+
+            self.hedges_sent += 1
+            tasks.append(asyncio.ensure_future(self._call(backup, request)))
+            pending = set(tasks)
+            last_error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is tasks[1]:
+                            self.hedges_won += 1
+                        return task.result()
+                    last_error = task.exception()
+            raise last_error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def metrics(self) -> Dict[str, Any]:
+        providers = {}
+        for p in self.providers:
+            stats, breaker = self.stats[id(p)], self.breakers[id(p)]
+            providers[f"{p.name}:{p.model}"] = {
+                "p50_seconds": stats.percentile(0.5),
+                "p95_seconds": stats.percentile(0.95),
+                "error_rate": stats.error_rate,
+                "samples": len(stats.outcomes),
+                "circuit": breaker.state,
+                "in_flight": p.in_flight,
+                "rate_limit": provider_limiter.levels(p.name)
+            }
+        return {"providers": providers, "hedges_sent": self.hedges_sent, "hedges_won": self.hedges_won}
+
+
+_router: Optional[ProviderRouter] = None
+
+
+def get_router() -> ProviderRouter:
+    """Get the router for the currently configured providers"""
+    global _router
+    providers = get_providers()
+    if _router is None or _router.providers is not providers:
+        _router = ProviderRouter(providers, hedge=settings.AI_HEDGE_REQUESTS)
+    return _router
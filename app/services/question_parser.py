@@ -0,0 +1,82 @@
+import json
+from typing import Any, Dict, List, Optional
+
+VALID_DIFFICULTIES = {"easy", "medium", "hard"}
+
+
+class IncrementalJSONArrayParser:
+    """Extract complete top-level JSON objects from a streamed array as soon as each one closes
+
+    Anything outside an object (the surrounding brackets, commas, markdown fences or
+    stray prose from the model) is skipped, and objects that fail to decode are dropped.
+    """
+
+    def __init__(self):
+        self._buffer: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """Consume a chunk of text and return the objects completed by it"""
+        objects = []
+        for ch in chunk:
+            if self._depth == 0:
+                if ch == "{":
+                    self._depth = 1
+                    self._buffer = [ch]
+                continue
+
+            self._buffer.append(ch)
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    obj = self._decode("".join(self._buffer))
+                    if obj is not None:
+                        objects.append(obj)
+                    self._buffer = []
+        return objects
+
+    @staticmethod
+    def _decode(text: str) -> Optional[Dict[str, Any]]:
+        try:
+            obj = json.loads(text)
+        except ValueError:
+            return None
+        return obj if isinstance(obj, dict) else None
+
+
+def normalize_question(obj: Dict[str, Any], default_difficulty: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Map a model-produced question object onto our fields, or None if it has no text"""
+    text = obj.get("text") or obj.get("question")
+    if not isinstance(text, str) or not text.strip():
+        return None
+
+    difficulty = str(obj.get("difficulty") or default_difficulty or "").lower() or None
+    if difficulty not in VALID_DIFFICULTIES:
+        difficulty = default_difficulty
+
+    category = obj.get("category")
+    return {
+        "text": text.strip(),
+        "category": str(category).strip().lower() if category else None,
+        "difficulty": difficulty,
+        "interviewer_notes": obj.get("interviewer_notes") or obj.get("looking_for") or ""
+    }
+
+
+def parse_questions(text: str, default_difficulty: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Parse a complete model response into normalized question dicts"""
+    parsed = (normalize_question(obj, default_difficulty) for obj in IncrementalJSONArrayParser().feed(text))
+    return [question for question in parsed if question]
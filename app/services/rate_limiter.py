@@ -0,0 +1,201 @@
+import asyncio
+import math
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+from app.config import settings
+
+
+class RateLimited(Exception):
+    """Raised when a request cannot be admitted before its deadline"""
+
+    def __init__(self, scope: str, retry_after: float):
+        self.scope = scope
+        self.retry_after = max(1, math.ceil(retry_after))
+        super().__init__(f"Too many AI requests ({scope} limit), retry after {self.retry_after}s")
+
+
+def estimate_tokens(*texts: Optional[str], max_tokens: int = 0) -> int:
+    """Rough token cost of a completion: ~4 characters per prompt token plus the output budget"""
+    return sum(len(text) for text in texts if text) // 4 + max_tokens
+
+
+class TokenBucket:
+    """Continuously refilling bucket; rate is units per second, capacity is the burst size"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.level = capacity
+        self.updated = time.monotonic()
+
+    def available(self, now: float) -> float:
+        """Level after refilling up to now, without changing the bucket"""
+        return min(self.capacity, self.level + (now - self.updated) * self.rate)
+
+    def _refill(self, now: float) -> None:
+        self.level = self.available(now)
+        self.updated = now
+
+    def delay(self, amount: float, now: float) -> float:
+        """Seconds until amount is available; amounts above capacity wait for a full bucket"""
+        self._refill(now)
+        needed = min(amount, self.capacity) - self.level
+        return max(0.0, needed / self.rate)
+
+    def take(self, amount: float, now: float) -> None:
+        self._refill(now)
+        # Oversized requests drain the bucket and may leave it in debt
+        self.level -= amount
+
+
+class _Entry:
+    def __init__(self, requests: Optional[TokenBucket], tokens: Optional[TokenBucket]):
+        self.requests = requests
+        self.tokens = tokens
+        self.lock: Optional[asyncio.Lock] = None
+        self.waiting = 0
+
+
+class RateLimiter:
+    """Request and token buckets per key (a user id or a provider name)
+
+    Callers for the same key are admitted strictly in arrival order: each one waits
+    behind earlier callers, then for its own refill, and is rejected up front when that
+    would run past its deadline. A limit of 0 disables that dimension.
+    """
+
+    def __init__(self, scope: str, requests_per_minute: int, tokens_per_minute: int, max_keys: int = 10000):
+        self.scope = scope
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_keys = max_keys
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self.admitted = 0
+        self.delayed = 0
+        self.rejected = 0
+        self.wait_seconds = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.requests_per_minute > 0 or self.tokens_per_minute > 0
+
+    def _entry(self, key: Hashable) -> _Entry:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            return entry
+
+        entry = _Entry(
+            TokenBucket(self.requests_per_minute / 60, self.requests_per_minute) if self.requests_per_minute > 0 else None,
+            TokenBucket(self.tokens_per_minute / 60, self.tokens_per_minute) if self.tokens_per_minute > 0 else None
+        )
+        self._entries[key] = entry
+        # Forget the least recently seen idle keys; their buckets would be full again anyway
+        for old_key in list(self._entries):
+            if len(self._entries) <= self.max_keys:
+                break
+            if self._entries[old_key].waiting == 0:
+                del self._entries[old_key]
+        return entry
+
+    @staticmethod
+    def _delay(entry: _Entry, requests: int, tokens: int, now: float) -> float:
+        delays = [0.0]
+        if entry.requests is not None:
+            delays.append(entry.requests.delay(requests, now))
+        if entry.tokens is not None:
+            delays.append(entry.tokens.delay(tokens, now))
+        return max(delays)
+
+    async def acquire(self, key: Hashable, tokens: int, max_wait: float, requests: int = 1) -> None:
+        """Admit requests costing tokens in total, waiting at most max_wait seconds or raising RateLimited"""
+        if not self.enabled:
+            return
+
+        entry = self._entry(key)
+        if entry.lock is None:
+            entry.lock = asyncio.Lock()
+        started = time.monotonic()
+        deadline = started + max_wait
+
+        # Fast path: nobody queued ahead and the buckets already cover the request. waiting counts
+        # callers from before they reach the lock, so a newcomer never overtakes one about to take it
+        if entry.waiting == 0 and self._delay(entry, requests, tokens, started) == 0:
+            self._take(entry, requests, tokens, started)
+            return
+
+        entry.waiting += 1
+        try:
+            try:
+                await asyncio.wait_for(entry.lock.acquire(), max(0.0, deadline - time.monotonic()))
+            except asyncio.TimeoutError:
+                self.rejected += 1
+                raise RateLimited(self.scope, max_wait or self._delay(entry, requests, tokens, time.monotonic()))
+
+            try:
+                now = time.monotonic()
+                delay = self._delay(entry, requests, tokens, now)
+                if now + delay > deadline:
+                    self.rejected += 1
+                    raise RateLimited(self.scope, delay)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                now = time.monotonic()
+                self._take(entry, requests, tokens, now)
+                self.delayed += 1
+                self.wait_seconds += now - started
+            finally:
+                entry.lock.release()
+        finally:
+            entry.waiting -= 1
+
+    def _take(self, entry: _Entry, requests: int, tokens: int, now: float) -> None:
+        if entry.requests is not None:
+            entry.requests.take(requests, now)
+        if entry.tokens is not None:
+            entry.tokens.take(tokens, now)
+        self.admitted += 1
+
+    def levels(self, key: Hashable) -> Dict[str, Any]:
+        """Current bucket levels for one key; a read only, so untracked keys stay untracked"""
+        entry = self._entries.get(key)
+        now = time.monotonic()
+        levels: Dict[str, Any] = {"waiting": entry.waiting if entry is not None else 0}
+        # An untracked key has full buckets, as it would on its first request
+        if self.requests_per_minute > 0:
+            levels["requests_available"] = round(entry.requests.available(now), 2) if entry is not None else self.requests_per_minute
+        if self.tokens_per_minute > 0:
+            levels["tokens_available"] = round(entry.tokens.available(now)) if entry is not None else self.tokens_per_minute
+        return levels
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests_per_minute": self.requests_per_minute,
+            "tokens_per_minute": self.tokens_per_minute,
+            "tracked_keys": len(self._entries),
+            "waiting": sum(entry.waiting for entry in self._entries.values()),
+            "admitted": self.admitted,
+            "delayed": self.delayed,
+            "rejected": self.rejected,
+            "avg_wait_seconds": self.wait_seconds / self.delayed if self.delayed else 0.0
+        }
+
+
+user_limiter = RateLimiter(
+    "user",
+    requests_per_minute=settings.AI_USER_REQUESTS_PER_MINUTE,
+    tokens_per_minute=settings.AI_USER_TOKENS_PER_MINUTE,
+    max_keys=settings.AI_RATE_LIMIT_MAX_USERS
+)
+provider_limiter = RateLimiter(
+    "provider",
+    requests_per_minute=settings.AI_PROVIDER_REQUESTS_PER_MINUTE,
+    tokens_per_minute=settings.AI_PROVIDER_TOKENS_PER_MINUTE
+)
+
+
+async def admit_user(user_id: int, tokens: int, requests: int = 1) -> None:
+    """Charge a user's AI budget for one or more requests before doing any AI work"""
+    await user_limiter.acquire(user_id, tokens, settings.AI_ADMISSION_MAX_WAIT_SECONDS, requests=requests)
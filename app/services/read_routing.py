@@ -0,0 +1,129 @@
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.database import read_engine
+from app.services.cache import TTLCache
+
+# Seconds the replica is behind; 0 while it has replayed everything it received
+POSTGRES_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class ReadRouter:
+    """Decides per request whether a read-only session may use the replica
+
+    Reads go to the primary when no replica is configured, when the replica is
+    unreachable or lagging more than max_lag, and for a short window after the
+    requesting user's own commit, so they always see their own writes. The window
+    is tracked per process; the lag bound still applies across processes.
+    """
+
+    def __init__(self, max_lag: float, check_interval: float, sticky_seconds: float, max_users: int = 100000):
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._recent_writers = TTLCache(maxsize=max_users, ttl=sticky_seconds)
+        self._lag: Optional[float] = None
+        self._checked_at = float("-inf")
+        self._lock: Optional[asyncio.Lock] = None
+        self.replica_reads = 0
+        self.sticky_reads = 0
+        self.lagging_reads = 0
+        self.probe_failures = 0
+
+    def note_write(self, user_id: int) -> None:
+        self._recent_writers.set(user_id, True)
+
+    def _probe(self) -> float:
+        with read_engine.connect() as connection:
+            if connection.dialect.name == "postgresql":
+                return float(connection.execute(POSTGRES_LAG_QUERY).scalar() or 0)
+            # No replication lag to measure (e.g. SQLite in development); just check it is up
+            connection.execute(text("SELECT 1"))
+            return 0.0
+
+    async def replica_lag(self) -> Optional[float]:
+        """Replica lag in seconds, re-measured at most every check_interval; None if unreachable"""
+        if time.monotonic() - self._checked_at < self.check_interval:
+            return self._lag
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if time.monotonic() - self._checked_at >= self.check_interval:
+                try:
+                    self._lag = await run_in_threadpool(self._probe)
+                except Exception as e:
+                    print(f"Error checking read replica lag: {str(e)}")
+                    self.probe_failures += 1
+                    self._lag = None
+                self._checked_at = time.monotonic()
+        return self._lag
+
+    async def use_replica(self, user_id: Optional[int]) -> bool:
+        if read_engine is None:
+            return False
+
+        if user_id is not None and self._recent_writers.get(user_id):
+            self.sticky_reads += 1
+            return False
+
+        lag = await self.replica_lag()
+        if lag is None or lag > self.max_lag:
+            self.lagging_reads += 1
+            return False
+
+        self.replica_reads += 1
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "replica_configured": read_engine is not None,
+            "replica_lag_seconds": self._lag,
+            "replica_reads": self.replica_reads,
+            "primary_reads_after_write": self.sticky_reads,
+            "primary_reads_replica_lagging": self.lagging_reads,
+            "probe_failures": self.probe_failures,
+            "sticky_users": len(self._recent_writers)
+        }
+
+
+read_router = ReadRouter(
+    max_lag=settings.DATABASE_READ_MAX_LAG_SECONDS,
+    check_interval=settings.DATABASE_READ_LAG_CHECK_SECONDS,
+    sticky_seconds=settings.DATABASE_READ_STICKY_SECONDS
+)
+
+
+# Request sessions carry the authenticated user's id (set by get_current_user), so
+# committing a change through one makes that user's next reads stick to the primary
+@event.listens_for(Session, "after_flush")
+def _collect_write(session: Session, flush_context) -> None:
+    if session.info.get("principal_id") is not None:
+        session.info["principal_wrote"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_write(orm_execute_state) -> None:
+    # INSERT/UPDATE/DELETE statements run through execute() never flush
+    state = orm_execute_state
+    if (state.is_insert or state.is_update or state.is_delete) and state.session.info.get("principal_id") is not None:
+        state.session.info["principal_wrote"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _stick_to_primary(session: Session) -> None:
+    if session.info.pop("principal_wrote", False):
+        read_router.note_write(session.info["principal_id"])
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_write(session: Session) -> None:
+    session.info.pop("principal_wrote", None)
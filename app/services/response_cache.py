@@ -0,0 +1,148 @@
+import asyncio
+import hashlib
+import json
+import time
+from typing import Any, Dict, Hashable, Optional, Set
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import select, union
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.config import settings
+from app.models.question import Question, QuestionCategory
+from app.services.cache import TTLCache
+
+# Clients must revalidate (If-None-Match) before reusing a response; they are per user
+CACHE_HEADERS = {"Cache-Control": "private, no-cache", "Vary": "Authorization"}
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison, as If-None-Match requires"""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in [tag[2:] if tag.startswith("W/") else tag for tag in tags]
+
+
+class CachedResponse:
+    """A serialized JSON body and its strong ETag"""
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+    def to_response(self, request: Request) -> Response:
+        headers = dict(CACHE_HEADERS, ETag=self.etag)
+        if etag_matches(request.headers.get("if-none-match"), self.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=self.body, media_type="application/json", headers=headers)
+
+
+class ResponseCache:
+    """Serialized GET responses keyed by URL and visibility scope
+
+    Invalidation is per process; the TTL bounds how long other processes can
+    serve a response from before a write.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def key(request: Request, scope: str) -> Hashable:
+        """Same path, query parameters (in any order) and scope share an entry"""
+        return (request.url.netloc, request.url.path, tuple(sorted(request.query_params.multi_items())), scope)
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        cached = self._cache.get(key)
+        if cached is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return cached
+
+    def set(self, key: Hashable, payload: Any) -> CachedResponse:
+        """Serialize payload the way FastAPI's JSONResponse does and store it"""
+        body = json.dumps(
+            jsonable_encoder(payload), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+        ).encode("utf-8")
+        cached = CachedResponse(body)
+        self._cache.set(key, cached)
+        return cached
+
+    def respond(self, cached: CachedResponse, request: Request) -> Response:
+        response = cached.to_response(request)
+        if response.status_code == 304:
+            self.not_modified += 1
+        return response
+
+    def clear(self) -> None:
+        self._cache.clear()
+        self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+            "invalidations": self.invalidations,
+            "entries": len(self._cache),
+            "hit_ratio": self.hits / lookups if lookups else 0.0
+        }
+
+
+class PersonalContentOwners:
+    """Ids of users who own personal question bank rows, reloaded at most every ttl seconds
+
+    Everyone else sees exactly the global bank, so their reads share one cache scope.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._owners: Set[int] = set()
+        self._loaded_at = float("-inf")
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def contains(self, db: Any, user_id: int) -> bool:
+        if time.monotonic() - self._loaded_at >= self.ttl:
+            if self._lock is None:
+                self._lock = asyncio.Lock()
+            async with self._lock:
+                if time.monotonic() - self._loaded_at >= self.ttl:
+                    rows = await db.scalars(union(
+                        select(Question.user_id).where(Question.user_id.isnot(None)),
+                        select(QuestionCategory.user_id).where(QuestionCategory.user_id.isnot(None))
+                    ))
+                    self._owners = set(rows.all())
+                    self._loaded_at = time.monotonic()
+        return user_id in self._owners
+
+    def add(self, user_id: int) -> None:
+        self._owners.add(user_id)
+
+
+catalog_cache = ResponseCache(
+    maxsize=settings.RESPONSE_CACHE_MAX_ENTRIES,
+    ttl=settings.RESPONSE_CACHE_TTL_SECONDS
+)
+personal_owners = PersonalContentOwners(ttl=settings.RESPONSE_CACHE_TTL_SECONDS)
+
+
+async def visibility_scope(db: Any, user_id: int, include_global: bool = True) -> str:
+    """Cache scope for question bank reads: "global" unless the result can include the user's own rows"""
+    if include_global and not await personal_owners.contains(db, user_id):
+        return "global"
+    return f"user:{user_id}"
+
+
+def invalidate_catalog(personal_owner_id: Optional[int] = None) -> None:
+    """Drop cached question bank responses after a category or question is created"""
+    if personal_owner_id is not None:
+        personal_owners.add(personal_owner_id)
+    catalog_cache.clear()
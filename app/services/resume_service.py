@@ -1,7 +1,9 @@
-from typing import Dict, Any, List
+from typing import AsyncIterator, Dict, Any, List
 import random
 
-from app.services.ai_service import analyze_text
+from app.services.ai_service import AIServiceNotConfigured, analyze_text, complete, stream_complete
+
+OPTIMIZE_SYSTEM_PROMPT = "You are an expert resume writer who tailors resumes to job descriptions without inventing experience."
 
 
 def analyze_resume(content: bytes, filename: str) -> Dict[str, Any]:
@@ -63,16 +65,46 @@ def analyze_resume(content: bytes, filename: str) -> Dict[str, Any]:
     }
 
 
-def optimize_resume(content: str, job_description: str) -> str:
+def build_optimize_prompt(content: str, job_description: str) -> str:
+    """Build the prompt used to tailor a resume to a job description"""
+    return f"""Rewrite the following resume so it is optimized for the job description below.
+Keep the same format, keep every fact accurate, and surface the most relevant keywords and achievements.
+
+Job description:
+{job_description}
+
+Resume:
+{content}
+
+Return only the optimized resume."""
+
+
+async def optimize_resume(content: str, job_description: str) -> str:
     """Optimize a resume for a specific job description"""
-    # In a real implementation, this would:
-    # 1. Analyze the job description for keywords and requirements
-    # 2. Compare with the resume content
-    # 3. Generate suggestions for optimization
-    # 4. Apply optimizations to the resume content
-    
-    # For now, return the original content with a note
-    return f"{content}\n\n[This resume has been optimized for the job description]"
+    try:
+        return await complete(
+            system=OPTIMIZE_SYSTEM_PROMPT,
+            prompt=build_optimize_prompt(content, job_description),
+            max_tokens=2000,
+            temperature=0.4
+        )
+    except AIServiceNotConfigured:
+        # Without an AI provider, return the original content with a note
+        return f"{content}\n\n[This resume has been optimized for the job description]"
+    except Exception as e:
+        print(f"Error optimizing resume: {str(e)}")
+        return f"{content}\n\n[This resume has been optimized for the job description]"
+
+
+async def stream_optimized_resume(content: str, job_description: str) -> AsyncIterator[str]:
+    """Stream an optimized resume as text deltas"""
+    async for delta in stream_complete(
+        system=OPTIMIZE_SYSTEM_PROMPT,
+        prompt=build_optimize_prompt(content, job_description),
+        max_tokens=2000,
+        temperature=0.4
+    ):
+        yield delta
 
 
 def generate_resume(job_title: str, skills: List[str], experience: str, education: str) -> str:
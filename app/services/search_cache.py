@@ -0,0 +1,89 @@
+import asyncio
+import dataclasses
+import time
+from typing import Any, Dict, Hashable, Set
+
+from app.config import settings
+from app.services.cache import TTLCache
+from app.services.job_sources import JobSearchParams, JobSource, SourceResult
+from app.services.singleflight import SingleFlight
+
+
+def source_cache_key(source: JobSource, params: JobSearchParams) -> Hashable:
+    """Searches a source answers identically share a key
+
+    Term order and case do not change what matches, and experience_level and
+    limit only apply when results are merged, so they are left out.
+    """
+    return (
+        source.name,
+        " ".join(sorted(set(params.terms))),
+        " ".join((params.location or "").lower().split()),
+        (params.job_type or "").lower(),
+        params.remote
+    )
+
+
+class SearchResultCache:
+    """Per-source job search results with stale-while-revalidate
+
+    Results younger than ttl are served as they are. Older ones, up to
+    ttl + stale_ttl, are served immediately while one background search
+    refreshes them. Only complete results are stored, so a source that timed
+    out is searched again next time without touching the other sources' entries.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, stale_ttl: float):
+        self.ttl = ttl
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl + stale_ttl)
+        self._flights = SingleFlight()
+        self._refreshes: Set["asyncio.Task[Any]"] = set()
+        self.fresh_hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    async def search(self, source: JobSource, params: JobSearchParams) -> SourceResult:
+        key = source_cache_key(source, params)
+        entry = self._cache.get(key)
+        if entry is None:
+            self.misses += 1
+            return await self._flights.do(key, lambda: self._fetch(key, source, params))
+
+        fetched_at, result = entry
+        if time.monotonic() - fetched_at < self.ttl:
+            self.fresh_hits += 1
+        else:
+            self.stale_hits += 1
+            refresh = asyncio.ensure_future(self._flights.do(key, lambda: self._fetch(key, source, params)))
+            # Keep a reference so the refresh is not garbage collected mid-flight
+            self._refreshes.add(refresh)
+            refresh.add_done_callback(self._refreshes.discard)
+        return dataclasses.replace(result, cached=True, seconds=0.0)
+
+    async def _fetch(self, key: Hashable, source: JobSource, params: JobSearchParams) -> SourceResult:
+        result = await source.search(params)
+        if result.status == "ok":
+            self._cache.set(key, (time.monotonic(), result))
+        return result
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.fresh_hits + self.stale_hits + self.misses
+        return {
+            "fresh_hits": self.fresh_hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "refreshing": len(self._refreshes),
+            "entries": len(self._cache),
+            "hit_ratio": (self.fresh_hits + self.stale_hits) / lookups if lookups else 0.0,
+            "singleflight": self._flights.stats()
+        }
+
+
+search_cache = SearchResultCache(
+    maxsize=settings.JOB_SEARCH_CACHE_MAX_ENTRIES,
+    ttl=settings.JOB_SEARCH_CACHE_TTL_SECONDS,
+    stale_ttl=settings.JOB_SEARCH_CACHE_STALE_SECONDS
+)
@@ -0,0 +1,240 @@
+import re
+import threading
+import time
+import zlib
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.question import Question, QuestionAnswer
+
+if TYPE_CHECKING:
+    import numpy
+
+# numpy, imported on first use so it stays off the application's import path
+np: Any = None
+
+TOKEN_RE = re.compile(r"[a-z0-9']+")
+
+STOPWORDS = frozenset("""
+a an the and or but if of to in on at for with about from by as is are was were be been being
+do does did can could would should will shall may might must i me my you your we our us it its
+this that these those what which who whom how why when where tell please describe give
+have has had say next want wanted interested handle handled handling deal dealt
+""".split())
+
+# Interview questions are asked in a handful of stock phrasings; these rewrites make the
+# common paraphrases tokenize alike (the first word of a synonym group is the canonical one)
+PHRASES = [
+    (re.compile(pattern), replacement) for pattern, replacement in (
+        (r"\b(walk|take|talk) (me|us) through\b", "tell me about"),
+        (r"\babout yourself\b", "about your background"),
+        (r"\bsee yourself\b", "career goals"),
+        (r"\b(a|an|one) (time|situation|occasion|instance|moment|example)\b", ""),
+        (r"\bfor (this|the) (role|job|position)\b", "")
+    )
+]
+SYNONYM_GROUPS = (
+    "greatest biggest largest main",
+    "weakness weaknesses shortcoming shortcomings",
+    "colleague colleagues coworker coworkers teammate teammates",
+    "conflict conflicts disagreement disagreements dispute disputes",
+    "company organization organisation firm here",
+    "job position role",
+    "hire choose pick select",
+    "expect expecting expected expectation expectations",
+    "work working",
+    "leave leaving quit quitting",
+    "goals goal plans plan"
+)
+SYNONYMS = {word: group.split()[0] for group in SYNONYM_GROUPS for word in group.split()}
+
+
+def _load_numpy() -> None:
+    global np
+    if np is None:
+        import numpy
+        np = numpy
+
+
+def _hash(feature: str) -> int:
+    # crc32 is stable across processes, unlike hash()
+    return zlib.crc32(feature.encode())
+
+
+class HashingVectorizer:
+    """Offline text embedding: signed feature hashing of word unigrams, bigrams and character trigrams"""
+
+    def __init__(self, n_features: int):
+        self.n_features = n_features
+
+    @staticmethod
+    def words(text: str) -> List[str]:
+        text = text.lower()
+        for pattern, replacement in PHRASES:
+            text = pattern.sub(replacement, text)
+        return [SYNONYMS.get(w, w) for w in TOKEN_RE.findall(text) if w not in STOPWORDS]
+
+    def features(self, text: str) -> List[Tuple[str, float]]:
+        words = self.words(text)
+        features = [(f"w:{w}", 1.0) for w in words]
+        features += [(f"b:{a}_{b}", 1.0) for a, b in zip(words, words[1:])]
+        # Character trigrams let morphological variants ("manage"/"managed") overlap
+        for w in words:
+            padded = f"<{w}>"
+            features += [(f"c:{padded[i:i + 3]}", 0.3) for i in range(len(padded) - 2)]
+        return features
+
+    def transform(self, text: str) -> Optional["numpy.ndarray"]:
+        """L2-normalized float32 vector for a text, or None if it has no usable tokens"""
+        _load_numpy()
+        vector = np.zeros(self.n_features, dtype=np.float32)
+        for feature, weight in self.features(text):
+            h = _hash(feature)
+            vector[h % self.n_features] += weight if (h >> 31) & 1 else -weight
+        norm = float(np.linalg.norm(vector))
+        if norm == 0.0:
+            return None
+        return vector / norm
+
+
+class SemanticIndex:
+    """Fixed-capacity cosine k-NN index over unit vectors with least-recently-used eviction
+
+    Entries carry a scope id (the normalized answer context) and only match
+    queries with the same scope.
+    """
+
+    def __init__(self, dim: int, capacity: int):
+        _load_numpy()
+        self.dim = dim
+        self.capacity = capacity
+        self.vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self.scopes = np.zeros(capacity, dtype=np.int64)
+        self.last_used = np.full(capacity, -np.inf)
+        self.payloads: List[Optional[Tuple[int, str]]] = [None] * capacity
+        self.size = 0
+        self.evictions = 0
+
+    def add(self, vector: "numpy.ndarray", scope: int, payload: Tuple[int, str]) -> None:
+        if self.size < self.capacity:
+            slot = self.size
+            self.size += 1
+        else:
+            slot = int(np.argmin(self.last_used))
+            self.evictions += 1
+        self.vectors[slot] = vector
+        self.scopes[slot] = scope
+        self.last_used[slot] = time.monotonic()
+        self.payloads[slot] = payload
+
+    def search(self, vector: "numpy.ndarray", scope: int, k: int = 1) -> List[Tuple[float, Tuple[int, str]]]:
+        """Top-k (similarity, payload) pairs within a scope, best first"""
+        if self.size == 0:
+            return []
+        scores = self.vectors[:self.size] @ vector
+        scores[self.scopes[:self.size] != scope] = -np.inf
+        k = min(k, self.size)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        results = []
+        for slot in top:
+            if np.isfinite(scores[slot]):
+                self.last_used[slot] = time.monotonic()
+                results.append((float(scores[slot]), self.payloads[slot]))
+        return results
+
+    def clear(self) -> None:
+        self.size = 0
+        self.last_used[:] = -np.inf
+        self.payloads = [None] * self.capacity
+
+
+class SemanticAnswerCache:
+    """Near-duplicate question cache: reuses an answer when a differently phrased question is similar enough"""
+
+    def __init__(self, dim: int, capacity: int, threshold: float):
+        self.vectorizer = HashingVectorizer(dim)
+        self.dim = dim
+        self.capacity = capacity
+        self._index: Optional[SemanticIndex] = None
+        self.threshold = threshold
+        self.hits = 0
+        self.misses = 0
+        # Lookups can come from threadpool workers as well as the event loop
+        self._lock = threading.Lock()
+
+    @property
+    def index(self) -> SemanticIndex:
+        # The matrix is allocated on first use, not at import
+        if self._index is None:
+            self._index = SemanticIndex(self.dim, self.capacity)
+        return self._index
+
+    @staticmethod
+    def scope_id(scope: str) -> int:
+        return _hash(scope)
+
+    def lookup(self, question_text: str, scope: str) -> Optional[str]:
+        vector = self.vectorizer.transform(question_text)
+        if vector is None:
+            self.misses += 1
+            return None
+
+        with self._lock:
+            results = self.index.search(vector, self.scope_id(scope), k=1)
+        if results and results[0][0] >= self.threshold:
+            self.hits += 1
+            return results[0][1][1]
+
+        self.misses += 1
+        return None
+
+    def add(self, question_id: int, question_text: str, scope: str, answer_text: str) -> None:
+        vector = self.vectorizer.transform(question_text)
+        if vector is not None:
+            with self._lock:
+                self.index.add(vector, self.scope_id(scope), (question_id, answer_text))
+
+    def rebuild(self, db: Session, scope_of) -> int:
+        """Reload the index from the newest AI-generated answers in question_answers
+
+        scope_of maps a QuestionAnswer row and the owner of its question, if personal,
+        to the scope string used by lookups.
+        """
+        with self._lock:
+            if self._index is not None:
+                self._index.clear()
+        rows = db.query(QuestionAnswer, Question.text, Question.is_personal, Question.user_id).join(
+            Question, Question.id == QuestionAnswer.question_id
+        ).filter(
+            QuestionAnswer.is_ai_generated == True
+        ).order_by(QuestionAnswer.created_at.desc()).limit(self.capacity).yield_per(1000)
+
+        loaded = 0
+        # Insert oldest first so the newest answers are the most recently used
+        for answer, question_text, is_personal, owner_id in reversed(list(rows)):
+            scope = scope_of(answer, owner_id if is_personal else None)
+            self.add(answer.question_id, question_text, scope, answer.answer_text)
+            loaded += 1
+        return loaded
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": self._index.size if self._index else 0,
+            "capacity": self.capacity,
+            "evictions": self._index.evictions if self._index else 0,
+            "threshold": self.threshold,
+            "hit_ratio": self.hits / lookups if lookups else 0.0
+        }
+
+
+semantic_cache = SemanticAnswerCache(
+    dim=settings.SEMANTIC_CACHE_DIM,
+    capacity=settings.SEMANTIC_CACHE_MAX_ENTRIES,
+    threshold=settings.SEMANTIC_CACHE_THRESHOLD
+)
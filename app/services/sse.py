@@ -0,0 +1,24 @@
+import json
+from typing import Any, AsyncIterator, Dict, Optional
+
+from fastapi.responses import StreamingResponse
+
+
+def _json_default(value: Any) -> Any:
+    # Datetimes and similar values from ORM-backed payloads
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+def format_sse(data: Dict[str, Any], event: Optional[str] = None) -> str:
+    """Format a JSON payload as a single Server-Sent Events frame"""
+    frame = f"event: {event}\n" if event else ""
+    return frame + f"data: {json.dumps(data, default=_json_default)}\n\n"
+
+
+def sse_response(frames: AsyncIterator[str]) -> StreamingResponse:
+    """Wrap pre-formatted SSE frames in an unbuffered streaming response"""
+    return StreamingResponse(
+        frames,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,103 @@
+"""Login throughput benchmark: bcrypt on the event loop vs the password hashing pool
+
+Runs concurrent POST /auth/token requests against the app in-process (SQLite,
+no network) while a probe hits /health, and reports login throughput and the
+latency other requests see while logins are in progress.
+
+    python benchmarks/bench_login.py --logins 32 --concurrency 16
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench_login.db")
+
+import httpx  # noqa: E402
+
+from app.api import auth  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.database import Base, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.auth_service import verify_password  # noqa: E402
+
+EMAIL = "bench-login@example.com"
+PASSWORD = "correct horse battery staple"
+
+pooled_check_password = auth.check_password
+
+
+async def inline_check_password(plain_password: str, hashed_password: str) -> bool:
+    """The previous behaviour: bcrypt runs directly on the event loop"""
+    return verify_password(plain_password, hashed_password)
+
+
+async def run(mode: str, logins: int, concurrency: int) -> dict:
+    auth.check_password = inline_check_password if mode == "inline" else pooled_check_password
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        semaphore = asyncio.Semaphore(concurrency)
+        probe_latencies = []
+        done = asyncio.Event()
+
+        async def login() -> None:
+            async with semaphore:
+                response = await client.post(
+                    f"{settings.API_PREFIX}/auth/token",
+                    data={"username": EMAIL, "password": PASSWORD}
+                )
+                response.raise_for_status()
+
+        async def probe() -> None:
+            # Latency counts from when the probe was due, so time spent stuck behind bcrypt shows up
+            while not done.is_set():
+                due = time.perf_counter() + 0.01
+                await asyncio.sleep(0.01)
+                await client.get("/health")
+                probe_latencies.append(time.perf_counter() - due)
+
+        probe_task = asyncio.ensure_future(probe())
+        started = time.perf_counter()
+        await asyncio.gather(*(login() for _ in range(logins)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await probe_task
+
+    probe_latencies.sort()
+    return {
+        "mode": mode,
+        "logins_per_second": logins / elapsed,
+        "health_p50_ms": statistics.median(probe_latencies) * 1000,
+        "health_max_ms": probe_latencies[-1] * 1000,
+        "health_probes": len(probe_latencies)
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=32)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    # The app's lifespan does not run here, so create the schema directly
+    Base.metadata.create_all(bind=engine)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.post(f"{settings.API_PREFIX}/auth/register", json={"email": EMAIL, "password": PASSWORD})
+
+    print(f"{settings.PASSWORD_HASH_WORKERS} hashing workers, {os.cpu_count()} CPUs, "
+          f"{args.logins} logins at concurrency {args.concurrency}")
+    print(f"{'mode':<8} {'logins/s':>9} {'health p50 ms':>14} {'health max ms':>14} {'probes':>7}")
+    for mode in ("inline", "pool"):
+        result = await run(mode, args.logins, args.concurrency)
+        print(f"{result['mode']:<8} {result['logins_per_second']:>9.2f} {result['health_p50_ms']:>14.1f} "
+              f"{result['health_max_ms']:>14.1f} {result['health_probes']:>7}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,125 @@
+"""Resume to job posting matching benchmark: BM25 top-k over the in-memory inverted index
+
+Fills a MatchIndex with --postings synthetic postings (Zipf-distributed words,
+so common terms have long postings lists, as in real text) and times top-k
+queries for resume-sized texts. For comparison, the same BM25 is scored the
+naive way, tokenizing and scanning every posting per request, on a subset
+and extrapolated. No database is involved.
+
+    python benchmarks/bench_match.py --postings 500000 --queries 200
+"""
+import argparse
+import math
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Importing the app configures a database engine, though nothing here queries it
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench_match.db")
+
+from app.config import settings  # noqa: E402
+from app.services.match_index import MatchIndex, tokenize  # noqa: E402
+
+SKILLS = (
+    "python go java rust c++ c# sql kubernetes terraform react spark kafka postgres redis aws gcp azure "
+    "docker django fastapi flask node.js typescript graphql grpc airflow dbt snowflake pytorch tensorflow"
+).split()
+
+
+def make_vocabulary(size: int) -> list:
+    return SKILLS + [f"w{i}" for i in range(size - len(SKILLS))]
+
+
+def make_text(rng: random.Random, vocabulary: list, weights: list, words: int) -> str:
+    return " ".join(rng.choices(vocabulary, cum_weights=weights, k=words))
+
+
+def naive_top_k(documents: list, query: str, k: int, k1: float, b: float) -> list:
+    """BM25 the obvious way: every request tokenizes and scores every posting"""
+    counted = [Counter(tokenize(text)) for text in documents]
+    average = sum(sum(counts.values()) for counts in counted) / len(counted)
+    df = Counter(term for counts in counted for term in counts)
+    terms = set(tokenize(query))
+    scores = []
+    for position, counts in enumerate(counted):
+        length = sum(counts.values())
+        score = 0.0
+        for term in terms & counts.keys():
+            idf = math.log(1.0 + (len(counted) - df[term] + 0.5) / (df[term] + 0.5))
+            score += idf * counts[term] * (k1 + 1.0) / (counts[term] + k1 * (1.0 - b + b * length / average))
+        scores.append((score, position))
+    return sorted(scores, reverse=True)[:k]
+
+
+def percentile(samples: list, fraction: float) -> float:
+    return sorted(samples)[min(len(samples) - 1, int(fraction * len(samples)))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--postings", type=int, default=500000)
+    parser.add_argument("--words", type=int, default=80, help="words per posting")
+    parser.add_argument("--vocabulary", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--query-words", type=int, default=400, help="words per resume")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--naive-postings", type=int, default=20000, help="subset scored the naive way")
+    args = parser.parse_args()
+
+    rng = random.Random(25)
+    vocabulary = make_vocabulary(args.vocabulary)
+    weights, total = [], 0.0
+    for rank in range(len(vocabulary)):
+        total += 1.0 / (rank + 1)
+        weights.append(total)
+
+    index = MatchIndex(k1=settings.MATCH_BM25_K1, b=settings.MATCH_BM25_B, max_query_terms=settings.MATCH_MAX_QUERY_TERMS)
+    naive_documents = []
+    started = time.perf_counter()
+    for posting_id in range(1, args.postings + 1):
+        text = make_text(rng, vocabulary, weights, args.words)
+        index.add(posting_id, text)
+        if posting_id <= args.naive_postings:
+            naive_documents.append(text)
+    build = time.perf_counter() - started
+    stats = index.stats()
+    print(f"indexed {stats['postings']} postings in {build:.1f} s "
+          f"({stats['terms']} terms, {stats['list_entries']} list entries, "
+          f"~{stats['list_entries'] * 6 / 2 ** 20:.0f} MiB of postings lists)")
+
+    resumes = [make_text(rng, vocabulary, weights, args.query_words) for _ in range(args.queries)]
+    index.top_k(resumes[0], args.limit)  # loads numpy and builds the length norms
+    timings = []
+    for resume in resumes:
+        started = time.perf_counter()
+        index.top_k(resume, args.limit)
+        timings.append(time.perf_counter() - started)
+    print(f"index top-{args.limit}: p50 {statistics.median(timings) * 1000:.1f} ms, "
+          f"p95 {percentile(timings, 0.95) * 1000:.1f} ms, max {max(timings) * 1000:.1f} ms")
+
+    started = time.perf_counter()
+    naive_top_k(naive_documents, resumes[0], args.limit, settings.MATCH_BM25_K1, settings.MATCH_BM25_B)
+    naive = time.perf_counter() - started
+    extrapolated = naive * args.postings / len(naive_documents)
+    print(f"naive scan of {len(naive_documents)} postings: {naive * 1000:.0f} ms per request, "
+          f"~{extrapolated:.1f} s extrapolated to {args.postings} ({extrapolated / statistics.median(timings):.0f}x)")
+
+    # An update retires the old slot; the query cost with a quarter of the slots retired
+    for posting_id in rng.sample(range(1, args.postings + 1), args.postings // 4):
+        index.add(posting_id, make_text(rng, vocabulary, weights, args.words))
+    timings = []
+    for resume in resumes:
+        started = time.perf_counter()
+        index.top_k(resume, args.limit)
+        timings.append(time.perf_counter() - started)
+    print(f"after updating 25% of postings (before compaction): p50 {statistics.median(timings) * 1000:.1f} ms, "
+          f"p95 {percentile(timings, 0.95) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Job posting import benchmark: one POST /postings per row vs POST /postings:bulk
+
+Runs the app in-process against SQLite (no network). The per-row endpoint is
+timed on a sample and extrapolated; the bulk endpoint imports --rows new
+postings and then re-imports them all, which turns every row into an update.
+One posting in ten is a lightly edited copy of another, for duplicate detection.
+
+    python benchmarks/bench_postings_bulk.py --rows 10000 --single-rows 500
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench_postings_bulk.db")
+
+import httpx  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.database import Base, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.db_metrics import db_metrics  # noqa: E402
+
+EMAIL = "bench-postings@example.com"
+PASSWORD = "correct horse battery staple"
+POSTINGS = f"{settings.API_PREFIX}/applications/postings"
+
+
+WORDS = (
+    "build operate scale design review ship own improve mentor debug measure automate migrate secure test "
+    "services pipelines dashboards models apis platforms teams customers systems infrastructure features data "
+    "python go sql kubernetes terraform react spark kafka postgres redis aws gcp latency reliability cost"
+).split()
+
+
+def make_postings(prefix: str, count: int, duplicate_every: int = 10) -> list:
+    """Postings with distinct descriptions; every duplicate_every-th is a lightly edited cross-post of an earlier one"""
+    rng = random.Random(prefix)
+    postings = []
+    for i in range(count):
+        if i and i % duplicate_every == 0:
+            original = postings[rng.randrange(i)]
+            words = original["description"].split()
+            words[rng.randrange(len(words))] = rng.choice(WORDS)
+            posting = dict(original, description=" ".join(words) + " Apply today.", source="bench-mirror")
+        else:
+            posting = {
+                "title": f"Software Engineer {i}",
+                "company": f"Company {i % 97}",
+                "location": "Remote",
+                "description": " ".join(rng.choice(WORDS) for _ in range(60)),
+                "salary_range": "$120K - $160K",
+                "job_type": "Full-time",
+                "remote": True,
+                "url": f"https://example.com/jobs/{prefix}-{i}",
+                "source": "bench"
+            }
+        postings.append(dict(posting, external_id=f"{prefix}-{i}"))
+    return postings
+
+
+async def timed(label: str, rows: int, request) -> dict:
+    queries = db_metrics.queries.count
+    started = time.perf_counter()
+    await request()
+    elapsed = time.perf_counter() - started
+    return {
+        "mode": label,
+        "rows": rows,
+        "seconds": elapsed,
+        "rows_per_second": rows / elapsed,
+        "statements": db_metrics.queries.count - queries
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--single-rows", type=int, default=500, help="rows to save one request at a time")
+    args = parser.parse_args()
+
+    # The app's lifespan does not run here, so create the schema directly
+    Base.metadata.create_all(bind=engine)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        await client.post(f"{settings.API_PREFIX}/auth/register", json={"email": EMAIL, "password": PASSWORD})
+        token = (await client.post(
+            f"{settings.API_PREFIX}/auth/token",
+            data={"username": EMAIL, "password": PASSWORD}
+        )).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        async def save_one_by_one() -> None:
+            for posting in make_postings("single", args.single_rows):
+                (await client.post(POSTINGS, json=posting, headers=headers)).raise_for_status()
+
+        async def bulk(postings: list, expect: str) -> None:
+            response = await client.post(f"{POSTINGS}:bulk", json=postings, headers=headers)
+            response.raise_for_status()
+            assert len(response.json()[expect]) == len(postings), response.json()
+
+        postings = make_postings("bulk", args.rows)
+        results = [
+            await timed("per-row", args.single_rows, save_one_by_one),
+            await timed("bulk insert", args.rows, lambda: bulk(postings, "inserted")),
+            await timed("bulk update", args.rows, lambda: bulk(postings, "updated"))
+        ]
+
+    print(f"{'mode':<12} {'rows':>7} {'seconds':>9} {'rows/s':>10} {'statements':>11}")
+    for result in results:
+        print(f"{result['mode']:<12} {result['rows']:>7} {result['seconds']:>9.2f} "
+              f"{result['rows_per_second']:>10.0f} {result['statements']:>11}")
+    per_row = results[0]["seconds"] / results[0]["rows"]
+    print(f"\nper-row endpoint extrapolated to {args.rows} rows: {per_row * args.rows:.1f} s "
+          f"({per_row * args.rows / results[1]['seconds']:.0f}x the bulk insert)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
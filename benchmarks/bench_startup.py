@@ -0,0 +1,106 @@
+"""Cold start benchmark: time from a fresh interpreter to the first served request
+
+Each run starts a new Python process against a migrated SQLite database and
+measures importing app.main, running the lifespan startup and answering GET
+/health. The slowest imports come from python -X importtime.
+
+    python benchmarks/bench_startup.py --runs 5 --importtime 15
+    python benchmarks/bench_startup.py --max-ms 1500   # exit 1 above budget (CI)
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The test client is imported before the clock starts; it is not part of the app
+CHILD = """
+import json, time
+from fastapi.testclient import TestClient
+started = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+with TestClient(app) as client:
+    ready = time.perf_counter()
+    client.get("/health").raise_for_status()
+    served = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "lifespan_ms": (ready - imported) * 1000,
+    "first_request_ms": (served - started) * 1000
+}))
+"""
+
+SCHEMA = """
+from app.database import Base, engine
+from app.models import application, interview, job, question, resume, user
+Base.metadata.create_all(bind=engine)
+"""
+
+
+def run_python(code: str, env: dict, *flags: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+
+
+def import_profile(env: dict, top: int) -> list:
+    """(cumulative ms, self ms, package) for the slowest top-level packages imported by app.main"""
+    stderr = run_python("import app.main", env, "-X", "importtime").stderr
+    entries = []
+    for line in stderr.splitlines():
+        fields = line[len("import time:"):].split("|")
+        if not line.startswith("import time:") or len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        self_us, cumulative_us, name = fields
+        # A package's first import covers its submodules, wherever in the tree it happened
+        if "." not in name.strip() or name.strip() == "app.main":
+            entries.append((int(cumulative_us) / 1000, int(self_us) / 1000, name.strip()))
+    return sorted(entries, reverse=True)[:top]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--importtime", type=int, default=15, metavar="N", help="show the N slowest imports (0 to skip)")
+    parser.add_argument("--max-ms", type=float, default=None, help="fail if the median time to first request exceeds this")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench_startup.db"
+    env["DATABASE_CREATE_TABLES"] = "false"
+    env["PYTHONPATH"] = ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    run_python(SCHEMA, env)
+
+    results = []
+    for _ in range(args.runs):
+        started = time.perf_counter()
+        output = run_python(CHILD, env).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        result["process_ms"] = (time.perf_counter() - started) * 1000
+        results.append(result)
+
+    print(f"{args.runs} cold starts (median / max ms)")
+    for key in ("import_ms", "lifespan_ms", "first_request_ms", "process_ms"):
+        values = [result[key] for result in results]
+        print(f"  {key:<18} {statistics.median(values):>8.1f} {max(values):>8.1f}")
+
+    if args.importtime:
+        print("\nslowest imports (cumulative / self ms)")
+        for cumulative, self_ms, name in import_profile(env, args.importtime):
+            print(f"  {cumulative:>8.1f} {self_ms:>8.1f}  {name}")
+
+    median_first_request = statistics.median(result["first_request_ms"] for result in results)
+    if args.max_ms is not None and median_first_request > args.max_ms:
+        print(f"\nFAIL: median time to first request {median_first_request:.1f} ms exceeds {args.max_ms:.1f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -55,6 +55,10 @@ api.interceptors.response.use(
   }
 );
 
+// List endpoints return a page: { items, next_cursor, prev_cursor, next, prev }.
+// Pass { cursor: page.next_cursor, limit } to fetch the following page.
+export const pageParams = ({ cursor, limit } = {}) => ({ cursor, limit });
+
 // Auth API
 export const authAPI = {
   register: (userData) => api.post('/auth/register', userData),
@@ -67,7 +71,7 @@ export const authAPI = {
 // Interview API
 export const interviewAPI = {
   createInterview: (interviewData) => api.post('/interviews', interviewData),
-  getInterviews: () => api.get('/interviews'),
+  getInterviews: (page) => api.get('/interviews', { params: pageParams(page) }),
   getInterview: (id) => api.get(`/interviews/${id}`),
   createSession: (interviewId, sessionData) => api.post(`/interviews/${interviewId}/sessions`, sessionData),
   getSessions: (interviewId) => api.get(`/interviews/${interviewId}/sessions`),
@@ -602,7 +606,7 @@ function generateRoleSpecificQuestions(jobTitle, requirements) {
 // Resume API
 export const resumeAPI = {
   createResume: (resumeData) => api.post('/resumes', resumeData),
-  getResumes: () => api.get('/resumes'),
+  getResumes: (page) => api.get('/resumes', { params: pageParams(page) }),
   getResume: (id) => api.get(`/resumes/${id}`),
   createVersion: (resumeId, versionData) => api.post(`/resumes/${resumeId}/versions`, versionData),
   getVersions: (resumeId) => api.get(`/resumes/${resumeId}/versions`),
@@ -633,9 +637,9 @@ export const questionAPI = {
 export const jobAPI = {
   searchJobs: (searchQuery) => api.post('/applications/search', searchQuery),
   saveJobPosting: (postingData) => api.post('/applications/postings', postingData),
-  getJobPostings: () => api.get('/applications/postings'),
+  getJobPostings: (page) => api.get('/applications/postings', { params: pageParams(page) }),
   applyToJob: (applicationData) => api.post('/applications/apply', applicationData),
-  getApplications: (status) => api.get('/applications/applications', { params: { status } }),
+  getApplications: (status, page) => api.get('/applications/applications', { params: { status, ...pageParams(page) } }),
   updateApplicationStatus: (applicationId, status) => api.put(`/applications/applications/${applicationId}/status`, { status }),
 };
 
@@ -0,0 +1,51 @@
+"""hot path indexes
+
+Indexes for the filters the routers run on every request. On PostgreSQL they are
+built CONCURRENTLY (outside the migration transaction) so existing tables stay
+writable while they build. The unique indexes fail if duplicate saved postings
+or applications already exist; remove those first.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ACTIVE_EXTERNAL_ID = sa.text('external_id IS NOT NULL')
+
+# (name, table, columns, unique, extra dialect options)
+INDEXES = [
+    ('ix_job_postings_source_external_id', 'job_postings', ['source', 'external_id'], True,
+     {'postgresql_where': ACTIVE_EXTERNAL_ID, 'sqlite_where': ACTIVE_EXTERNAL_ID}),
+    ('ix_job_applications_user_id_job_posting_id', 'job_applications', ['user_id', 'job_posting_id'], True, {}),
+    ('ix_job_applications_user_id_status', 'job_applications', ['user_id', 'status'], False, {}),
+    ('ix_interviews_user_id', 'interviews', ['user_id'], False, {}),
+    ('ix_interview_sessions_interview_id', 'interview_sessions', ['interview_id'], False, {}),
+    ('ix_resume_versions_resume_id_is_active', 'resume_versions', ['resume_id', 'is_active'], False, {}),
+    ('ix_questions_category_id_is_personal_user_id', 'questions', ['category_id', 'is_personal', 'user_id'], False, {}),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns, unique, options in INDEXES:
+            op.create_index(name, table, columns, unique=unique, postgresql_concurrently=True, **options)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
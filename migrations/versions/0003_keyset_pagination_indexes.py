@@ -0,0 +1,46 @@
+"""keyset pagination indexes
+
+List endpoints page by (created_at, id), newest first, within the caller's rows.
+These indexes let each page be a single range scan. Built concurrently on
+PostgreSQL, as in 0002.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-16 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns)
+INDEXES = [
+    ('ix_job_postings_created_at_id', 'job_postings', ['created_at', 'id']),
+    ('ix_job_applications_user_id_applied_at_id', 'job_applications', ['user_id', 'applied_at', 'id']),
+    ('ix_questions_created_at_id', 'questions', ['created_at', 'id']),
+    ('ix_interviews_user_id_created_at_id', 'interviews', ['user_id', 'created_at', 'id']),
+    ('ix_resumes_user_id_created_at_id', 'resumes', ['user_id', 'created_at', 'id']),
+    ('ix_users_created_at_id', 'users', ['created_at', 'id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,56 @@
+"""job posting near-duplicate detection
+
+Adds the MinHash signature and canonical posting link to job_postings, and
+job_posting_bands, the LSH band buckets duplicate candidates are looked up
+by. Existing postings are indexed afterwards with
+
+    python -m app.services.posting_dedupe
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('job_postings') as batch_op:
+        batch_op.add_column(sa.Column('minhash', sa.LargeBinary(), nullable=True))
+        batch_op.add_column(sa.Column('canonical_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key(
+            'fk_job_postings_canonical_id_job_postings', 'job_postings', ['canonical_id'], ['id']
+        )
+    op.create_table('job_posting_bands',
+    sa.Column('band', sa.SmallInteger(), nullable=False),
+    sa.Column('bucket', sa.BigInteger(), nullable=False),
+    sa.Column('posting_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['posting_id'], ['job_postings.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('band', 'bucket', 'posting_id')
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f('ix_job_postings_canonical_id'), 'job_postings', ['canonical_id'], postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(op.f('ix_job_postings_canonical_id'), table_name='job_postings', postgresql_concurrently=True)
+    op.drop_table('job_posting_bands')
+    with op.batch_alter_table('job_postings') as batch_op:
+        batch_op.drop_constraint('fk_job_postings_canonical_id_job_postings', type_='foreignkey')
+        batch_op.drop_column('canonical_id')
+        batch_op.drop_column('minhash')
@@ -0,0 +1,38 @@
+"""interview generation job
+
+Adds interviews.generation_job_id, the background job generating an
+interview's questions, so the interview keeps pointing at the job to poll
+after the 202 response to its creation.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, Sequence[str], None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('interviews') as batch_op:
+        batch_op.add_column(sa.Column('generation_job_id', sa.String(length=32), nullable=True))
+        batch_op.create_foreign_key(
+            'fk_interviews_generation_job_id', 'background_jobs', ['generation_job_id'], ['id']
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('interviews') as batch_op:
+        batch_op.drop_constraint('fk_interviews_generation_job_id', type_='foreignkey')
+        batch_op.drop_column('generation_job_id')
@@ -0,0 +1,34 @@
+"""background job lease
+
+Adds background_jobs.lease_expires_at. A worker renews the lease of the job it
+is running, and start() only requeues running jobs whose lease has expired,
+so jobs held by another live process are left alone.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, Sequence[str], None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('background_jobs') as batch_op:
+        batch_op.add_column(sa.Column('lease_expires_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('background_jobs') as batch_op:
+        batch_op.drop_column('lease_expires_at')
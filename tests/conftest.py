@@ -0,0 +1,42 @@
+"""Shared fixtures: the app runs against a throwaway SQLite database and fake AI providers"""
+import os
+import tempfile
+import uuid
+
+# Set before the app is imported, since settings and engines are read at import time
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/test.db"
+os.environ["DATABASE_CREATE_TABLES"] = "true"
+os.environ.setdefault("AI_FAKE_PROVIDERS", "fast:0:0")
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.database import SessionLocal  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+API = settings.API_PREFIX
+PASSWORD = "Passw0rd!x"
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def make_user(client):
+    """Register a fresh user and return its auth headers"""
+    def make(admin: bool = False) -> dict:
+        email = f"{uuid.uuid4().hex[:12]}@example.com"
+        response = client.post(f"{API}/auth/register", json={"email": email, "password": PASSWORD})
+        assert response.status_code == 200, response.text
+        if admin:
+            with SessionLocal() as db:
+                db.query(User).filter(User.email == email).update({"is_admin": True})
+                db.commit()
+        token = client.post(f"{API}/auth/token", data={"username": email, "password": PASSWORD}).json()["access_token"]
+        return {"Authorization": f"Bearer {token}"}
+    return make
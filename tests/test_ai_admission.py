@@ -0,0 +1,82 @@
+import asyncio
+import json
+
+import pytest
+
+from app.config import settings
+from app.services import rate_limiter
+from app.services.rate_limiter import RateLimiter
+from tests.conftest import API
+from tests.test_questions import create_personal_question
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    """A two-request user budget that rejects instead of waiting"""
+    small = RateLimiter("user", requests_per_minute=2, tokens_per_minute=0)
+    monkeypatch.setattr(rate_limiter, "user_limiter", small)
+    monkeypatch.setattr(settings, "AI_ADMISSION_MAX_WAIT_SECONDS", 0.0)
+    return small
+
+
+def test_cached_answers_are_not_charged(client, make_user, limiter):
+    headers = make_user()
+    question_id = create_personal_question(client, headers, "What motivates you at work?")
+
+    assert client.post(f"{API}/questions/{question_id}/answer", json={}, headers=headers).json()["cached"] is False
+    refreshed = client.post(f"{API}/questions/{question_id}/answer?refresh=true", json={}, headers=headers)
+    assert refreshed.json()["cached"] is False
+
+    # The budget is spent, but cache hits still go through
+    response = client.post(f"{API}/questions/{question_id}/answer", json={}, headers=headers)
+    assert response.status_code == 200 and response.json()["cached"] is True
+    stream = client.get(f"{API}/questions/{question_id}/answer/stream", headers=headers)
+    assert stream.status_code == 200 and '"cached": true' in stream.text
+    assert client.post(f"{API}/questions/{question_id}/answer?refresh=true", json={}, headers=headers).status_code == 429
+
+
+def test_batch_charges_misses_without_overdrawing(client, make_user, limiter):
+    headers = make_user()
+    user_id = client.get(f"{API}/users/me", headers=headers).json()["id"]
+    question_ids = [create_personal_question(client, headers, f"Explain design decision {i}") for i in range(3)]
+
+    response = client.post(f"{API}/questions/answers:batch", json={"question_ids": question_ids}, headers=headers)
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert sum("answer" in result for result in results) == 2
+    assert [result["retry_after"] for result in results if "error" in result] == [pytest.approx(30, abs=1)]
+    assert limiter.levels(user_id)["requests_available"] >= 0
+
+    # Answered questions come from the cache without touching the empty budget
+    response = client.post(f"{API}/questions/answers:batch", json={"question_ids": question_ids}, headers=headers)
+    assert response.status_code == 200
+    assert response.text.count('"cached": true') == 2
+
+
+def test_newcomer_does_not_overtake_a_queued_caller():
+    limiter = RateLimiter("user", requests_per_minute=0, tokens_per_minute=3600)
+    admitted = []
+
+    async def call(name, tokens):
+        await limiter.acquire("key", tokens, max_wait=5)
+        admitted.append(name)
+
+    async def run():
+        await limiter.acquire("key", 3595, max_wait=0)
+        # The first caller has to wait for a refill; the second would fit in the bucket right away
+        await asyncio.gather(call("first", 6), call("second", 5))
+
+    asyncio.run(run())
+    assert admitted == ["first", "second"]
+
+
+def test_levels_neither_tracks_nor_evicts_keys():
+    limiter = RateLimiter("user", requests_per_minute=2, tokens_per_minute=600, max_keys=1)
+    asyncio.run(limiter.acquire("tracked", 100, max_wait=0))
+    bucket = limiter._entries["tracked"].tokens
+    level, updated = bucket.level, bucket.updated
+
+    assert limiter.levels("untracked") == {"waiting": 0, "requests_available": 2, "tokens_available": 600}
+    assert list(limiter._entries) == ["tracked"]
+    assert limiter.levels("tracked")["tokens_available"] >= 500
+    assert limiter._entries["tracked"].tokens is bucket
+    assert (bucket.level, bucket.updated) == (level, updated)
@@ -0,0 +1,67 @@
+import asyncio
+
+from app.database import SessionLocal
+from app.models.question import QuestionAnswer
+from app.schemas.question import QuestionAnswerCreate
+from app.services import answer_cache as answer_cache_module
+from app.services.answer_cache import generate_answer_batch
+from tests.conftest import API
+from tests.test_questions import create_personal_question
+
+
+def saved_answers(question_ids):
+    with SessionLocal() as db:
+        return {
+            row.question_id: row.answer_text
+            for row in db.query(QuestionAnswer).filter(QuestionAnswer.question_id.in_(question_ids))
+        }
+
+
+def test_batch_streams_every_answer_and_saves_them(client, make_user):
+    headers = make_user()
+    question_ids = [create_personal_question(client, headers, f"Describe project number {i}") for i in range(3)]
+
+    response = client.post(f"{API}/questions/answers:batch", json={"question_ids": question_ids}, headers=headers)
+    assert response.status_code == 200
+    assert sorted(line.count("question_id") for line in response.text.splitlines()) == [1, 1, 1]
+    assert set(saved_answers(question_ids)) == set(question_ids)
+
+    # A second batch is served from the cache
+    response = client.post(f"{API}/questions/answers:batch", json={"question_ids": question_ids}, headers=headers)
+    assert response.text.count('"cached": true') == 3
+
+
+def test_batch_saves_finished_answers_when_the_client_disconnects(client, make_user, monkeypatch):
+    headers = make_user()
+    fast, slow = (create_personal_question(client, headers, text) for text in ("Quick one?", "Slow one?"))
+
+    async def request_answer(question, **kwargs):
+        await asyncio.sleep(10 if question == "Slow one?" else 0)
+        return f"Answer to {question}"
+
+    monkeypatch.setattr(answer_cache_module, "request_answer", request_answer)
+
+    async def disconnect_after_first_answer():
+        received = []
+
+        async def consume():
+            async for result in generate_answer_batch(
+                [(fast, "Quick one?"), (slow, "Slow one?")], QuestionAnswerCreate(), {}
+            ):
+                received.append(result)
+
+        consumer = asyncio.ensure_future(consume())
+        while not received:
+            await asyncio.sleep(0.01)
+        consumer.cancel()
+        await asyncio.gather(consumer, return_exceptions=True)
+        # The shielded save finishes on its own
+        for _ in range(100):
+            if saved_answers([fast]):
+                break
+            await asyncio.sleep(0.02)
+        return received
+
+    received = asyncio.run(disconnect_after_first_answer())
+    assert [result["question_id"] for result in received] == [fast]
+    assert saved_answers([fast, slow]) == {fast: "Answer to Quick one?"}
@@ -0,0 +1,70 @@
+import time
+
+from app.config import settings
+from app.services import interview_service
+from tests.conftest import API
+
+
+async def fake_question_stream(job_title, industry, difficulty, num_questions):
+    """Questions in two batches, as the provider stream would parse them"""
+    questions = [{"text": f"Question {i} for {job_title}", "category": "technical"} for i in range(num_questions)]
+    yield questions[:2]
+    yield questions[2:]
+
+
+def wait_for_job(client, headers, job_id, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        job = client.get(f"{API}/jobs/{job_id}", headers=headers).json()
+        if job["status"] in ("succeeded", "failed") or time.monotonic() > deadline:
+            return job
+        time.sleep(0.05)
+
+
+def test_generated_interview_keeps_its_job_id(client, make_user, monkeypatch):
+    monkeypatch.setattr(interview_service, "stream_interview_questions", fake_question_stream)
+    headers = make_user()
+    response = client.post(f"{API}/interviews/", headers=headers, json={
+        "title": "Backend", "job_title": "Python developer", "generate_questions": True, "num_questions": 3
+    })
+    assert response.status_code == 202, response.text
+    job_id = response.json()["generation_job_id"]
+    assert job_id
+
+    interview = client.get(f"{API}/interviews/{response.json()['id']}", headers=headers).json()
+    assert interview["generation_job_id"] == job_id
+
+    job = wait_for_job(client, headers, job_id)
+    assert job["status"] == "succeeded", job
+    questions = client.get(f"{API}/interviews/{interview['id']}/questions", headers=headers).json()
+    assert job["result"]["saved"] == 3
+    assert [question["order"] for question in questions] == [1, 2, 3]
+
+
+def test_interview_without_generation_has_no_job(client, make_user):
+    headers = make_user()
+    response = client.post(f"{API}/interviews/", headers=headers, json={"title": "Manual", "job_title": "Tester"})
+    assert response.status_code == 200, response.text
+    assert response.json()["generation_job_id"] is None
+
+
+def test_failed_question_generation_fails_the_job(client, make_user, monkeypatch):
+    attempts = []
+
+    async def failing_stream(job_title, industry, difficulty, num_questions):
+        attempts.append(1)
+        yield [{"text": "Question before the provider timed out"}]
+        raise TimeoutError("provider timed out")
+
+    monkeypatch.setattr(interview_service, "stream_interview_questions", failing_stream)
+    headers = make_user()
+    response = client.post(f"{API}/interviews/", headers=headers, json={
+        "title": "Backend", "job_title": "Python developer", "generate_questions": True, "num_questions": 3
+    })
+
+    job = wait_for_job(client, headers, response.json()["generation_job_id"])
+    assert job["status"] == "failed", job
+    assert "provider timed out" in job["error"]
+    assert len(attempts) == job["attempts"] == settings.JOB_MAX_ATTEMPTS
+    # Partial output of the failed attempts is not left behind
+    assert client.get(f"{API}/interviews/{response.json()['id']}/questions", headers=headers).json() == []
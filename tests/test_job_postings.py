@@ -0,0 +1,104 @@
+import asyncio
+import uuid
+
+from sqlalchemy import event
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.application import JobPosting
+from app.services import job_service
+from app.services.job_service import upsert_job_postings
+from tests.conftest import API
+
+
+def make_posting(source, external_id, title, **fields):
+    return dict({
+        "title": title,
+        "company": "Acme",
+        "description": f"{title} {uuid.uuid4().hex}",
+        "url": f"https://jobs.example.com/{source}/{external_id}",
+        "source": source,
+        "external_id": external_id
+    }, **fields)
+
+
+def saved_titles(source):
+    with SessionLocal() as db:
+        return {row.external_id: row.title for row in db.query(JobPosting).filter(JobPosting.source == source)}
+
+
+def test_bulk_upsert_reports_inserted_and_updated(client, make_user):
+    headers = make_user()
+    source = uuid.uuid4().hex
+    existing = client.post(
+        f"{API}/applications/postings", json=make_posting(source, "1", "Old title"), headers=headers
+    ).json()
+
+    rows = [make_posting(source, str(i), f"Engineer {i}") for i in (1, 2, 3)]
+    result = client.post(f"{API}/applications/postings:bulk", json=rows, headers=headers).json()
+    assert result["updated"] == [existing["id"]]
+    assert len(result["inserted"]) == 2 and existing["id"] not in result["inserted"]
+    assert saved_titles(source) == {"1": "Engineer 1", "2": "Engineer 2", "3": "Engineer 3"}
+
+    # Sending the same postings again only updates
+    again = client.post(f"{API}/applications/postings:bulk", json=rows, headers=headers).json()
+    assert again["inserted"] == []
+    assert sorted(again["updated"]) == sorted(result["inserted"] + result["updated"])
+
+
+def test_bulk_upsert_keeps_the_last_copy_of_a_repeated_posting(client, make_user):
+    headers = make_user()
+    source = uuid.uuid4().hex
+    rows = [make_posting(source, "1", "First copy"), make_posting(source, "2", "Other"), make_posting(source, "1", "Last copy")]
+
+    result = client.post(f"{API}/applications/postings:bulk", json=rows, headers=headers).json()
+    assert len(result["inserted"]) == 2 and result["updated"] == []
+    assert saved_titles(source) == {"1": "Last copy", "2": "Other"}
+
+
+def test_bulk_upsert_limits(client, make_user, monkeypatch):
+    headers = make_user()
+    assert client.post(f"{API}/applications/postings:bulk", json=[], headers=headers).json() == {"inserted": [], "updated": []}
+
+    monkeypatch.setattr(settings, "JOB_POSTING_BULK_MAX_ROWS", 2)
+    source = uuid.uuid4().hex
+    rows = [make_posting(source, str(i), f"Engineer {i}") for i in range(3)]
+    assert client.post(f"{API}/applications/postings:bulk", json=rows, headers=headers).status_code == 400
+    assert saved_titles(source) == {}
+
+
+def test_bulk_upsert_runs_off_the_event_loop(client, make_user, monkeypatch):
+    headers = make_user()
+    loops = []
+    link_duplicates = job_service.link_duplicates
+
+    def record_loop(db, posting_ids):
+        try:
+            loops.append(asyncio.get_running_loop())
+        except RuntimeError:
+            loops.append(None)
+        return link_duplicates(db, posting_ids)
+
+    monkeypatch.setattr(job_service, "link_duplicates", record_loop)
+    source = uuid.uuid4().hex
+    rows = [make_posting(source, str(i), f"Engineer {i}") for i in range(3)]
+    assert len(client.post(f"{API}/applications/postings:bulk", json=rows, headers=headers).json()["inserted"]) == 3
+    assert loops == [None]
+
+
+def test_bulk_upsert_counts_a_concurrent_insert_as_updated(client):
+    source = uuid.uuid4().hex
+    rows = [make_posting(source, str(i), f"Engineer {i}") for i in (1, 2)]
+
+    def insert_first_row_concurrently(orm_execute_state):
+        if orm_execute_state.is_insert:
+            with SessionLocal() as other:
+                other.add(JobPosting(**rows[0]))
+                other.commit()
+
+    with SessionLocal() as db:
+        event.listen(db, "do_orm_execute", insert_first_row_concurrently, once=True)
+        result = upsert_job_postings(db, rows)
+        saved = {row.external_id: row.id for row in db.query(JobPosting).filter(JobPosting.source == source)}
+
+    assert result == {"inserted": [saved["2"]], "updated": [saved["1"]]}
@@ -0,0 +1,127 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+
+from app.database import SessionLocal, open_session
+from app.models.job import BackgroundJob
+from app.services.job_queue import JobQueue
+
+
+def make_queue(job_type, handler, workers=0, max_attempts=2, lease_seconds=60.0):
+    queue = JobQueue(workers=workers, max_attempts=max_attempts, lease_seconds=lease_seconds)
+    queue.handler(job_type)(handler)
+    return queue
+
+
+async def echo(payload, user_id):
+    return payload
+
+
+def insert_job(job_type, status="queued", attempts=0, lease_in=None):
+    lease = None if lease_in is None else datetime.now(timezone.utc) + timedelta(seconds=lease_in)
+    with SessionLocal() as db:
+        job = BackgroundJob(
+            id=uuid.uuid4().hex, job_type=job_type, status=status, attempts=attempts, lease_expires_at=lease, payload={}
+        )
+        db.add(job)
+        db.commit()
+        return job.id
+
+
+def load_job(job_id):
+    with SessionLocal() as db:
+        return db.get(BackgroundJob, job_id)
+
+
+def test_claim_is_atomic(client):
+    queue = make_queue("test.claim", echo)
+    job_id = insert_job("test.claim")
+
+    with SessionLocal() as first, SessionLocal() as second:
+        claimed = queue._claim(first, job_id)
+        assert queue._claim(second, job_id) is None
+
+    assert claimed.status == "running"
+    assert claimed.attempts == 1
+    assert claimed.lease_expires_at is not None
+
+
+def test_start_requeues_only_expired_leases(client):
+    queue = make_queue("test.recover", echo, max_attempts=2)
+    live = insert_job("test.recover", status="running", attempts=1, lease_in=60)
+    expired = insert_job("test.recover", status="running", attempts=1, lease_in=-1)
+    unleased = insert_job("test.recover", status="running", attempts=1)
+    exhausted = insert_job("test.recover", status="running", attempts=2, lease_in=-1)
+    queued = insert_job("test.recover")
+
+    async def recover():
+        await queue.start()
+        pending = [queue._queue.get_nowait() for _ in range(queue._queue.qsize())]
+        await queue.stop()
+        return pending
+
+    pending = asyncio.run(recover())
+
+    assert {expired, unleased, queued} <= set(pending)
+    assert live not in pending and exhausted not in pending
+    assert load_job(live).status == "running"
+    assert load_job(expired).status == "queued"
+    assert load_job(exhausted).status == "failed"
+
+
+def test_heartbeat_renews_the_lease_while_running(client):
+    leases = []
+
+    async def slow(payload, user_id):
+        for _ in range(3):
+            async with open_session() as db:
+                leases.append(await db.scalar(select(BackgroundJob.lease_expires_at).where(
+                    BackgroundJob.id == payload["job_id"]
+                )))
+            await asyncio.sleep(0.2)
+        return {"done": True}
+
+    queue = make_queue("test.slow", slow, workers=1, lease_seconds=0.3)
+    job_id = insert_job("test.slow")
+    with SessionLocal() as db:
+        db.get(BackgroundJob, job_id).payload = {"job_id": job_id}
+        db.commit()
+
+    async def run():
+        await queue.start()
+        finished = await queue.wait(job_id, timeout=5)
+        await queue.stop()
+        return finished
+
+    assert asyncio.run(run())
+    assert leases[-1] > leases[0]
+    job = load_job(job_id)
+    assert job.status == "succeeded"
+    assert job.result == {"done": True}
+    assert job.lease_expires_at is None
+
+
+def test_failed_run_is_retried_until_max_attempts(client):
+    calls = []
+
+    async def flaky(payload, user_id):
+        calls.append(1)
+        raise RuntimeError("provider down")
+
+    queue = make_queue("test.flaky", flaky, workers=1, max_attempts=2)
+    job_id = insert_job("test.flaky")
+
+    async def run():
+        await queue.start()
+        finished = await queue.wait(job_id, timeout=5)
+        await queue.stop()
+        return finished
+
+    assert asyncio.run(run())
+    assert len(calls) == 2
+    job = load_job(job_id)
+    assert job.status == "failed"
+    assert job.attempts == 2
+    assert job.error == "provider down"
@@ -0,0 +1,148 @@
+import math
+import time
+import uuid
+from collections import Counter
+
+import pytest
+from sqlalchemy import func, select
+
+from app.database import SessionLocal
+from app.models.application import JobPosting
+from app.services.match_index import MatchIndex, tokenize
+from tests.conftest import API
+
+K1, B = 1.2, 0.75
+
+DOCUMENTS = {
+    1: "senior python engineer django postgres kubernetes",
+    2: "python developer flask",
+    3: "java engineer spring kafka",
+    4: "frontend engineer react typescript css",
+    5: "data engineer python spark airflow python",
+    6: "site reliability engineer kubernetes terraform aws",
+}
+
+
+def make_index():
+    return MatchIndex(k1=K1, b=B, max_query_terms=64)
+
+
+def bm25(documents, query):
+    """Reference BM25 over every document, for checking the index's scores"""
+    counted = {posting_id: Counter(tokenize(text)) for posting_id, text in documents.items()}
+    average = sum(sum(counts.values()) for counts in counted.values()) / len(counted)
+    df = Counter(term for counts in counted.values() for term in counts)
+    scores = {}
+    for posting_id, counts in counted.items():
+        length = sum(counts.values())
+        score = sum(
+            math.log(1.0 + (len(counted) - df[term] + 0.5) / (df[term] + 0.5))
+            * counts[term] * (K1 + 1.0) / (counts[term] + K1 * (1.0 - B + B * length / average))
+            for term in set(tokenize(query)) & counts.keys()
+        )
+        if score > 0:
+            scores[posting_id] = score
+    return scores
+
+
+def test_top_k_ranks_by_bm25():
+    index = make_index()
+    for posting_id, text in DOCUMENTS.items():
+        index.add(posting_id, text)
+
+    query = "python engineer with django and kubernetes"
+    expected = bm25(DOCUMENTS, query)
+    matches = index.top_k(query, 10)
+    assert [posting_id for posting_id, _ in matches] == sorted(expected, key=expected.get, reverse=True)
+    assert dict(matches) == pytest.approx(expected, rel=1e-5)
+    assert [posting_id for posting_id, _ in index.top_k(query, 2)] == [posting_id for posting_id, _ in matches[:2]]
+    assert index.top_k("cobol mainframe", 10) == []
+
+
+def test_compaction_keeps_results():
+    index = make_index()
+    documents = dict(DOCUMENTS)
+    for posting_id, text in documents.items():
+        index.add(posting_id, text)
+    # Updates and removals retire slots
+    documents[2] = "python developer fastapi postgres"
+    documents[4] = "frontend engineer vue"
+    for posting_id in (2, 4):
+        index.add(posting_id, documents[posting_id])
+    index.remove(3)
+    del documents[3]
+
+    queries = ["python postgres", "engineer kubernetes aws", "frontend vue react"]
+    before = [dict(index.top_k(query, 10)) for query in queries]
+    index._compact()
+
+    assert index.stats()["slots"] == index.stats()["postings"] == len(documents)
+    for query, scores in zip(queries, before):
+        assert dict(index.top_k(query, 10)) == pytest.approx(scores, rel=1e-5)
+        assert dict(index.top_k(query, 10)) == pytest.approx(bm25(documents, query), rel=1e-5)
+
+
+def test_sync_reindexes_postings_marked_stale(client, make_user):
+    headers = make_user()
+    old_term, new_term = f"x{uuid.uuid4().hex[:10]}", f"y{uuid.uuid4().hex[:10]}"
+    posting = client.post(f"{API}/applications/postings", json={
+        "title": "Compiler engineer", "company": "Acme", "description": f"llvm {old_term}",
+        "url": "https://jobs.example.com/compiler", "source": uuid.uuid4().hex, "external_id": "1"
+    }, headers=headers).json()
+
+    index = make_index()
+    with SessionLocal() as db:
+        index.sync(db)
+        assert [posting_id for posting_id, _ in index.top_k(old_term, 5)] == [posting["id"]]
+
+        db.query(JobPosting).filter(JobPosting.id == posting["id"]).update({"description": f"llvm {new_term}"})
+        db.commit()
+        # Updates are only seen once marked stale
+        index.sync(db)
+        assert index.top_k(new_term, 5) == []
+
+        index.mark_stale([posting["id"]])
+        assert index.sync(db) >= 1
+        assert index.top_k(old_term, 5) == []
+        assert [posting_id for posting_id, _ in index.top_k(new_term, 5)] == [posting["id"]]
+
+
+def insert_posting(db, posting_id, term):
+    db.add(JobPosting(
+        id=posting_id, title="Compiler engineer", company="Acme", description=f"llvm {term}",
+        url="https://jobs.example.com/compiler", source=uuid.uuid4().hex, external_id=str(posting_id)
+    ))
+    db.commit()
+
+
+def test_sync_finds_postings_committed_out_of_id_order(client):
+    index = MatchIndex(k1=K1, b=B, max_query_terms=64, gap_seconds=60)
+    late_term, early_term = f"x{uuid.uuid4().hex[:10]}", f"y{uuid.uuid4().hex[:10]}"
+    with SessionLocal() as db:
+        index.sync(db)
+        newest = db.scalar(select(func.max(JobPosting.id))) or 0
+
+        # id N + 1 commits first, while the transaction holding id N is still open
+        insert_posting(db, newest + 2, early_term)
+        index.sync(db)
+        assert index.stats()["gaps"] == 1
+        insert_posting(db, newest + 1, late_term)
+        index.sync(db)
+
+        assert [posting_id for posting_id, _ in index.top_k(early_term, 5)] == [newest + 2]
+        assert [posting_id for posting_id, _ in index.top_k(late_term, 5)] == [newest + 1]
+        assert index.stats()["gaps"] == 0
+
+
+def test_gaps_that_never_commit_are_forgotten(client):
+    index = MatchIndex(k1=K1, b=B, max_query_terms=64, gap_seconds=0.05)
+    with SessionLocal() as db:
+        index.sync(db)
+        newest = db.scalar(select(func.max(JobPosting.id))) or 0
+        # id N is rolled back and never shows up
+        insert_posting(db, newest + 2, f"z{uuid.uuid4().hex[:10]}")
+        index.sync(db)
+        assert index.stats()["gaps"] == 1
+        time.sleep(0.1)
+        index.sync(db)
+        assert index.stats()["gaps"] == 0
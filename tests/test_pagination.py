@@ -0,0 +1,75 @@
+import base64
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.database import SessionLocal
+from app.models.interview import Interview
+from tests.conftest import API
+
+
+def create_interviews(client, headers, created_at):
+    """One interview per timestamp; returns their ids, newest first as the API orders them"""
+    ids = [
+        client.post(f"{API}/interviews/", json={"title": f"Interview {i}"}, headers=headers).json()["id"]
+        for i in range(len(created_at))
+    ]
+    with SessionLocal() as db:
+        for interview_id, timestamp in zip(ids, created_at):
+            db.query(Interview).filter(Interview.id == interview_id).update({"created_at": timestamp})
+        db.commit()
+    return [interview_id for _, interview_id in sorted(zip(created_at, ids), reverse=True)]
+
+
+def walk(client, headers, direction, cursor=None, limit=3):
+    """Follow cursors in one direction, returning the ids of every page"""
+    pages = []
+    while True:
+        params = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        page = client.get(f"{API}/interviews/", params=params, headers=headers).json()
+        pages.append([item["id"] for item in page["items"]])
+        cursor = page[f"{direction}_cursor"]
+        if cursor is None:
+            return pages, page
+
+
+def test_cursor_pages_round_trip(client, make_user):
+    headers = make_user()
+    start = datetime(2026, 1, 1, 12, 0, 0)
+    expected = create_interviews(client, headers, [start + timedelta(minutes=i) for i in range(8)])
+
+    forward, last = walk(client, headers, "next")
+    assert [len(page) for page in forward] == [3, 3, 2]
+    assert sum(forward, []) == expected
+
+    # Walking back from the last page returns the same pages in reverse
+    backward, first = walk(client, headers, "prev", cursor=last["prev_cursor"])
+    assert backward == forward[-2::-1]
+    assert first["prev_cursor"] is None
+
+
+def test_cursor_pages_split_ties_on_created_at(client, make_user):
+    headers = make_user()
+    moment = datetime(2026, 1, 1, 12, 0, 0)
+    # Seven rows share one timestamp, so only the id tie-breaker orders them
+    expected = create_interviews(client, headers, [moment] * 7 + [moment - timedelta(seconds=1)])
+
+    forward, _ = walk(client, headers, "next", limit=2)
+    assert sum(forward, []) == expected
+    assert len(set(sum(forward, []))) == 8
+
+
+@pytest.mark.parametrize("cursor", [
+    "not-a-cursor",
+    base64.urlsafe_b64encode(b"[1,2]").decode(),
+    base64.urlsafe_b64encode(json.dumps(["sideways", None, 1]).encode()).decode(),
+    base64.urlsafe_b64encode(json.dumps(["next", "yesterday", 1]).encode()).decode(),
+    base64.urlsafe_b64encode(json.dumps(["next", None, "1"]).encode()).decode(),
+])
+def test_bad_cursor_is_rejected(client, make_user, cursor):
+    response = client.get(f"{API}/interviews/", params={"cursor": cursor}, headers=make_user())
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid pagination cursor"
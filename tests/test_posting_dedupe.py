@@ -0,0 +1,77 @@
+import uuid
+
+from tests.conftest import API
+
+
+def random_words(count):
+    return [uuid.uuid4().hex[:8] for _ in range(count)]
+
+
+def make_posting(words, source=None, title="Platform engineer"):
+    return {
+        "title": title,
+        "company": "Acme",
+        "description": " ".join(words),
+        "url": "https://jobs.example.com/posting",
+        "source": source or uuid.uuid4().hex,
+        "external_id": uuid.uuid4().hex
+    }
+
+
+def save(client, headers, posting):
+    response = client.post(f"{API}/applications/postings", json=posting, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def posting_ids(client, headers, **params):
+    page = client.get(f"{API}/applications/postings", params=dict(params, limit=500), headers=headers).json()
+    return {item["id"] for item in page["items"]}
+
+
+def test_near_duplicates_link_to_one_canonical_posting(client, make_user):
+    headers = make_user()
+    words = random_words(60)
+    original = save(client, headers, make_posting(words))
+    # The same job reposted on other boards, lightly edited
+    repost = save(client, headers, make_posting(words[:-1] + ["remote"]))
+    another = save(client, headers, make_posting(["apply", "today"] + words[2:]))
+    unrelated = save(client, headers, make_posting(random_words(60)))
+
+    assert original["canonical_id"] is None
+    assert repost["canonical_id"] == original["id"]
+    assert another["canonical_id"] == original["id"]
+    assert unrelated["canonical_id"] is None
+
+
+def test_bulk_upsert_links_duplicates_within_the_batch(client, make_user):
+    headers = make_user()
+    words = random_words(60)
+    rows = [make_posting(words), make_posting(words[:-1] + ["onsite"]), make_posting(random_words(60))]
+
+    inserted = client.post(f"{API}/applications/postings:bulk", json=rows, headers=headers).json()["inserted"]
+    first, copy, distinct = sorted(inserted)
+    duplicates = client.get(f"{API}/applications/postings/{first}/duplicates", headers=headers).json()
+    assert [posting["id"] for posting in duplicates] == [copy]
+    assert client.get(f"{API}/applications/postings/{distinct}/duplicates", headers=headers).json() == []
+
+
+def test_listing_and_duplicates_endpoint(client, make_user):
+    headers = make_user()
+    words = random_words(60)
+    original = save(client, headers, make_posting(words))
+    first_copy = save(client, headers, make_posting(words[:-1] + ["hybrid"]))
+    second_copy = save(client, headers, make_posting(words[1:] + ["contract"]))
+
+    listed = posting_ids(client, headers)
+    assert original["id"] in listed
+    assert first_copy["id"] not in listed and second_copy["id"] not in listed
+    assert {original["id"], first_copy["id"], second_copy["id"]} <= posting_ids(client, headers, include_duplicates=True)
+
+    def duplicates_of(posting_id):
+        response = client.get(f"{API}/applications/postings/{posting_id}/duplicates", headers=headers)
+        return [posting["id"] for posting in response.json()]
+
+    assert duplicates_of(original["id"]) == [first_copy["id"], second_copy["id"]]
+    assert duplicates_of(first_copy["id"]) == [original["id"], second_copy["id"]]
+    assert client.get(f"{API}/applications/postings/999999999/duplicates", headers=headers).status_code == 404
@@ -0,0 +1,87 @@
+import asyncio
+import time
+
+import pytest
+
+from app.config import settings
+from app.services.llm_client import CompletionRequest, parse_fake_providers
+from app.services.provider_router import CircuitOpen, ProviderRouter, ProviderUnavailable
+from app.services.rate_limiter import provider_limiter
+
+REQUEST = CompletionRequest(system="Be brief.", prompt="Hello")
+
+
+@pytest.fixture(autouse=True)
+def fast_breakers(monkeypatch):
+    monkeypatch.setattr(settings, "AI_CIRCUIT_FAILURE_THRESHOLD", 2)
+    monkeypatch.setattr(settings, "AI_CIRCUIT_RESET_SECONDS", 0.05)
+    monkeypatch.setattr(settings, "AI_HEDGE_MIN_SAMPLES", 3)
+
+
+def test_fails_over_to_the_next_provider_on_an_injected_error():
+    broken, backup = providers = parse_fake_providers("broken:0:1,backup:0:0")
+    router = ProviderRouter(providers)
+
+    assert asyncio.run(router.complete(REQUEST)).startswith("[backup]")
+    assert router.stats[id(broken)].error_rate == 1.0
+    assert router.breakers[id(broken)].failures == 1
+    assert router.breakers[id(backup)].state == "closed"
+
+
+def test_breaker_opens_then_probes_half_open_then_closes():
+    flaky, = providers = parse_fake_providers("flaky:0:1")
+    router = ProviderRouter(providers)
+    breaker = router.breakers[id(flaky)]
+
+    async def scenario():
+        for _ in range(2):
+            with pytest.raises(Exception):
+                await router.complete(REQUEST)
+        assert breaker.state == "open"
+        with pytest.raises(ProviderUnavailable):
+            await router.complete(REQUEST)
+
+        # After the reset timeout exactly one probe is let through
+        await asyncio.sleep(0.06)
+        flaky.error_rate, flaky.latency = 0.0, 0.05
+        probe = asyncio.ensure_future(router.complete(REQUEST))
+        await asyncio.sleep(0.01)
+        assert breaker.state == "half_open"
+        assert not breaker.try_acquire()
+        assert (await probe).startswith("[flaky]")
+        assert breaker.state == "closed"
+
+    asyncio.run(scenario())
+
+
+def test_open_circuit_does_not_spend_provider_budget():
+    flaky, = providers = parse_fake_providers("budget-check:0:1")
+    router = ProviderRouter(providers)
+
+    async def fail_twice():
+        for _ in range(2):
+            with pytest.raises(Exception):
+                await router.complete(REQUEST)
+
+    asyncio.run(fail_twice())
+    available = provider_limiter.levels(flaky.name)["requests_available"]
+    with pytest.raises(CircuitOpen):
+        asyncio.run(router._call(flaky, REQUEST))
+    assert provider_limiter.levels(flaky.name)["requests_available"] == pytest.approx(available, abs=0.1)
+
+
+def test_hedge_fires_once_the_primary_runs_past_its_p95():
+    primary, backup = providers = parse_fake_providers("primary:0:0,backup:0:0")
+    router = ProviderRouter(providers, hedge=True)
+    for _ in range(5):
+        router.stats[id(primary)].record(0.02, True)
+        router.stats[id(backup)].record(0.03, True)
+
+    primary.latency = 1.0
+    started = time.perf_counter()
+    result = asyncio.run(router.complete(REQUEST))
+
+    assert result.startswith("[backup]")
+    assert time.perf_counter() - started < 0.5
+    assert router.hedges_sent == 1
+    assert router.hedges_won == 1
@@ -0,0 +1,41 @@
+from tests.conftest import API
+
+
+def create_personal_question(client, headers, text="What is your biggest weakness?") -> int:
+    category = client.post(f"{API}/questions/categories", json={"name": "Mine"}, headers=headers).json()
+    response = client.post(f"{API}/questions/", json={"text": text, "category_id": category["id"]}, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+def test_personal_question_answers_are_private(client, make_user):
+    owner, other = make_user(), make_user()
+    question_id = create_personal_question(client, owner)
+
+    assert client.post(f"{API}/questions/{question_id}/answer", json={}, headers=other).status_code == 403
+    assert client.get(f"{API}/questions/{question_id}/answer/stream", headers=other).status_code == 403
+
+
+def test_streamed_answer_is_saved_for_the_owner(client, make_user):
+    owner = make_user()
+    question_id = create_personal_question(client, owner)
+
+    stream = client.get(f"{API}/questions/{question_id}/answer/stream", headers=owner)
+    assert stream.status_code == 200
+    assert "event: done" in stream.text
+
+    # The streamed answer was persisted, so asking again is a cache hit
+    response = client.post(f"{API}/questions/{question_id}/answer", json={}, headers=owner)
+    assert response.json()["cached"] is True
+
+
+def test_similar_personal_question_does_not_reuse_another_users_answer(client, make_user):
+    owner, other = make_user(), make_user()
+    asked = create_personal_question(client, owner, text="Tell me about yourself.")
+    assert client.post(f"{API}/questions/{asked}/answer", json={}, headers=owner).json()["cached"] is False
+
+    # A paraphrase by the same owner reuses the answer, another user's never does
+    paraphrase = create_personal_question(client, owner, text="Walk me through your background.")
+    assert client.post(f"{API}/questions/{paraphrase}/answer", json={}, headers=owner).json()["cached"] is True
+    elsewhere = create_personal_question(client, other, text="Walk me through your background.")
+    assert client.post(f"{API}/questions/{elsewhere}/answer", json={}, headers=other).json()["cached"] is False
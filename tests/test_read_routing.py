@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+
+from app.database import open_session
+from app.models.job import BackgroundJob
+from app.services.cache import TTLCache
+from app.services.read_routing import read_router
+from tests.conftest import API
+from tests.test_job_queue import echo, insert_job, make_queue
+from tests.test_questions import create_personal_question
+
+
+@pytest.fixture
+def recent_writers(monkeypatch):
+    """Start from nobody being sticky, so only the writes under test count"""
+    writers = TTLCache(maxsize=100, ttl=60)
+    monkeypatch.setattr(read_router, "_recent_writers", writers)
+    return writers
+
+
+def test_session_principal_makes_commits_sticky(client, recent_writers):
+    async def write(principal_id, job_id):
+        async with open_session(principal_id=principal_id) as db:
+            job = await db.get(BackgroundJob, job_id)
+            job.error = "touched"
+            await db.commit()
+
+    asyncio.run(write(None, insert_job("test.sticky")))
+    assert len(recent_writers) == 0
+    asyncio.run(write(41, insert_job("test.sticky")))
+    assert recent_writers.get(41)
+
+
+def test_streamed_answer_save_sticks_its_user(client, make_user, recent_writers):
+    headers = make_user()
+    user_id = client.get(f"{API}/users/me", headers=headers).json()["id"]
+    question_id = create_personal_question(client, headers, "How do you prioritise your work?")
+    recent_writers.clear()
+
+    stream = client.get(f"{API}/questions/{question_id}/answer/stream", headers=headers)
+    assert "event: done" in stream.text
+    assert recent_writers.get(user_id)
+
+
+def test_job_writes_stick_its_user(client, recent_writers):
+    queue = make_queue("test.owned", echo, workers=1)
+    job_id = insert_job("test.owned")
+
+    async def run():
+        async with open_session() as db:
+            job = await db.get(BackgroundJob, job_id)
+            job.user_id = 42
+            await db.commit()
+        await queue.start()
+        finished = await queue.wait(job_id, timeout=5)
+        await queue.stop()
+        return finished
+
+    assert asyncio.run(run())
+    assert recent_writers.get(42)
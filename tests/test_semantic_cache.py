@@ -0,0 +1,55 @@
+import pytest
+
+from app.config import settings
+from app.services.answer_cache import make_scope
+from app.services.semantic_cache import SemanticAnswerCache
+
+SCOPE = make_scope("Backend team", "senior", "Python developer")
+
+PARAPHRASES = [
+    ("Tell me about yourself.", "Walk me through your background."),
+    ("What is your greatest weakness?", "What would you say is your biggest weakness?"),
+    ("Why do you want to work here?", "Why are you interested in working at our company?"),
+    ("Describe a time you handled a conflict with a coworker.",
+     "Tell me about a situation where you had a disagreement with a colleague."),
+    ("Where do you see yourself in five years?", "What are your career goals for the next five years?"),
+    ("What are your salary expectations?", "What salary are you expecting?"),
+    ("Why are you leaving your current job?", "Why do you want to leave your current position?"),
+    ("Why should we hire you?", "Why should we choose you for this role?"),
+]
+
+DIFFERENT_QUESTIONS = [
+    ("What is your greatest weakness?", "What is your greatest strength?"),
+    ("Tell me about yourself.", "Tell me about your leadership style."),
+    ("Why do you want to work here?", "Why are you leaving your current job?"),
+    ("Describe a time you handled a conflict with a coworker.", "Describe a project you are proud of."),
+    ("Where do you see yourself in five years?", "What are your salary expectations?"),
+    ("Tell me about a time you failed.", "Tell me about a time you succeeded."),
+]
+
+
+def make_cache():
+    return SemanticAnswerCache(dim=settings.SEMANTIC_CACHE_DIM, capacity=64, threshold=settings.SEMANTIC_CACHE_THRESHOLD)
+
+
+@pytest.mark.parametrize("asked,paraphrase", PARAPHRASES)
+def test_paraphrase_reuses_the_answer(asked, paraphrase):
+    cache = make_cache()
+    cache.add(1, asked, SCOPE, "stored answer")
+    assert cache.lookup(paraphrase, SCOPE) == "stored answer"
+
+
+@pytest.mark.parametrize("asked,other", DIFFERENT_QUESTIONS)
+def test_different_question_misses(asked, other):
+    cache = make_cache()
+    cache.add(1, asked, SCOPE, "stored answer")
+    assert cache.lookup(other, SCOPE) is None
+
+
+def test_personal_answers_are_scoped_to_their_owner():
+    cache = make_cache()
+    cache.add(1, "Tell me about yourself.", make_scope(None, None, None, owner_id=7), "owner's answer")
+
+    assert cache.lookup("Walk me through your background.", make_scope(None, None, None, owner_id=7)) == "owner's answer"
+    assert cache.lookup("Walk me through your background.", make_scope(None, None, None, owner_id=8)) is None
+    assert cache.lookup("Walk me through your background.", make_scope(None, None, None)) is None